@@ -4,59 +4,44 @@ import django
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'antiragging.settings')
 django.setup()
 
-from core.models import College, Branch
+from core.utils.institutions import import_institutions
+
+# Safe to re-run: rows are matched on (name, type) and (college, branch name),
+# so only missing colleges/branches are created. For larger lists use
+# `python manage.py import_institutions <file.csv|file.jsonl>`.
+COLLEGES = [
+    {
+        'college': 'Government PU College',
+        'college_type': 'puc',
+        'address': 'Mysore, Karnataka',
+        'branches': ['Science (PCMB)', 'Science (PCMC)', 'Commerce', 'Arts'],
+    },
+    {
+        'college': 'Government ITI Mysore',
+        'college_type': 'iti',
+        'address': 'Bannimantap, Mysore',
+        'branches': ['Electrician', 'Fitter', 'Welder', 'COPA'],
+    },
+    {
+        'college': 'Government Polytechnic College',
+        'college_type': 'diploma',
+        'address': 'Hebbal, Mysore',
+        'branches': ['Diploma in Computer Science', 'Diploma in Mechanical', 'Diploma in Civil', 'Diploma in ECE'],
+    },
+]
 
 print('🏫 Adding colleges...\n')
 
-# 1. PUC College
-try:
-    puc = College.objects.create(
-        name='Government PU College',
-        address='Mysore, Karnataka'
-    )
-    print('✅ PUC College created!')
-
-    # Add PUC branches
-    Branch.objects.create(name='Science (PCMB)', college=puc)
-    Branch.objects.create(name='Science (PCMC)', college=puc)
-    Branch.objects.create(name='Commerce', college=puc)
-    Branch.objects.create(name='Arts', college=puc)
-    print('   ✅ Added 4 PUC branches\n')
-except Exception as e:
-    print(f'❌ PUC Error: {e}\n')
-
-# 2. ITI College
-try:
-    iti = College.objects.create(
-        name='Government ITI Mysore',
-        address='Bannimantap, Mysore'
-    )
-    print('✅ ITI College created!')
-
-    # Add ITI trades
-    Branch.objects.create(name='Electrician', college=iti)
-    Branch.objects.create(name='Fitter', college=iti)
-    Branch.objects.create(name='Welder', college=iti)
-    Branch.objects.create(name='COPA', college=iti)
-    print('   ✅ Added 4 ITI trades\n')
-except Exception as e:
-    print(f'❌ ITI Error: {e}\n')
-
-# 3. Polytechnic
-try:
-    poly = College.objects.create(
-        name='Government Polytechnic College',
-        address='Hebbal, Mysore'
-    )
-    print('✅ Polytechnic created!')
-
-    # Add Diploma branches
-    Branch.objects.create(name='Diploma in Computer Science', college=poly)
-    Branch.objects.create(name='Diploma in Mechanical', college=poly)
-    Branch.objects.create(name='Diploma in Civil', college=poly)
-    Branch.objects.create(name='Diploma in ECE', college=poly)
-    print('   ✅ Added 4 Diploma branches\n')
-except Exception as e:
-    print(f'❌ Polytechnic Error: {e}\n')
+rows = [
+    {'college': c['college'], 'college_type': c['college_type'], 'address': c['address'], 'branch': branch}
+    for c in COLLEGES
+    for branch in c['branches']
+]
+stats = import_institutions(rows, on_error=lambda line, message: print(f'❌ Row {line}: {message}'))
+
+print(f"✅ Colleges: {stats['colleges_inserted']} created, {stats['colleges_updated']} updated, "
+      f"{stats['colleges_unchanged']} already present")
+print(f"✅ Branches: {stats['branches_inserted']} created, {stats['branches_updated']} updated, "
+      f"{stats['branches_unchanged']} already present\n")
 
 print('🎉 Done! Refresh your admin dashboard!')
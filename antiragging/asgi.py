@@ -2,6 +2,9 @@
 ASGI config for antiragging project.
 
 It exposes the ASGI callable as a module-level variable named ``application``.
+Serve it with ``uvicorn antiragging.asgi:application`` to enable the
+/api/events/ stream: open streams are coroutines on the event loop, while
+the regular sync views keep running in the thread pool.
 
 For more information on this file, see
 https://docs.djangoproject.com/en/5.2/howto/deployment/asgi/
@@ -12,5 +15,15 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "antiragging.settings")
+# Scopes DB_STATEMENT_TIMEOUT_MS to web traffic (see settings.py)
+os.environ.setdefault("ANTIRAGGING_WEB_PROCESS", "1")
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from core.events import events_app  # noqa: E402  (needs the app registry loaded above)
+
+
+async def application(scope, receive, send):
+    if scope["type"] == "http" and scope["path"] == "/api/events/":
+        return await events_app(scope, receive, send)
+    return await django_application(scope, receive, send)
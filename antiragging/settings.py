@@ -81,16 +81,10 @@ WSGI_APPLICATION = "antiragging.wsgi.application"
 
 # Database
 # https://docs.djangoproject.com/en/5.2/ref/settings/#databases
+# Configured from the environment further down (see DATABASE).
 
 import os
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': os.path.join(BASE_DIR, 'db.sqlite3'),
-    }
-}
-
 
 # CORS config - React runs on port 3000 by default
 # CORS_ALLOWED_ORIGINS = [
@@ -190,6 +184,8 @@ SIMPLE_JWT = {
 
     'AUTH_TOKEN_CLASSES': ('rest_framework_simplejwt.tokens.AccessToken',),
     'TOKEN_TYPE_CLAIM': 'token_type',
+    # Rotated and revoked refresh tokens are blacklisted in the cache (core/tokens.py)
+    'TOKEN_REFRESH_SERIALIZER': 'core.tokens.CachedBlacklistTokenRefreshSerializer',
 }
 
 
@@ -225,12 +221,109 @@ EMAIL_HOST_USER = config('EMAIL_HOST_USER')
 EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD')
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL')
 
+# ============= PASSWORD HASHING =============
+# Calibrate the work factor on the auth hosts with
+# `python manage.py calibrate_password_hasher`; stored hashes are upgraded to
+# the new policy transparently on each user's next login.
+PASSWORD_HASHER = config('PASSWORD_HASHER', default='pbkdf2_sha256')  # or 'scrypt'
+PASSWORD_HASH_ITERATIONS = config('PASSWORD_HASH_ITERATIONS', default=0, cast=int)  # 0 = Django's default
+PASSWORD_SCRYPT_WORK_FACTOR = config('PASSWORD_SCRYPT_WORK_FACTOR', default=0, cast=int)  # 0 = Django's default
+_TUNED_HASHERS = {
+    'pbkdf2_sha256': 'core.hashers.TunedPBKDF2PasswordHasher',
+    'scrypt': 'core.hashers.TunedScryptPasswordHasher',
+}
+PASSWORD_HASHERS = (
+    [_TUNED_HASHERS[PASSWORD_HASHER]]
+    + [path for name, path in _TUNED_HASHERS.items() if name != PASSWORD_HASHER]
+    + ['django.contrib.auth.hashers.PBKDF2SHA1PasswordHasher']
+)
+
+# ============= CACHE =============
+# The refresh token blacklist lives here, so every worker must share it: set
+# REDIS_URL in production. The local-memory fallback is for development only.
+REDIS_URL = config('REDIS_URL', default='')
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': REDIS_URL,
+    } if REDIS_URL else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    }
+}
+JWT_BLACKLIST_CACHE = 'default'
+
+# ============= CATALOG CACHING =============
+# Seconds browsers/CDNs may reuse /api/colleges/ and /api/branches/ before
+# revalidating them with If-None-Match.
+CATALOG_CACHE_MAX_AGE = config('CATALOG_CACHE_MAX_AGE', default=300, cast=int)
+
+# ============= NEWS FEED CACHE =============
+# Upper bound on how stale a cached feed can get from changes that do not
+# touch News itself (e.g. an author renaming their account).
+NEWS_FEED_CACHE_TIMEOUT = config('NEWS_FEED_CACHE_TIMEOUT', default=600, cast=int)
+
+# ============= CLAIMS AUTH =============
+# Read endpoints using core.authentication.ClaimsJWTAuthentication build the
+# request user from token claims; suspensions reach other processes within
+# this many seconds.
+CLAIMS_AUTH_REVOCATION_TTL = config('CLAIMS_AUTH_REVOCATION_TTL', default=30, cast=int)
+
+# ============= BULK ONBOARDING =============
+# Password-hashing processes POST /api/students/bulk/ may fork from a web
+# worker (1 = hash in the request's own process). `manage.py
+# onboard_students` uses every core unless given --workers.
+ONBOARDING_WEB_HASH_WORKERS = config('ONBOARDING_WEB_HASH_WORKERS', default=2, cast=int)
+
+# ============= DELTA SYNC =============
+# Changes per /api/sync/ response, and how old a change must be before it is
+# served; keep it longer than any transaction that writes complaints/news.
+SYNC_PAGE_SIZE = config('SYNC_PAGE_SIZE', default=500, cast=int)
+SYNC_SETTLE_SECONDS = config('SYNC_SETTLE_SECONDS', default=2, cast=int)
+
+# ============= LIVE EVENTS =============
+# Broker behind /api/events/. LocalBroker only sees writes made by the process
+# holding the stream: serve the whole API from one ASGI worker, or plug in a
+# shared broker before scaling out.
+EVENTS_BROKER = config('EVENTS_BROKER', default='core.events.LocalBroker')
+EVENTS_KEEPALIVE = config('EVENTS_KEEPALIVE', default=15, cast=int)  # seconds between comment pings
+EVENTS_RETRY_MS = config('EVENTS_RETRY_MS', default=5000, cast=int)  # client reconnect delay
+EVENTS_QUEUE_SIZE = config('EVENTS_QUEUE_SIZE', default=100, cast=int)  # backlog before a stream is reset
+
 FRONTEND_URL = config('FRONTEND_URL', default='http://localhost:3004')
 BACKEND_URL = config('BACKEND_URL', default='http://localhost:8000')
 
+# ============= DATABASE =============
+# DATABASE_URL picks the backend; without it (local runs, `manage.py test`)
+# it is SQLite and the options below are ignored. On Postgres, connections
+# stay open for DB_CONN_MAX_AGE seconds (0 = one per request, -1 = forever)
+# and are pinged before a request reuses them.
+# DB_STATEMENT_TIMEOUT_MS cancels slow statements in the web processes only
+# (antiragging/wsgi.py and asgi.py set ANTIRAGGING_WEB_PROCESS): `migrate`,
+# `rollup_complaints --full`, imports and other management commands run
+# without it, so index builds and backfills are never cut off mid-deploy.
+# Behind PgBouncer in transaction pooling mode set DB_POOLER=pgbouncer:
+# server-side cursors (the CSV export's .iterator()) cannot outlive a pooled
+# transaction, and PgBouncer rejects the `options` startup parameter. Set
+# the timeout on the web's database role instead (ALTER ROLE ... SET
+# statement_timeout) and run migrations as a role without it.
+DATABASE_URL = config('DATABASE_URL', default='sqlite:///db.sqlite3')
+DB_CONN_MAX_AGE = config('DB_CONN_MAX_AGE', default=600, cast=int)
+DB_CONN_HEALTH_CHECKS = config('DB_CONN_HEALTH_CHECKS', default=True, cast=bool)
+DB_STATEMENT_TIMEOUT_MS = config('DB_STATEMENT_TIMEOUT_MS', default=30000, cast=int)  # 0 = no limit
+DB_POOLER = config('DB_POOLER', default='')  # '' or 'pgbouncer'
+WEB_PROCESS = config('ANTIRAGGING_WEB_PROCESS', default=False, cast=bool)
+
 DATABASES = {
-    'default': dj_database_url.config(default=config('DATABASE_URL', default='sqlite:///db.sqlite3'))
+    'default': dj_database_url.parse(DATABASE_URL)
 }
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    DATABASES['default'].update(
+        CONN_MAX_AGE=None if DB_CONN_MAX_AGE < 0 else DB_CONN_MAX_AGE,
+        CONN_HEALTH_CHECKS=DB_CONN_HEALTH_CHECKS,
+        DISABLE_SERVER_SIDE_CURSORS=DB_POOLER == 'pgbouncer',
+    )
+    if DB_STATEMENT_TIMEOUT_MS and WEB_PROCESS and DB_POOLER != 'pgbouncer':
+        DATABASES['default'].setdefault('OPTIONS', {})['options'] = f'-c statement_timeout={DB_STATEMENT_TIMEOUT_MS}'
 
 # Static files
 STATIC_ROOT = BASE_DIR / 'staticfiles'
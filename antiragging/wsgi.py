@@ -12,5 +12,7 @@ import os
 from django.core.wsgi import get_wsgi_application
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "antiragging.settings")
+# Scopes DB_STATEMENT_TIMEOUT_MS to web traffic (see settings.py)
+os.environ.setdefault("ANTIRAGGING_WEB_PROCESS", "1")
 
 application = get_wsgi_application()
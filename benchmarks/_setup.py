@@ -0,0 +1,44 @@
+"""Shared bootstrap for the scripts in this directory.
+
+Each benchmark runs against a throw-away test database created from the
+current migrations, so it never touches db.sqlite3 or a production DATABASE_URL
+(the test database name is derived from it, as with `manage.py test`).
+"""
+import os
+import sys
+import time
+from contextlib import contextmanager
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'antiragging.settings')
+
+import django
+
+django.setup()
+
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+
+@contextmanager
+def test_database(keepdb=False):
+    setup_test_environment()
+    old_name = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True, keepdb=keepdb)
+    try:
+        yield connection
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        teardown_test_environment()
+
+
+@contextmanager
+def timer(label, count=None, unit='ops'):
+    start = time.perf_counter()
+    yield
+    elapsed = time.perf_counter() - start
+    if count:
+        print(f"{label:<45} {elapsed * 1000:9.1f} ms  {count / elapsed:12,.0f} {unit}/s")
+    else:
+        print(f"{label:<45} {elapsed * 1000:9.1f} ms")
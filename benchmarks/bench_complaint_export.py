@@ -0,0 +1,69 @@
+"""Peak Python memory and throughput of /api/complaints/export/ as the export grows.
+
+    python benchmarks/bench_complaint_export.py [--rows 1000,100000,500000]
+
+Seeds complaints with raw INSERTs, then drains the streaming response for
+an admin export of each size, tracing allocations with tracemalloc. With
+the rows streamed from a chunked cursor, peak memory should stay roughly
+constant across sizes.
+"""
+import argparse
+import tracemalloc
+from datetime import timedelta
+
+from _setup import test_database, timer
+
+from django.db import connection
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+
+def seed(count, student_id, college_id, start_index):
+    from core.models import Complaint
+
+    now = timezone.now()
+    sql = (f'INSERT INTO {Complaint._meta.db_table} (student_id, college_id, title, description, status, '
+           f'is_anonymous, created_at, updated_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s)')
+    with connection.cursor() as cursor:
+        for offset in range(0, count, 10000):
+            batch = []
+            for i in range(start_index + offset, start_index + min(offset + 10000, count)):
+                created = now - timedelta(seconds=i)
+                batch.append((student_id, college_id, f'Complaint {i}', 'Lorem ipsum dolor sit amet ' * 8,
+                              'pending', i % 5 == 0, created, created))
+            cursor.executemany(sql, batch)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', default='1000,100000,500000', help="Comma-separated export sizes")
+    args = parser.parse_args()
+    sizes = sorted(int(n) for n in args.rows.split(','))
+
+    with test_database():
+        from core.models import College, User
+
+        college = College.objects.create(name='Bench College', college_type='engineering')
+        admin = User.objects.create(username='admin', role='admin')
+        student = User.objects.create(username='student', role='student', college=college)
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        seeded = 0
+        for size in sizes:
+            seed(size - seeded, student.id, college.id, seeded)
+            seeded = size
+
+            tracemalloc.start()
+            total = 0
+            with timer(f'export {size:,} rows', size, 'rows'):
+                response = client.get('/api/complaints/export/')
+                for chunk in response.streaming_content:
+                    total += len(chunk)
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+            print(f"   {total / 2**20:8.1f} MiB of CSV, peak traced memory {peak / 2**20:6.2f} MiB")
+
+
+if __name__ == '__main__':
+    main()
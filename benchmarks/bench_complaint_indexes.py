@@ -0,0 +1,129 @@
+"""Query plans and latency of the role-scoped complaint/feedback list queries,
+with and without the composite indexes from migration 0007.
+
+    python benchmarks/bench_complaint_indexes.py [--rows 2000000] [--colleges 500]
+
+Seeds a synthetic dataset, drops the composite indexes to show the old
+scan-and-sort plans, then recreates them and shows the index range scans.
+Set DATABASE_URL to run it against Postgres instead of SQLite.
+"""
+import argparse
+import random
+import time
+from datetime import timedelta
+
+from _setup import test_database
+
+from django.db import connection
+from django.utils import timezone
+
+PAGE = 20
+
+
+def seed(args):
+    from core.models import Branch, College, Complaint, Feedback, User
+
+    rng = random.Random(42)
+    now = timezone.now()
+    statuses = ['pending', 'in_progress', 'solved', 'closed']
+
+    College.objects.bulk_create(
+        [College(name=f'College {i}', college_type='engineering') for i in range(args.colleges)])
+    college_ids = list(College.objects.values_list('id', flat=True))
+    Branch.objects.bulk_create(
+        [Branch(college_id=c, name=f'Branch {b}') for c in college_ids for b in range(5)])
+    branch_ids = list(Branch.objects.values_list('id', 'college_id'))
+    User.objects.bulk_create(
+        [User(username=f'squad{i}', role='squad', college_id=college_ids[i % len(college_ids)])
+         for i in range(args.colleges * 4)]
+        + [User(username=f'student{i}', role='student', college_id=college_ids[i % len(college_ids)])
+           for i in range(args.colleges * 100)],
+        batch_size=5000,
+    )
+    squads = list(User.objects.filter(role='squad').values_list('id', flat=True))
+    students = list(User.objects.filter(role='student').values_list('id', 'college_id'))
+
+    table = Complaint._meta.db_table
+    sql = (f'INSERT INTO {table} (student_id, college_id, branch_id, title, description, assigned_to_id, '
+           f'status, is_anonymous, created_at, updated_at) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)')
+    assignees = squads + [None] * len(squads)  # roughly half the complaints are unassigned
+    batch = []
+    with connection.cursor() as cursor:
+        for i in range(args.rows):
+            student_id, college_id = students[rng.randrange(len(students))]
+            created = now - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+            batch.append((student_id, college_id, branch_ids[rng.randrange(len(branch_ids))][0],
+                          f'Complaint {i}', 'Lorem ipsum dolor sit amet', rng.choice(assignees),
+                          rng.choice(statuses), False, created, created))
+            if len(batch) == 10000:
+                cursor.executemany(sql, batch)
+                batch.clear()
+        if batch:
+            cursor.executemany(sql, batch)
+
+    complaint_ids = list(Complaint.objects.values_list('id', 'student_id').iterator())[::4]
+    Feedback.objects.bulk_create(
+        [Feedback(user_id=s, complaint_id=c, message='Thanks') for c, s in complaint_ids], batch_size=10000)
+
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+    return college_ids[0], squads[0], students[0][0]
+
+
+def queries(college_id, squad_id, student_id):
+    from core.models import Complaint, Feedback
+
+    order = ('-created_at', '-id')
+    return {
+        'admin: all complaints': Complaint.objects.order_by(*order),
+        'admin: status=pending': Complaint.objects.filter(status='pending').order_by(*order),
+        'principal: college': Complaint.objects.filter(college_id=college_id).order_by(*order),
+        'principal: college + status': Complaint.objects.filter(college_id=college_id, status='pending').order_by(*order),
+        'squad: assigned_to': Complaint.objects.filter(assigned_to_id=squad_id).order_by(*order),
+        'student: own complaints': Complaint.objects.filter(student_id=student_id).order_by(*order),
+        'student: own feedback': Feedback.objects.filter(user_id=student_id).order_by('-created_at'),
+        'principal: college feedback': Feedback.objects.filter(user__college_id=college_id).order_by('-created_at'),
+    }
+
+
+def run(label, qs_map, repeat=20):
+    print(f"\n=== {label} ===")
+    for name, qs in qs_map.items():
+        start = time.perf_counter()
+        for _ in range(repeat):
+            list(qs[:PAGE])
+        elapsed = (time.perf_counter() - start) / repeat
+        plan = ' | '.join(line.strip() for line in qs[:PAGE].explain().splitlines() if line.strip())
+        print(f"{name:<32} {elapsed * 1000:8.2f} ms   {plan[:140]}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--colleges', type=int, default=500)
+    args = parser.parse_args()
+
+    with test_database():
+        from core.models import Complaint, Feedback
+
+        print(f"Seeding {args.rows:,} complaints across {args.colleges} colleges...")
+        ids = seed(args)
+        qs_map = queries(*ids)
+
+        composite = [(model, index) for model in (Complaint, Feedback) for index in model._meta.indexes
+                     if index.name != 'complaint_created_idx']
+        with connection.schema_editor() as editor:
+            for model, index in composite:
+                editor.remove_index(model, index)
+        run('before: single-column FK indexes only', qs_map)
+
+        with connection.schema_editor() as editor:
+            for model, index in composite:
+                editor.add_index(model, index)
+        with connection.cursor() as cursor:
+            cursor.execute('ANALYZE')
+        run('after: composite filter + sort indexes', qs_map)
+
+
+if __name__ == '__main__':
+    main()
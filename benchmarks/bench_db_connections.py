@@ -0,0 +1,79 @@
+"""Requests/second with and without persistent database connections.
+
+    python benchmarks/bench_db_connections.py [--requests 2000]
+    DATABASE_URL=postgres://... python benchmarks/bench_db_connections.py
+
+Sends sequential GET /api/complaints/ requests through Django's WSGI handler,
+so request_started/request_finished close or keep the connection exactly as
+in production, once per connection profile: a new connection per request
+(CONN_MAX_AGE=0), a persistent one, and a persistent one pinged before each
+request (CONN_HEALTH_CHECKS). Run it against Postgres for representative
+numbers; on SQLite the test database is moved to a file so that closing the
+connection is real, but opening one costs far less than a Postgres handshake.
+"""
+import argparse
+import os
+import tempfile
+from wsgiref.util import setup_testing_defaults
+
+from _setup import test_database, timer
+
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.db.backends.signals import connection_created
+
+PROFILES = [
+    ('new connection per request', 0, False),
+    ('persistent', 600, False),
+    ('persistent + health checks', 600, True),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--requests', type=int, default=2000)
+    args = parser.parse_args()
+
+    if connection.vendor == 'sqlite':
+        # An in-memory test database ignores close() and would hide the difference
+        connection.settings_dict['TEST']['NAME'] = os.path.join(tempfile.mkdtemp(), 'bench.sqlite3')
+
+    with test_database():
+        from core.models import Branch, College, Complaint, User
+        from core.serializers import MyTokenObtainPairSerializer
+
+        college = College.objects.create(name='Bench College', college_type='engineering')
+        branch = Branch.objects.create(college=college, name='Computer Science', code='CSE')
+        student = User.objects.create(username='student', role='student', college=college, branch=branch)
+        Complaint.objects.bulk_create([
+            Complaint(student=student, college=college, branch=branch, title=f'Complaint {i}', description='...')
+            for i in range(20)
+        ])
+        token = str(MyTokenObtainPairSerializer.get_token(student).access_token)
+
+        handler = WSGIHandler()
+        environ = {'PATH_INFO': '/api/complaints/', 'QUERY_STRING': 'page_size=20',
+                   'HTTP_AUTHORIZATION': f'Bearer {token}'}
+        setup_testing_defaults(environ)
+
+        def start_response(status, headers):
+            assert status.startswith('200'), status
+
+        opened = []
+        connection_created.connect(lambda **kwargs: opened.append(1), weak=False)
+        print(f"{connection.vendor}, {args.requests:,} requests")
+        for label, max_age, health_checks in PROFILES:
+            connection.close()
+            connection.settings_dict.update(CONN_MAX_AGE=max_age, CONN_HEALTH_CHECKS=health_checks)
+            opened.clear()
+            with timer(label, args.requests, 'requests'):
+                for _ in range(args.requests):
+                    response = handler(dict(environ), start_response)
+                    b''.join(response)
+                    response.close()  # fires request_finished
+            print(f"{'':<45} {len(opened):9,} connections opened")
+        connection.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Request-path cost of sending complaint emails inline vs. queueing them in the outbox.
+
+    python benchmarks/bench_email_outbox.py [--count 500] [--latency-ms 0]
+
+--latency-ms simulates a remote mail server: every connection open and every
+message pays that much wall-clock time, which is what the request handler
+used to wait for before the outbox existed.
+"""
+import argparse
+import time
+
+from _setup import test_database, timer
+
+from django.core.mail.backends.locmem import EmailBackend
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+
+
+class SlowBackend(EmailBackend):
+    latency = 0.0
+
+    def open(self):
+        time.sleep(self.latency)
+        return True
+
+    def send_messages(self, messages):
+        time.sleep(self.latency * len(messages))
+        return super().send_messages(messages)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=500)
+    parser.add_argument('--latency-ms', type=float, default=0.0)
+    args = parser.parse_args()
+    SlowBackend.latency = args.latency_ms / 1000
+
+    with test_database(), override_settings(EMAIL_BACKEND=f'{__name__}.SlowBackend'):
+        from core.models import College, Complaint, EmailOutbox, User
+        from core.utils.email_utils import send_complaint_submitted_email
+        from core.utils.outbox import deliver_pending, enqueue_email
+
+        college = College.objects.create(name='Bench College', college_type='engineering')
+        student = User.objects.create(username='bench', email='bench@example.com', college=college)
+        complaints = [
+            Complaint.objects.create(student=student, college=college, title=f'Complaint {i}', description='x' * 200)
+            for i in range(args.count)
+        ]
+
+        print(f"{args.count} complaints, simulated mail latency {args.latency_ms} ms\n")
+
+        with timer('inline send_mail (old request path)', args.count, 'requests'):
+            for complaint in complaints:
+                send_complaint_submitted_email(complaint)
+
+        with timer('enqueue_email (new request path)', args.count, 'requests'):
+            for complaint in complaints:
+                with transaction.atomic():
+                    enqueue_email('complaint_submitted', complaint_id=complaint.id)
+
+        with CaptureQueriesContext(connection) as ctx:
+            enqueue_email('complaint_submitted', complaint_id=complaints[0].id)
+        print(f"\nqueries per enqueue: {len(ctx.captured_queries)} -> {ctx.captured_queries[0]['sql'][:60]}...\n")
+
+        pending = EmailOutbox.objects.filter(status='pending').count()
+        with timer('worker drain (one connection)', pending, 'emails'):
+            stats = deliver_pending()
+        print(f"\nworker stats: {stats}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,62 @@
+"""Renders/second of the email templates, before and after precompilation.
+
+    python benchmarks/bench_email_templates.py [--count 20000]
+
+"before" reproduces the old per-send work: format the HTML, then run
+`strip_tags` over the whole rendered document to get the plain-text part.
+"after" is the registry path, where the plain-text rendition was produced
+once at import time.
+"""
+import argparse
+from datetime import datetime
+
+from _setup import timer
+
+from django.utils.html import strip_tags
+
+from core.utils.email_templates import TEMPLATES, FEEDBACK_PROMPT, ROLE_ITEMS
+
+CONTEXTS = {
+    'complaint_submitted': dict(
+        complaint_id=42, username='student1', title='Ragging in <hostel> & mess',
+        submitted_at=datetime(2025, 10, 17, 9, 30).strftime('%B %d, %Y at %I:%M %p'),
+        frontend_url='https://example.com'),
+    'complaint_status_update': dict(
+        complaint_id=42, username='student1', title='Ragging in hostel', status_color='#16a34a',
+        status_message='Great news!', old_status_color='#3b82f6', old_status_display='In Progress',
+        status_display='Solved', feedback_prompt=FEEDBACK_PROMPT, frontend_url='https://example.com'),
+    'complaint_assigned': dict(
+        complaint_id=42, username='squad1', title='Ragging in hostel', description_preview='x' * 100,
+        student_name='Anonymous Student', anonymous_status='Yes (Identity Hidden)',
+        assigned_at='October 17, 2025 at 09:30 AM', frontend_url='https://example.com'),
+    'welcome': dict(
+        username='student1', email='student1@example.com', role_display='Student', role_bg='#dbeafe',
+        role_text='#1e40af', role_item=ROLE_ITEMS['student'], college_name='Test College',
+        frontend_url='https://example.com'),
+}
+
+
+def legacy_render(template, context):
+    values = {k: getattr(v, 'html', v) for k, v in context.items()}
+    html = template.html.format_map(values)
+    return template.subject.format_map(values), strip_tags(html), html
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--count', type=int, default=20000)
+    args = parser.parse_args()
+
+    for name, context in CONTEXTS.items():
+        template = TEMPLATES[name]
+        print(name)
+        with timer('  before: format + strip_tags per send', args.count, 'renders'):
+            for _ in range(args.count):
+                legacy_render(template, context)
+        with timer('  after:  precompiled html + text', args.count, 'renders'):
+            for _ in range(args.count):
+                template.render(**context)
+
+
+if __name__ == '__main__':
+    main()
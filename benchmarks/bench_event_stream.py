@@ -0,0 +1,101 @@
+"""Idle /api/events/ connections held by one ASGI worker, and event fan-out to them.
+
+    python benchmarks/bench_event_stream.py [--connections 1000,5000,10000]
+
+Drives antiragging.asgi.application in-process with fake ASGI connections
+(no sockets, so the numbers exclude the server's own per-connection cost):
+opens N streams as one principal, publishes one event to their college
+channel, waits until every stream has received it, then disconnects them
+all. Streams are coroutines, so the thread count should not grow with N.
+"""
+import argparse
+import asyncio
+import threading
+import time
+import tracemalloc
+
+from _setup import test_database
+
+
+class Connection:
+    """One fake ASGI HTTP connection that records what the app sends."""
+
+    def __init__(self, app, token):
+        self.disconnected = asyncio.Event()
+        self.chunks = asyncio.Queue()
+        self.sent_body = False
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET',
+            'scheme': 'http', 'path': '/api/events/', 'raw_path': b'/api/events/',
+            'query_string': f'token={token}'.encode(), 'root_path': '',
+            'headers': [(b'host', b'testserver')], 'client': ('127.0.0.1', 0), 'server': ('testserver', 80),
+        }
+        self.task = asyncio.create_task(app(scope, self.receive, self.send))
+
+    async def receive(self):
+        if not self.sent_body:
+            self.sent_body = True
+            return {'type': 'http.request', 'body': b'', 'more_body': False}
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def send(self, message):
+        if message['type'] == 'http.response.start':
+            assert message['status'] == 200, message
+        elif message.get('body'):
+            await self.chunks.put(message['body'])
+
+    async def close(self):
+        self.disconnected.set()
+        await self.task
+
+
+async def run(app, token, count, college_id):
+    from core.events import get_broker
+
+    broker = get_broker()
+    threads_before = threading.active_count()
+    tracemalloc.start()
+
+    start = time.perf_counter()
+    connections = [Connection(app, token) for _ in range(count)]
+    for connection in connections:
+        assert (await connection.chunks.get()).startswith(b'retry:')
+    opened = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    broker.publish({'type': 'complaint.created', 'complaint': 1}, [f'college:{college_id}'])
+    for connection in connections:
+        assert b'complaint.created' in await connection.chunks.get()
+    fanned_out = time.perf_counter() - start
+
+    threads_held = threading.active_count()
+    await asyncio.gather(*(connection.close() for connection in connections))
+    assert not broker._channels, 'subscriptions leaked'
+
+    print(f"{count:>8,} streams  open {opened * 1000:8.0f} ms  fan-out {fanned_out * 1000:7.1f} ms  "
+          f"{peak / count / 1024:5.1f} KiB/stream  threads {threads_before} -> {threads_held}")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--connections', default='1000,5000,10000', help="Comma-separated stream counts")
+    args = parser.parse_args()
+
+    with test_database():
+        from antiragging.asgi import application
+        from core.models import College, User
+        from core.serializers import MyTokenObtainPairSerializer
+
+        college = College.objects.create(name='Bench College', college_type='engineering')
+        principal = User.objects.create(username='principal', role='principal', college=college)
+        token = str(MyTokenObtainPairSerializer.get_token(principal).access_token)
+
+        for count in sorted(int(n) for n in args.connections.split(',')):
+            asyncio.run(run(application, token, count, college.id))
+
+
+if __name__ == '__main__':
+    main()
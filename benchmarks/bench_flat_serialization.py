@@ -0,0 +1,66 @@
+"""Objects/second rendering list rows: DRF serializers vs the FlatPlan fast path.
+
+    python benchmarks/bench_flat_serialization.py [--rows 10000]
+
+Seeds N complaints (a third assigned, every tenth anonymous without a
+branch) and N students, then renders them with ComplaintListSerializer and
+UserSerializer from select_related instances, and with core.flat.FlatPlan
+from `.values()` rows. Both timings include the query; the outputs are
+checked to be identical before anything is printed.
+"""
+import argparse
+
+from _setup import test_database, timer
+
+from django.db.models import DateTimeField, Value
+from rest_framework.renderers import JSONRenderer
+
+
+def compare(label, serializer_class, queryset, count):
+    from core.flat import flat_plan
+
+    with timer(f'{label} serializer', count, 'objects'):
+        slow = serializer_class(list(queryset), many=True).data
+    plan = flat_plan(serializer_class())
+    with timer(f'{label} flat plan', count, 'objects'):
+        fast = plan.render(queryset.values(*plan.paths))
+    assert JSONRenderer().render(fast) == JSONRenderer().render(slow), f'{label}: outputs differ'
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--rows', type=int, default=10000)
+    args = parser.parse_args()
+
+    with test_database():
+        from core.models import Branch, College, Complaint, User
+        from core.serializers import ComplaintListSerializer, UserSerializer
+        from core.views import COMPLAINT_RELATED, USER_RELATED
+
+        college = College.objects.create(name='Bench College', college_type='engineering')
+        branch = Branch.objects.create(college=college, name='Computer Science', code='CSE')
+        squad = User.objects.create(username='squad', role='squad', college=college)
+        User.objects.bulk_create([
+            User(username=f'student{i}', email=f'student{i}@example.com', role='student',
+                 college=college, branch=branch, roll_number=f'R{i}')
+            for i in range(args.rows)
+        ])
+        students = list(User.objects.filter(role='student').values_list('id', flat=True))
+        Complaint.objects.bulk_create([
+            Complaint(student_id=student_id, college=college, branch=None if i % 10 == 0 else branch,
+                      assigned_to=squad if i % 3 == 0 else None, is_anonymous=i % 10 == 0,
+                      title=f'Complaint {i}', description='Seniors forced us to ' * 10)
+            for i, student_id in enumerate(students)
+        ])
+
+        # The list endpoint's feedback annotations, minus the subqueries
+        complaints = (Complaint.objects.select_related(*COMPLAINT_RELATED)
+                      .annotate(feedback_count=Value(0), last_feedback_at=Value(None, output_field=DateTimeField()))
+                      .order_by('-created_at'))
+        compare('ComplaintListSerializer', ComplaintListSerializer, complaints, args.rows)
+        users = User.objects.filter(role='student').select_related(*USER_RELATED).order_by('id')
+        compare('UserSerializer', UserSerializer, users, args.rows)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""Throughput of `manage.py import_institutions` on a statewide-sized file.
+
+    python benchmarks/bench_import_institutions.py [--colleges 20000] [--branches 6] [--batch-size 2000]
+
+Generates a CSV of synthetic colleges with their branches, imports it into an
+empty database, then re-imports it unchanged and once more with every
+address edited, to show the insert, no-op and update paths.
+"""
+import argparse
+import csv
+import os
+import tempfile
+from io import StringIO
+
+from _setup import test_database, timer
+
+from django.core.management import call_command
+
+TYPES = ['engineering', 'puc', 'diploma', 'iti', 'masters']
+
+
+def write_file(path, args, address_suffix=''):
+    with open(path, 'w', newline='') as handle:
+        writer = csv.writer(handle)
+        writer.writerow(['college', 'college_type', 'address', 'branch', 'branch_code'])
+        for i in range(args.colleges):
+            for b in range(args.branches):
+                writer.writerow([f'College {i}', TYPES[i % len(TYPES)], f'District {i % 31}{address_suffix}',
+                                 f'Branch {b}', f'B{b}'])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--colleges', type=int, default=20_000)
+    parser.add_argument('--branches', type=int, default=6)
+    parser.add_argument('--batch-size', type=int, default=2000)
+    args = parser.parse_args()
+    rows = args.colleges * args.branches
+
+    with tempfile.TemporaryDirectory() as tmp, test_database():
+        path = os.path.join(tmp, 'institutions.csv')
+        for label, suffix in (('first import (all inserts)', ''), ('re-import (unchanged)', ''),
+                              ('re-import (addresses edited)', ' East')):
+            write_file(path, args, suffix)
+            out = StringIO()
+            with timer(label, rows, 'rows'):
+                call_command('import_institutions', path, batch_size=args.batch_size, stdout=out)
+            print('   ' + out.getvalue().strip().replace('\n', ' '))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,56 @@
+"""Logins/second per core on /api/token/ under one or more hasher policies.
+
+    python benchmarks/bench_login.py [--logins 20] [--iterations 260000,600000,1000000]
+
+Runs in a single process, so the numbers are per core; multiply by the
+worker processes on an auth host to size the tier. For every policy it also
+shows the one-off cost of the transparent re-hash the first time an existing
+user logs in after the policy changed.
+"""
+import argparse
+import time
+
+from _setup import test_database
+
+from django.test.utils import override_settings
+from rest_framework.test import APIClient
+
+
+def login(client):
+    response = client.post('/api/token/', {'identifier': 'bench@example.com', 'password': 'bench-password-1'},
+                           format='json')
+    assert response.status_code == 200, response.data
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--logins', type=int, default=20)
+    parser.add_argument('--iterations', default='260000,600000,1000000',
+                        help="Comma-separated PBKDF2 iteration counts to compare")
+    args = parser.parse_args()
+
+    with test_database():
+        from core.models import User
+
+        user = User.objects.create(username='bench', email='bench@example.com')
+        user.set_password('bench-password-1')
+        user.save()
+        client = APIClient()
+
+        print(f"{'iterations':>12} {'rehash login':>14} {'login':>10} {'logins/s/core':>15}")
+        for iterations in [int(i) for i in args.iterations.split(',')]:
+            with override_settings(PASSWORD_HASHER='pbkdf2_sha256', PASSWORD_HASH_ITERATIONS=iterations):
+                start = time.perf_counter()
+                login(client)  # stored hash predates this policy -> verified, then re-hashed
+                rehash = time.perf_counter() - start
+                assert User.objects.get(pk=user.pk).password.split('$')[1] == str(iterations)
+
+                start = time.perf_counter()
+                for _ in range(args.logins):
+                    login(client)
+                per_login = (time.perf_counter() - start) / args.logins
+            print(f"{iterations:>12,} {rehash * 1000:>11.1f} ms {per_login * 1000:>7.1f} ms {1 / per_login:>15.1f}")
+
+
+if __name__ == '__main__':
+    main()
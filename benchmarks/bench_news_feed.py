@@ -0,0 +1,98 @@
+"""Latency of the college-scoped news feed as the number of posts grows.
+
+    python benchmarks/bench_news_feed.py [--posts 10000,100000] [--colleges 3000]
+
+Seeds posts spread over thousands of colleges (about 5% of them global)
+with raw INSERTs, then times uncached first pages and a deep page for a
+student of one college. With one keyset range scan per feed the timings
+should stay flat as the table grows; the old `college IS NULL OR college = x`
+query is timed alongside for comparison.
+"""
+import argparse
+import statistics
+import time
+from datetime import timedelta
+
+from _setup import test_database
+
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+REPEAT = 50
+
+
+def seed(count, college_ids, author_id, start_index):
+    from core.models import News
+
+    now = timezone.now()
+    sql = (f'INSERT INTO {News._meta.db_table} (created_by_id, college_id, title, content, posted_at) '
+           f'VALUES (%s, %s, %s, %s, %s)')
+    with connection.cursor() as cursor:
+        for offset in range(0, count, 10000):
+            batch = []
+            for i in range(start_index + offset, start_index + min(offset + 10000, count)):
+                college_id = None if i % 20 == 0 else college_ids[i % len(college_ids)]
+                batch.append((author_id, college_id, f'Notice {i}', 'Lorem ipsum dolor sit amet ' * 8,
+                              now - timedelta(seconds=i)))
+            cursor.executemany(sql, batch)
+
+
+def p50(fn):
+    samples = []
+    for _ in range(REPEAT):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--posts', default='10000,100000', help="Comma-separated table sizes")
+    parser.add_argument('--colleges', type=int, default=3000)
+    args = parser.parse_args()
+    sizes = sorted(int(n) for n in args.posts.split(','))
+
+    with test_database():
+        from core.models import College, News, User
+
+        College.objects.bulk_create(
+            [College(name=f'College {i}', college_type='engineering') for i in range(args.colleges)]
+        )
+        college_ids = list(College.objects.values_list('id', flat=True))
+        admin = User.objects.create(username='admin', role='admin')
+        student = User.objects.create(username='student', role='student', college_id=college_ids[7])
+        client = APIClient()
+        client.force_authenticate(student)
+
+        def first_page():
+            cache.clear()
+            assert client.get('/api/news/').status_code == 200
+
+        def deep_page():
+            # Walk 10 pages in, then time fetching the page after that cursor
+            url = '/api/news/'
+            for _ in range(10):
+                url = client.get(url).data['next']
+            return lambda: client.get(url)
+
+        def or_query():
+            list(News.objects.filter(Q(college__isnull=True) | Q(college_id=student.college_id))
+                 .select_related('created_by__college', 'created_by__branch')
+                 .order_by('-posted_at', '-id')[:21])
+
+        seeded = 0
+        print(f"{'posts':>10} {'first page':>12} {'page 11':>12} {'OR query':>12}   (p50 ms)")
+        for size in sizes:
+            seed(size - seeded, college_ids, admin.id, seeded)
+            seeded = size
+            with connection.cursor() as cursor:
+                cursor.execute('ANALYZE')
+            print(f"{size:>10,} {p50(first_page):12.2f} {p50(deep_page()):12.2f} {p50(or_query):12.2f}")
+
+
+if __name__ == '__main__':
+    main()
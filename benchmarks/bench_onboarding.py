@@ -0,0 +1,57 @@
+"""Onboarding a college roster: one RegisterAPI call per student vs the bulk path.
+
+    python benchmarks/bench_onboarding.py [--students 5000] [--api-sample 50] [--workers 1,4]
+
+The per-request path is timed on a sample and extrapolated to the roster
+size. The bulk path (validate_roster + onboard_students) is timed for the
+whole roster once per worker count. Both use the configured PASSWORD_HASHER.
+"""
+import argparse
+import os
+import time
+
+from _setup import test_database, timer
+
+from rest_framework.test import APIClient
+
+
+def roster(count, prefix, offset=0):
+    return [{'username': f'{prefix}{i}', 'email': f'{prefix}{i}@example.com', 'phone': f'9{offset + i:09d}',
+             'password': f'initial-pass-{i}', 'branch': 'CSE'} for i in range(count)]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--students', type=int, default=5000)
+    parser.add_argument('--api-sample', type=int, default=50)
+    parser.add_argument('--workers', default=f'1,{os.cpu_count()}',
+                        help="Comma-separated process counts for the bulk path")
+    args = parser.parse_args()
+
+    with test_database():
+        from core.models import Branch, College, User
+        from core.utils.onboarding import onboard_students, validate_roster
+
+        college = College.objects.create(name='Bench College', college_type='engineering')
+        branch = Branch.objects.create(college=college, name='Computer Science', code='CSE')
+        client = APIClient()
+
+        start = time.perf_counter()
+        for row in roster(args.api_sample, 'api'):
+            response = client.post('/api/register/', {**row, 'college': college.id, 'branch': branch.id}, format='json')
+            assert response.status_code == 201, response.data
+        per_student = (time.perf_counter() - start) / args.api_sample
+        print(f"{'RegisterAPI, extrapolated':<45} {per_student * args.students * 1000:9.1f} ms"
+              f"  {1 / per_student:12,.0f} students/s")
+
+        for run, workers in enumerate(int(w) for w in args.workers.split(',')):
+            prefix = f'bulk{run}_'
+            with timer(f'bulk onboarding, {workers} process(es)', args.students, 'students'):
+                students, errors = validate_roster(roster(args.students, prefix, (run + 1) * 10**6), college)
+                assert not errors, errors[:5]
+                onboard_students(students, workers=workers)
+            User.objects.filter(username__startswith=prefix).delete()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,6 @@
 from django.contrib import admin
-from .models import User, College, Branch, Complaint, Feedback, News
+from . import search
+from .models import User, College, Branch, Complaint, Feedback, News, EmailOutbox, ComplaintStat, ComplaintDailyStat
 
 @admin.register(College)
 class CollegeAdmin(admin.ModelAdmin):
@@ -25,6 +26,12 @@ class ComplaintAdmin(admin.ModelAdmin):
     list_filter = ['status', 'college', 'branch']
     search_fields = ['title', 'description']
 
+    def get_search_results(self, request, queryset, search_term):
+        # Served by the full-text index instead of a LIKE scan over every row
+        if not search_term.strip():
+            return queryset, False
+        return search.matching(queryset, search_term), False
+
 @admin.register(Feedback)
 class FeedbackAdmin(admin.ModelAdmin):
     list_display = ['user', 'complaint', 'created_at']
@@ -33,3 +40,20 @@ class FeedbackAdmin(admin.ModelAdmin):
 class NewsAdmin(admin.ModelAdmin):
     list_display = ['title', 'created_by', 'college', 'posted_at']
     list_filter = ['college']
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ['kind', 'status', 'attempts', 'next_attempt_at', 'created_at', 'sent_at']
+    list_filter = ['status', 'kind']
+    readonly_fields = ['created_at', 'sent_at']
+
+@admin.register(ComplaintStat)
+class ComplaintStatAdmin(admin.ModelAdmin):
+    list_display = ['college', 'branch', 'status', 'assigned_to', 'count']
+    list_filter = ['status', 'college']
+
+@admin.register(ComplaintDailyStat)
+class ComplaintDailyStatAdmin(admin.ModelAdmin):
+    list_display = ['day', 'college', 'branch', 'created', 'resolved', 'closed']
+    list_filter = ['college']
+    date_hierarchy = 'day'
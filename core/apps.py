@@ -4,3 +4,8 @@ from django.apps import AppConfig
 class CoreConfig(AppConfig):
     default_auto_field = "django.db.models.BigAutoField"
     name = "core"
+
+    def ready(self):
+        # Compile the email templates once at startup rather than on first send
+        from core.utils import email_templates  # noqa: F401
+        from core import signals  # noqa: F401
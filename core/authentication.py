@@ -0,0 +1,118 @@
+import threading
+import time
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+
+
+class ClaimsUser(TokenUser):
+    """Request user built from the claims MyTokenObtainPairSerializer.get_token embeds.
+
+    Carries just what the role-scoped querysets need (id, role, college_id,
+    branch_id, is_superuser) and never touches the database.
+    """
+
+    @property
+    def role(self):
+        return self.token.get('role')
+
+    @property
+    def college_id(self):
+        return self.token.get('college_id')
+
+    @property
+    def branch_id(self):
+        return self.token.get('branch_id')
+
+    @property
+    def is_superuser(self):
+        return self.token.get('is_superuser', False)
+
+
+# --- Revocation set ---
+# Suspended or deactivated users are rejected outright. Users whose claims
+# (User.CLAIM_FIELDS) changed within an access token's lifetime map to when it
+# happened: their older tokens carry stale claims and get the database user.
+_revoked = {'ids': frozenset(), 'claims_changed': {}, 'expires_at': 0.0}
+_revoked_lock = threading.Lock()
+
+
+def _load_revocations():
+    if time.monotonic() >= _revoked['expires_at']:
+        with _revoked_lock:
+            if time.monotonic() >= _revoked['expires_at']:
+                since = timezone.now() - api_settings.ACCESS_TOKEN_LIFETIME
+                rows = User.objects.filter(
+                    Q(is_suspended=True) | Q(is_active=False) | Q(claims_changed_at__gte=since)
+                ).values_list('id', 'is_suspended', 'is_active', 'claims_changed_at')
+                ids, claims_changed = set(), {}
+                for user_id, is_suspended, is_active, changed_at in rows:
+                    if is_suspended or not is_active:
+                        ids.add(user_id)
+                    else:
+                        claims_changed[user_id] = changed_at.timestamp()
+                _revoked['ids'] = frozenset(ids)
+                _revoked['claims_changed'] = claims_changed
+                _revoked['expires_at'] = time.monotonic() + getattr(settings, 'CLAIMS_AUTH_REVOCATION_TTL', 30)
+    return _revoked
+
+
+def revoked_user_ids():
+    """IDs of suspended or deactivated users, refreshed at most every
+    CLAIMS_AUTH_REVOCATION_TTL seconds per process."""
+    return _load_revocations()['ids']
+
+
+def claims_changed_at(user_id):
+    """Timestamp of the user's last claims change, if within an access token's lifetime."""
+    return _load_revocations()['claims_changed'].get(user_id)
+
+
+def invalidate_revoked_users():
+    """Force the next request in this process to reload the revocation set."""
+    _revoked['expires_at'] = 0.0
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """Opt-in JWT authentication that skips the per-request user lookup on reads.
+
+    GET/HEAD/OPTIONS requests get a `ClaimsUser` built from the token; writes
+    still load the full `User` row. Suspensions are enforced through
+    `revoked_user_ids()`, so a suspended user keeps read access for at most
+    CLAIMS_AUTH_REVOCATION_TTL seconds in other processes. Tokens issued before
+    the `is_superuser` claim existed, or before the user's claims last changed
+    (`claims_changed_at()`), fall back to the database lookup.
+    """
+
+    def authenticate(self, request):
+        if request.method not in SAFE_METHODS:
+            return super().authenticate(request)
+
+        header = self.get_header(request)
+        if header is None:
+            return None
+        raw_token = self.get_raw_token(header)
+        if raw_token is None:
+            return None
+        validated_token = self.get_validated_token(raw_token)
+        return self.get_claims_user(validated_token), validated_token
+
+    def get_claims_user(self, validated_token):
+        if 'is_superuser' not in validated_token:
+            return self.get_user(validated_token)
+
+        user = ClaimsUser(validated_token)
+        if user.id in revoked_user_ids():
+            raise AuthenticationFailed('User is inactive or suspended', code='user_inactive')
+        changed_at = claims_changed_at(user.id)
+        if changed_at is not None and validated_token.get('iat', 0) <= changed_at:
+            return self.get_user(validated_token)
+        return user
@@ -0,0 +1,250 @@
+"""Live complaint events for the /api/events/ Server-Sent Events stream.
+
+Signal handlers publish events after commit to channels named after who may
+see them ('all', 'college:<id>', 'user:<id>'); every stream subscribes to
+the single channel its role reads, mirroring ComplaintQueryMixin. The broker
+class is set by EVENTS_BROKER. `LocalBroker` only reaches streams served by
+the same process, so running several workers needs a shared broker (e.g.
+Redis pub/sub) implementing subscribe/unsubscribe/publish.
+
+`events_app` is a plain ASGI application mounted by antiragging/asgi.py in
+front of Django: a request through Django's handler keeps a thread of its
+own for its sync middleware until the response ends, which would cost one
+idle thread per open stream.
+"""
+import asyncio
+import json
+import threading
+import time
+from collections import defaultdict
+from urllib.parse import parse_qs
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+from rest_framework_simplejwt.exceptions import AuthenticationFailed
+
+# Queued in place of events a slow stream could not keep up with
+OVERFLOW = object()
+
+
+class Subscription:
+    def __init__(self, channels, loop, maxsize):
+        self.channels = tuple(channels)
+        self.loop = loop
+        self.queue = asyncio.Queue(maxsize=maxsize)
+
+    def deliver(self, event):
+        # Runs on the subscriber's event loop
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Drop the backlog and tell the client to resync with a fresh fetch
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+
+    async def get(self):
+        return await self.queue.get()
+
+
+class LocalBroker:
+    """In-process fan-out from publishers in any thread to asyncio subscribers.
+
+    Signal handlers run in sync worker threads while streams wait on the
+    server's event loop, so events are handed over with
+    call_soon_threadsafe. An idle subscription is just a queue.
+    """
+
+    def __init__(self, queue_size=None):
+        self.queue_size = queue_size or getattr(settings, 'EVENTS_QUEUE_SIZE', 100)
+        self._channels = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def subscribe(self, channels):
+        """Subscribe the running event loop to `channels`; call from async code."""
+        subscription = Subscription(channels, asyncio.get_running_loop(), self.queue_size)
+        with self._lock:
+            for channel in subscription.channels:
+                self._channels[channel].add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._channels.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._channels[channel]
+
+    def publish(self, event, channels):
+        with self._lock:
+            subscriptions = set().union(*(self._channels.get(channel, ()) for channel in channels))
+        for subscription in subscriptions:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.deliver, event)
+            except RuntimeError:  # loop already closed
+                self.unsubscribe(subscription)
+
+
+def _sse(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n"
+
+
+class EventStream:
+    """Server-Sent Events messages for one subscription, until `expires_at`."""
+
+    def __init__(self, broker, subscription, expires_at):
+        self.broker = broker
+        self.subscription = subscription
+        self.expires_at = expires_at
+
+    def __aiter__(self):
+        return self._messages()
+
+    async def _messages(self):
+        keepalive = getattr(settings, 'EVENTS_KEEPALIVE', 15)
+        try:
+            yield f"retry: {getattr(settings, 'EVENTS_RETRY_MS', 5000)}\n\n"
+            while (remaining := self.expires_at - time.time()) > 0:
+                try:
+                    event = await asyncio.wait_for(self.subscription.get(), timeout=min(keepalive, remaining))
+                except asyncio.TimeoutError:
+                    yield ': keep-alive\n\n'
+                    continue
+                if event is OVERFLOW:
+                    yield 'event: reset\ndata: {}\n\n'
+                    return
+                yield _sse(event)
+        finally:
+            self.close()
+
+    def close(self):
+        self.broker.unsubscribe(self.subscription)
+
+
+_brokers = {}
+_brokers_lock = threading.Lock()
+
+
+def get_broker():
+    path = getattr(settings, 'EVENTS_BROKER', 'core.events.LocalBroker')
+    if path not in _brokers:
+        with _brokers_lock:
+            if path not in _brokers:
+                _brokers[path] = import_string(path)()
+    return _brokers[path]
+
+
+def channels_for_user(user):
+    """The one channel a stream subscribes to, matching what the user can list."""
+    if user.role == 'admin':
+        return ['all']
+    if user.role == 'principal':
+        return [f'college:{user.college_id}'] if user.college_id else []
+    return [f'user:{user.id}']  # squad: assigned complaints; student: own complaints
+
+
+def channels_for_complaint(college_id, student_id, assigned_to_id):
+    channels = ['all', f'user:{student_id}']
+    if college_id:
+        channels.append(f'college:{college_id}')
+    if assigned_to_id:
+        channels.append(f'user:{assigned_to_id}')
+    return channels
+
+
+def publish_complaint_event(event_type, complaint, also_notify=(), **data):
+    """Publish an event about `complaint` to everyone who can see it, after commit.
+
+    The event and its channels are captured now, from the state being
+    saved. Payloads only carry ids and the changed fields; clients fetch
+    the complaint itself, so anonymity rules stay in the serializers.
+    `also_notify` adds user ids that are losing sight of the complaint.
+    """
+    event = {'type': event_type, 'complaint': complaint.id, **data}
+    channels = channels_for_complaint(complaint.college_id, complaint.student_id, complaint.assigned_to_id)
+    channels += [f'user:{user_id}' for user_id in also_notify if user_id]
+    transaction.on_commit(lambda: get_broker().publish(event, channels))
+
+
+# --- ASGI endpoint ---
+def _cors_headers(headers):
+    origin = headers.get(b'origin', b'').decode('latin-1')
+    if getattr(settings, 'CORS_ALLOW_ALL_ORIGINS', False):
+        return [(b'access-control-allow-origin', b'*')]
+    if origin and origin in getattr(settings, 'CORS_ALLOWED_ORIGINS', ()):
+        return [(b'access-control-allow-origin', origin.encode('latin-1')), (b'vary', b'Origin')]
+    return []
+
+
+async def _send_json(send, status, body, extra_headers):
+    await send({'type': 'http.response.start', 'status': status,
+                'headers': [(b'content-type', b'application/json'), *extra_headers]})
+    await send({'type': 'http.response.body', 'body': json.dumps(body).encode()})
+
+
+async def _wait_for_disconnect(receive):
+    while (await receive())['type'] != 'http.disconnect':
+        pass
+
+
+def _authenticate(raw_token):
+    from .authentication import ClaimsJWTAuthentication
+
+    auth = ClaimsJWTAuthentication()
+    validated_token = auth.get_validated_token(raw_token)
+    return auth.get_claims_user(validated_token), validated_token
+
+
+async def events_app(scope, receive, send):
+    """GET /api/events/: Server-Sent Events stream of role-scoped complaint events.
+
+    EventSource cannot set headers, so the access token may be passed as
+    `?token=` instead of `Authorization: Bearer`. The stream ends when the
+    token expires; EventSource then reconnects and the client is
+    re-authenticated with a fresh token.
+    """
+    headers = dict(scope['headers'])
+    cors = _cors_headers(headers)
+    if scope['method'] != 'GET':
+        return await _send_json(send, 405, {'detail': f'Method "{scope["method"]}" not allowed.'}, cors)
+
+    raw_token = parse_qs(scope['query_string'].decode('latin-1')).get('token', [None])[0]
+    authorization = headers.get(b'authorization', b'').split()
+    if not raw_token and len(authorization) == 2 and authorization[0] == b'Bearer':
+        raw_token = authorization[1].decode('latin-1')
+    if not raw_token:
+        return await _send_json(send, 401, {'detail': 'Authentication credentials were not provided.'}, cors)
+    try:
+        # Thread-sensitive calls made outside Django's handler share one process-wide thread
+        user, validated_token = await sync_to_async(_authenticate)(raw_token)
+    except AuthenticationFailed as e:  # InvalidToken included
+        return await _send_json(send, 401, e.detail if isinstance(e.detail, dict) else {'detail': e.detail}, cors)
+
+    broker = get_broker()
+    stream = EventStream(broker, broker.subscribe(channels_for_user(user)), validated_token['exp'])
+
+    async def pump():
+        await send({'type': 'http.response.start', 'status': 200, 'headers': [
+            (b'content-type', b'text/event-stream'),
+            (b'cache-control', b'no-cache'),
+            (b'x-accel-buffering', b'no'),  # nginx: flush every event
+            *cors,
+        ]})
+        async for message in stream:
+            await send({'type': 'http.response.body', 'body': message.encode(), 'more_body': True})
+        await send({'type': 'http.response.body', 'body': b''})
+
+    tasks = [asyncio.ensure_future(pump()), asyncio.ensure_future(_wait_for_disconnect(receive))]
+    try:
+        done, pending = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            task.result()
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        stream.close()
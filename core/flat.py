@@ -0,0 +1,93 @@
+"""Read-only fast path for large list pages.
+
+`FlatPlan` compiles a (possibly sparse) serializer once into `.values()`
+paths plus a per-field conversion, then renders rows straight from the
+value dicts, skipping model instances and DRF's per-field dispatch. The
+output matches `serializer.data` exactly, including DRF's rules for nulls:
+a dotted source through a null relation (e.g. `branch.name` without a
+branch) is left out, a null nested object is None.
+"""
+from rest_framework import fields, relations, serializers
+from rest_framework.fields import empty
+
+# Fields whose to_representation() returns database values unchanged
+_IDENTITY = (fields.CharField, fields.IntegerField, fields.BooleanField, fields.ChoiceField,
+             relations.PrimaryKeyRelatedField)
+_SKIP = object()
+
+
+class UnsupportedField(Exception):
+    pass
+
+
+def _missing_value(field):
+    # What Field.get_attribute() does when the source cannot be followed
+    if field.default is not empty:
+        return field.get_default()
+    if field.allow_null:
+        return None
+    if not field.required:
+        return _SKIP
+    raise UnsupportedField(field.field_name)
+
+
+class FlatPlan:
+    def __init__(self, serializer):
+        self.paths = []
+        self._render = self._compile(serializer, '')
+
+    def _path(self, path):
+        if path not in self.paths:
+            self.paths.append(path)
+        return path
+
+    def _compile(self, serializer, prefix):
+        steps = []
+        for field in serializer._readable_fields:
+            attrs = field.source_attrs
+            if field.source == '*' or isinstance(field, (serializers.SerializerMethodField, serializers.ListSerializer)):
+                raise UnsupportedField(field.field_name)
+            # Other relations render objects (or need the request), not the pk a row holds
+            if isinstance(field, relations.RelatedField) and not isinstance(field, relations.PrimaryKeyRelatedField):
+                raise UnsupportedField(field.field_name)
+
+            if isinstance(field, serializers.BaseSerializer):
+                nested_prefix = prefix + '__'.join(attrs) + '__'
+                steps.append((field.field_name, self._path(nested_prefix + 'id'), (),
+                              ('nested', self._compile(field, nested_prefix))))
+                continue
+
+            # Relations a dotted source walks through, each a nullable foreign key
+            links = tuple(self._path(prefix + '__'.join(attrs[:depth])) for depth in range(1, len(attrs)))
+            missing = _missing_value(field) if links else None
+            convert = None if isinstance(field, _IDENTITY) else field.to_representation
+            steps.append((field.field_name, self._path(prefix + '__'.join(attrs)), links, (missing, convert)))
+
+        def render(row):
+            ret = {}
+            for name, path, links, how in steps:
+                if how[0] == 'nested':
+                    ret[name] = None if row[path] is None else how[1](row)
+                    continue
+                missing, convert = how
+                if any(row[link] is None for link in links):
+                    if missing is not _SKIP:
+                        ret[name] = missing
+                    continue
+                value = row[path]
+                ret[name] = value if value is None or convert is None else convert(value)
+            return ret
+
+        return render
+
+    def render(self, rows):
+        render = self._render
+        return [render(row) for row in rows]
+
+
+def flat_plan(serializer):
+    """A FlatPlan for `serializer`, or None if one of its fields needs the real serializer."""
+    try:
+        return FlatPlan(serializer)
+    except UnsupportedField:
+        return None
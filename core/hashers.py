@@ -0,0 +1,44 @@
+"""Password hashers whose work factor comes from settings.
+
+The cost of `check_password` is what sizes the auth tier, so it is a
+deployment setting (see PASSWORD_HASHER / PASSWORD_HASH_ITERATIONS /
+PASSWORD_SCRYPT_WORK_FACTOR in settings.py) rather than a constant baked into
+Django's release. The algorithm names are unchanged, so existing hashes keep
+verifying; when the policy changes, Django's `must_update` check makes
+`User.check_password` re-hash the password with the new parameters on the
+user's next successful login.
+"""
+import base64
+import hashlib
+
+from django.conf import settings
+from django.contrib.auth.hashers import PBKDF2PasswordHasher, ScryptPasswordHasher
+
+
+class TunedPBKDF2PasswordHasher(PBKDF2PasswordHasher):
+    @property
+    def iterations(self):
+        return getattr(settings, 'PASSWORD_HASH_ITERATIONS', 0) or PBKDF2PasswordHasher.iterations
+
+
+class TunedScryptPasswordHasher(ScryptPasswordHasher):
+    @property
+    def work_factor(self):
+        return getattr(settings, 'PASSWORD_SCRYPT_WORK_FACTOR', 0) or ScryptPasswordHasher.work_factor
+
+    @staticmethod
+    def maxmem_for(n, r):
+        # scrypt needs ~128 * n * r bytes; leave headroom above OpenSSL's 32 MiB default
+        return max(2 * 128 * n * r, 32 * 1024 * 1024)
+
+    def encode(self, password, salt, n=None, r=None, p=None):
+        # Same as Django's, but the memory limit follows the n/r being hashed
+        # (a stored hash or a calibration probe), not the configured work factor
+        self._check_encode_args(password, salt)
+        n = n or self.work_factor
+        r = r or self.block_size
+        p = p or self.parallelism
+        hash_ = hashlib.scrypt(password.encode(), salt=salt.encode(), n=n, r=r, p=p,
+                               maxmem=self.maxmem_for(n, r), dklen=64)
+        hash_ = base64.b64encode(hash_).decode('ascii').strip()
+        return '%s$%d$%s$%d$%d$%s' % (self.algorithm, n, salt, r, p, hash_)
@@ -0,0 +1,53 @@
+import time
+
+from django.conf import settings
+from django.contrib.auth.hashers import get_hasher
+from django.core.management.base import BaseCommand
+
+
+def _time_hash(hasher, repeat, **params):
+    salt = hasher.salt()
+    start = time.perf_counter()
+    for _ in range(repeat):
+        hasher.encode('calibration-password', salt, **params)
+    return (time.perf_counter() - start) / repeat
+
+
+class Command(BaseCommand):
+    help = "Measure password hashing on this machine and recommend a work factor for a target login cost"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--target-ms', type=float, default=250,
+                            help="Hashing time per login to aim for, in milliseconds (default: 250)")
+        parser.add_argument('--algorithm', choices=['pbkdf2_sha256', 'scrypt'], default=None,
+                            help="Hasher to calibrate (default: settings.PASSWORD_HASHER)")
+
+    def handle(self, *args, **options):
+        algorithm = options['algorithm'] or settings.PASSWORD_HASHER
+        target = options['target_ms'] / 1000
+        hasher = get_hasher(algorithm)
+
+        if algorithm == 'pbkdf2_sha256':
+            probe = 100_000
+            per_iteration = _time_hash(hasher, 5, iterations=probe) / probe
+            recommended = max(100_000, int(target / per_iteration) // 10_000 * 10_000)
+            cost = recommended * per_iteration
+            current = hasher.iterations
+            setting = f"PASSWORD_HASH_ITERATIONS={recommended}"
+        else:
+            recommended, cost = 2 ** 10, None
+            n = 2 ** 10
+            while n <= 2 ** 20:
+                elapsed = _time_hash(hasher, 3, n=n)
+                if elapsed > target:
+                    break
+                recommended, cost = n, elapsed
+                n *= 2
+            cost = cost or _time_hash(hasher, 3, n=recommended)
+            current = hasher.work_factor
+            setting = f"PASSWORD_SCRYPT_WORK_FACTOR={recommended}"
+
+        self.stdout.write(f"🔐 {algorithm}: current work factor {current}")
+        self.stdout.write(f"   recommended for ~{options['target_ms']:.0f} ms/login: {setting}")
+        self.stdout.write(f"   measured {cost * 1000:.1f} ms per hash -> ~{1 / cost:.1f} logins/second per core")
+        self.stdout.write("   Existing hashes are upgraded on each user's next successful login.")
@@ -0,0 +1,66 @@
+import csv
+import json
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.utils.institutions import InvalidRow, import_institutions
+
+
+def read_csv(handle):
+    """(line, row) pairs; `line_num` is where the record ends, as quoted fields may span lines."""
+    reader = csv.DictReader(handle)
+    for row in reader:
+        yield reader.line_num, row
+
+
+def read_jsonl(handle):
+    """(line, row) pairs, one object per line; an object may list its branches under `branches`."""
+    for number, line in enumerate(handle, start=1):
+        if not line.strip():
+            continue
+        row = json.loads(line)
+        if not isinstance(row, dict):
+            yield number, InvalidRow('expected a JSON object')
+            continue
+        branches = row.pop('branches', None)
+        if not branches:
+            yield number, row
+        for branch in branches or []:
+            if not isinstance(branch, dict):
+                yield number, InvalidRow(f'branch {branch!r} is not an object with name/code')
+                continue
+            yield number, {**row, 'branch': branch.get('name'), 'branch_code': branch.get('code')}
+
+
+class Command(BaseCommand):
+    help = ("Create or update colleges and branches from a CSV or JSONL file "
+            "(columns: college, college_type, address, branch, branch_code)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="File to import; .jsonl/.ndjson is read as JSON lines, anything else as CSV")
+        parser.add_argument('--batch-size', type=int, default=2000,
+                            help="Rows upserted per transaction (default: 2000)")
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist")
+        reader = read_jsonl if path.suffix in ('.jsonl', '.ndjson') else read_csv
+
+        def report(line, message):
+            self.stderr.write(f"❌ Line {line}: {message}")
+
+        with path.open(newline='', encoding='utf-8-sig') as handle:
+            try:
+                stats = import_institutions(reader(handle), batch_size=options['batch_size'], on_error=report)
+            except (csv.Error, json.JSONDecodeError) as e:
+                raise CommandError(f"Could not parse {path}: {e}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"🏫 Colleges: {stats['colleges_inserted']} inserted, {stats['colleges_updated']} updated, "
+            f"{stats['colleges_unchanged']} unchanged\n"
+            f"   Branches: {stats['branches_inserted']} inserted, {stats['branches_updated']} updated, "
+            f"{stats['branches_unchanged']} unchanged"
+            + (f"\n   Skipped {stats['invalid']} invalid row(s)" if stats['invalid'] else "")
+        ))
@@ -0,0 +1,49 @@
+import csv
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import IntegrityError
+
+from core.models import College
+from core.utils.onboarding import onboard_students, validate_roster
+
+
+class Command(BaseCommand):
+    help = ("Create student accounts in bulk from a roster CSV "
+            "(columns: username, email, phone, password, branch, roll_number)")
+
+    def add_arguments(self, parser):
+        parser.add_argument('path', help="Roster CSV file")
+        parser.add_argument('--college', type=int, required=True, help="ID of the students' college")
+        parser.add_argument('--workers', type=int, default=None,
+                            help="Processes hashing passwords (default: one per CPU core)")
+        parser.add_argument('--skip-invalid', action='store_true',
+                            help="Onboard the valid rows even if some rows are rejected")
+        parser.add_argument('--dry-run', action='store_true', help="Only validate the roster")
+
+    def handle(self, *args, **options):
+        path = Path(options['path'])
+        if not path.exists():
+            raise CommandError(f"{path} does not exist")
+        college = College.objects.filter(pk=options['college']).first()
+        if college is None:
+            raise CommandError(f"College {options['college']} does not exist")
+
+        with path.open(newline='', encoding='utf-8-sig') as handle:
+            students, errors = validate_roster(csv.DictReader(handle), college)
+
+        for line, field, message in errors:
+            self.stderr.write(f"❌ Row {line} {field}: {message}")
+        if errors and not options['skip_invalid']:
+            raise CommandError(f"{len(errors)} problem(s) in the roster; nothing was created "
+                               f"(use --skip-invalid to onboard the valid rows)")
+        if options['dry_run']:
+            self.stdout.write(f"🎓 {len(students)} student(s) would be onboarded to {college.name}")
+            return
+
+        try:
+            created = onboard_students(students, workers=options['workers'])
+        except IntegrityError as e:
+            raise CommandError(f"An account was registered while onboarding; nothing was created: {e}")
+        self.stdout.write(self.style.SUCCESS(
+            f"🎓 Onboarded {len(created)} student(s) to {college.name}; welcome emails queued"))
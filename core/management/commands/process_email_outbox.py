@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core.utils.outbox import deliver_pending
+
+
+class Command(BaseCommand):
+    help = "Deliver queued emails from the outbox (run with --loop as a background worker)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=None,
+                            help="Rows claimed per transaction (default: EMAIL_OUTBOX_BATCH_SIZE)")
+        parser.add_argument('--loop', action='store_true',
+                            help="Keep polling instead of exiting once the outbox is drained")
+        parser.add_argument('--interval', type=float, default=5.0,
+                            help="Seconds to sleep between polls in --loop mode")
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                stats = deliver_pending(batch_size=options['batch_size'])
+            except Exception as e:
+                # e.g. the mail server refused the connection; nothing was claimed
+                if not options['loop']:
+                    raise
+                self.stderr.write(f"❌ Outbox delivery failed: {e}")
+            else:
+                if any(stats.values()) or not options['loop']:
+                    self.stdout.write(
+                        f"📧 sent={stats['sent']} skipped={stats['skipped']} "
+                        f"retried={stats['retried']} dead={stats['dead']}"
+                    )
+
+            if not options['loop']:
+                break
+            time.sleep(options['interval'])
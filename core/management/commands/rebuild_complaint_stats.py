@@ -0,0 +1,61 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.db.models import Count
+
+from core.models import Complaint, ComplaintStat
+from core.signals import STAT_FIELDS
+
+
+def rebuild_college(college_id):
+    """Recompute the ComplaintStat rows of one college (None = complaints without a college)."""
+    with transaction.atomic():
+        # Delete first so edits saved while we count block on these rows
+        # instead of bumping counts we are about to throw away.
+        ComplaintStat.objects.filter(college_id=college_id).delete()
+        groups = (
+            Complaint.objects.filter(college_id=college_id)
+            .values(*STAT_FIELDS)
+            .annotate(n=Count('id'))
+            .order_by()
+        )
+        rows = [ComplaintStat(count=group.pop('n'), **group) for group in groups]
+        ComplaintStat.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def _rebuild_in_thread(college_id):
+    try:
+        return rebuild_college(college_id)
+    finally:
+        # Each worker thread opened its own connection
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard ComplaintStat table from the complaints, one college per worker"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--college', type=int, action='append', dest='colleges',
+                            help="Only rebuild this college (repeatable; default: all)")
+        parser.add_argument('--workers', type=int, default=4,
+                            help="Colleges rebuilt in parallel (use 1 on SQLite, which allows a single writer)")
+
+    def handle(self, *args, **options):
+        colleges = options['colleges']
+        if not colleges:
+            # Colleges whose complaints were all deleted still have rows to clear
+            colleges = list(
+                set(Complaint.objects.values_list('college_id', flat=True).distinct().order_by())
+                | set(ComplaintStat.objects.values_list('college_id', flat=True).distinct().order_by())
+            )
+
+        if options['workers'] <= 1:
+            total = sum(rebuild_college(college_id) for college_id in colleges)
+        else:
+            with ThreadPoolExecutor(max_workers=options['workers']) as pool:
+                total = sum(pool.map(_rebuild_in_thread, colleges))
+
+        self.stdout.write(self.style.SUCCESS(
+            f"📊 Rebuilt {total} stat row(s) across {len(colleges)} college(s)"))
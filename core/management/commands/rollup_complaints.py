@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from core.utils.rollup import run_rollup
+
+
+class Command(BaseCommand):
+    help = "Refresh the daily complaint rollup for every day touched since the last run (run from cron)"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--full', action='store_true',
+                            help="Recompute every day instead of only the days touched since the last run")
+
+    def handle(self, *args, **options):
+        stats = run_rollup(full=options['full'])
+        self.stdout.write(self.style.SUCCESS(
+            f"📊 Rolled up {stats['days']} day(s) into {stats['rows']} row(s)"))
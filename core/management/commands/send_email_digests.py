@@ -0,0 +1,26 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from core.utils.digest import build_digests, send_digests
+
+
+class Command(BaseCommand):
+    help = "Email a summary of recent complaint activity to principals and squad members who opted into digests"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--hours', type=float, default=24,
+                            help="Size of the window to summarise (default: 24, run daily from cron)")
+        parser.add_argument('--dry-run', action='store_true',
+                            help="Build the digests and report how many would be sent")
+
+    def handle(self, *args, **options):
+        since = timezone.now() - timedelta(hours=options['hours'])
+
+        if options['dry_run']:
+            self.stdout.write(f"📧 {len(build_digests(since))} digest(s) would be sent")
+            return
+
+        sent = send_digests(since)
+        self.stdout.write(self.style.SUCCESS(f"📧 Sent {sent} digest(s)"))
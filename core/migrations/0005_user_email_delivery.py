@@ -0,0 +1,22 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0004_email_outbox"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="email_delivery",
+            field=models.CharField(
+                choices=[("immediate", "Immediate"), ("digest", "Daily digest")],
+                default="immediate",
+                max_length=10,
+            ),
+        ),
+    ]
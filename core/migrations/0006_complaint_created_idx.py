@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_user_email_delivery"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(
+                fields=["-created_at", "-id"], name="complaint_created_idx"
+            ),
+        ),
+    ]
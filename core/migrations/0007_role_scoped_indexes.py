@@ -0,0 +1,58 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0006_complaint_created_idx"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(
+                fields=["status", "-created_at", "-id"],
+                name="complaint_status_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(
+                fields=["college", "-created_at", "-id"],
+                name="complaint_college_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(
+                fields=["college", "status", "-created_at", "-id"],
+                name="complaint_college_status_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(
+                fields=["assigned_to", "-created_at", "-id"],
+                name="complaint_assignee_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(
+                fields=["student", "-created_at", "-id"],
+                name="complaint_student_created_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="feedback",
+            index=models.Index(fields=["-created_at"], name="feedback_created_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="feedback",
+            index=models.Index(
+                fields=["user", "-created_at"], name="feedback_user_created_idx"
+            ),
+        ),
+    ]
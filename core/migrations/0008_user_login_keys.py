@@ -0,0 +1,64 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:23
+
+import re
+
+from django.db import migrations, models
+
+
+def backfill_login_keys(apps, schema_editor):
+    """Populate email_key/phone_key before they become unique.
+
+    Existing rows were never checked for case-insensitive duplicates; when two
+    accounts share an identifier the oldest keeps it and the other is left
+    without a key: it logs in by username, and User.save() keeps its key
+    NULL for as long as the older account holds the identifier.
+    """
+    User = apps.get_model("core", "User")
+    seen_emails, seen_phones, batch = set(), set(), []
+    for user in User.objects.order_by("id").only("id", "email", "phone").iterator(chunk_size=2000):
+        email_key = (user.email or "").strip().casefold() or None
+        phone_key = re.sub(r"\D", "", user.phone or "") or None
+        user.email_key = email_key if email_key not in seen_emails else None
+        user.phone_key = phone_key if phone_key not in seen_phones else None
+        seen_emails.add(email_key)
+        seen_phones.add(phone_key)
+        batch.append(user)
+        if len(batch) == 2000:
+            User.objects.bulk_update(batch, ["email_key", "phone_key"])
+            batch = []
+    User.objects.bulk_update(batch, ["email_key", "phone_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_role_scoped_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="email_key",
+            field=models.CharField(blank=True, editable=False, max_length=254, null=True),
+        ),
+        migrations.AddField(
+            model_name="user",
+            name="phone_key",
+            field=models.CharField(blank=True, editable=False, max_length=15, null=True),
+        ),
+        migrations.RunPython(backfill_login_keys, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="user",
+            name="email_key",
+            field=models.CharField(
+                blank=True, editable=False, max_length=254, null=True, unique=True
+            ),
+        ),
+        migrations.AlterField(
+            model_name="user",
+            name="phone_key",
+            field=models.CharField(
+                blank=True, editable=False, max_length=15, null=True, unique=True
+            ),
+        ),
+    ]
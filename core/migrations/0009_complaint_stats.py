@@ -0,0 +1,103 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:28
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_complaint_stats(apps, schema_editor):
+    Complaint = apps.get_model("core", "Complaint")
+    ComplaintStat = apps.get_model("core", "ComplaintStat")
+    groups = Complaint.objects.values(
+        "college_id", "branch_id", "status", "assigned_to_id"
+    ).annotate(n=Count("id"))
+    ComplaintStat.objects.bulk_create(
+        [
+            ComplaintStat(
+                college_id=g["college_id"],
+                branch_id=g["branch_id"],
+                status=g["status"],
+                assigned_to_id=g["assigned_to_id"],
+                count=g["n"],
+            )
+            for g in groups.order_by()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_user_login_keys"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ComplaintStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "status",
+                    models.CharField(
+                        choices=[
+                            ("pending", "Pending"),
+                            ("in_progress", "In Progress"),
+                            ("solved", "Solved"),
+                            ("closed", "Closed"),
+                        ],
+                        max_length=20,
+                    ),
+                ),
+                ("count", models.IntegerField(default=0)),
+                (
+                    "assigned_to",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to=settings.AUTH_USER_MODEL,
+                    ),
+                ),
+                (
+                    "branch",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="core.branch",
+                    ),
+                ),
+                (
+                    "college",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="core.college",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["college", "branch", "status", "assigned_to"],
+                        name="complaint_stat_key_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_complaint_stats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,111 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:29
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import F
+
+
+def backfill_resolution_times(apps, schema_editor):
+    # Best available estimate for complaints solved/closed before these fields existed
+    Complaint = apps.get_model("core", "Complaint")
+    Complaint.objects.filter(status="solved").update(resolved_at=F("updated_at"))
+    Complaint.objects.filter(status="closed").update(closed_at=F("updated_at"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_complaint_stats"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ComplaintDailyStat",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+                ("created", models.PositiveIntegerField(default=0)),
+                ("resolved", models.PositiveIntegerField(default=0)),
+                ("closed", models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name="JobCheckpoint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("name", models.CharField(max_length=50, unique=True)),
+                ("last_run_at", models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name="complaint",
+            name="closed_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name="complaint",
+            name="resolved_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(fields=["updated_at"], name="complaint_updated_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(fields=["resolved_at"], name="complaint_resolved_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="complaint",
+            index=models.Index(fields=["closed_at"], name="complaint_closed_idx"),
+        ),
+        migrations.AddField(
+            model_name="complaintdailystat",
+            name="branch",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="core.branch",
+            ),
+        ),
+        migrations.AddField(
+            model_name="complaintdailystat",
+            name="college",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="+",
+                to="core.college",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="complaintdailystat",
+            index=models.Index(fields=["day"], name="daily_stat_day_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="complaintdailystat",
+            index=models.Index(
+                fields=["college", "day"], name="daily_stat_college_day_idx"
+            ),
+        ),
+        migrations.RunPython(backfill_resolution_times, migrations.RunPython.noop),
+    ]
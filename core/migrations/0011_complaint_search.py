@@ -0,0 +1,75 @@
+# Full-text index over complaint title/description, see core/search.py
+
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE core_complaint_fts USING fts5(
+        title, description,
+        content='core_complaint', content_rowid='id',
+        tokenize='porter unicode61'
+    )
+    """,
+    """
+    CREATE TRIGGER core_complaint_fts_insert AFTER INSERT ON core_complaint BEGIN
+        INSERT INTO core_complaint_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER core_complaint_fts_delete AFTER DELETE ON core_complaint BEGIN
+        INSERT INTO core_complaint_fts(core_complaint_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER core_complaint_fts_update AFTER UPDATE OF title, description ON core_complaint BEGIN
+        INSERT INTO core_complaint_fts(core_complaint_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO core_complaint_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO core_complaint_fts(core_complaint_fts) VALUES ('rebuild')",
+]
+# Django rebuilds core_complaint on SQLite for some schema changes, which
+# drops these triggers: such migrations must recreate them.
+SQLITE_REVERSE = [
+    "DROP TRIGGER IF EXISTS core_complaint_fts_update",
+    "DROP TRIGGER IF EXISTS core_complaint_fts_delete",
+    "DROP TRIGGER IF EXISTS core_complaint_fts_insert",
+    "DROP TABLE IF EXISTS core_complaint_fts",
+]
+
+# An expression index is maintained by Postgres itself; the expression must
+# match core.search.COMPLAINT_TSVECTOR.
+POSTGRES_FORWARD = [
+    """
+    CREATE INDEX complaint_search_idx ON core_complaint USING GIN (
+        to_tsvector('english', coalesce(title, '') || ' ' || coalesce(description, ''))
+    )
+    """,
+]
+POSTGRES_REVERSE = ["DROP INDEX IF EXISTS complaint_search_idx"]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for statement in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_complaint_daily_rollup"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"sqlite": SQLITE_FORWARD, "postgresql": POSTGRES_FORWARD}),
+            _run({"sqlite": SQLITE_REVERSE, "postgresql": POSTGRES_REVERSE}),
+        ),
+    ]
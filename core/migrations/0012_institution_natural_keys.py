@@ -0,0 +1,25 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:32
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_complaint_search"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="branch",
+            index=models.Index(
+                fields=["college", "code"], name="branch_natural_key_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="college",
+            index=models.Index(
+                fields=["name", "college_type"], name="college_natural_key_idx"
+            ),
+        ),
+    ]
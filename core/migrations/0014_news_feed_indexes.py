@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0013_table_version"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="news",
+            index=models.Index(
+                fields=["college", "-posted_at", "-id"], name="news_college_feed_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="news",
+            index=models.Index(fields=["-posted_at", "-id"], name="news_posted_idx"),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# Generated by Django 5.2.6 on 2026-10-18 00:53
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0014_news_feed_indexes"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="feedback",
+            index=models.Index(
+                fields=["complaint", "created_at", "id"], name="feedback_thread_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,107 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:06
+
+from itertools import islice
+
+from django.db import migrations, models
+
+
+def backfill_change_log(apps, schema_editor):
+    """One entry per existing row, so a first sync (no cursor) replays everything."""
+    ChangeLog = apps.get_model("core", "ChangeLog")
+    Complaint = apps.get_model("core", "Complaint")
+    Feedback = apps.get_model("core", "Feedback")
+    News = apps.get_model("core", "News")
+    sources = [
+        (
+            "complaint",
+            Complaint.objects.order_by("updated_at", "id").values_list(
+                "id", "college_id", "student_id", "assigned_to_id"
+            ),
+        ),
+        (
+            "feedback",
+            Feedback.objects.order_by("created_at", "id").values_list(
+                "id",
+                "complaint__college_id",
+                "complaint__student_id",
+                "complaint__assigned_to_id",
+            ),
+        ),
+        # News has no student or assignee audience
+        (
+            "news",
+            News.objects.order_by("posted_at", "id").values_list("id", "college_id"),
+        ),
+    ]
+    for entity, rows in sources:
+        rows = rows.iterator(chunk_size=2000)
+        while batch := list(islice(rows, 2000)):
+            ChangeLog.objects.bulk_create(
+                [
+                    ChangeLog(
+                        entity=entity,
+                        object_id=row[0],
+                        college_id=row[1],
+                        student_id=row[2] if len(row) > 2 else None,
+                        assigned_to_id=row[3] if len(row) > 2 else None,
+                    )
+                    for row in batch
+                ]
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0015_feedback_thread_idx"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ChangeLog",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "entity",
+                    models.CharField(
+                        choices=[
+                            ("complaint", "Complaint"),
+                            ("feedback", "Feedback"),
+                            ("news", "News"),
+                        ],
+                        max_length=10,
+                    ),
+                ),
+                ("object_id", models.BigIntegerField()),
+                ("college_id", models.BigIntegerField(blank=True, null=True)),
+                ("student_id", models.BigIntegerField(blank=True, null=True)),
+                ("assigned_to_id", models.BigIntegerField(blank=True, null=True)),
+                ("changed_at", models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["college_id", "id"], name="changelog_college_idx"
+                    ),
+                    models.Index(
+                        fields=["student_id", "id"], name="changelog_student_idx"
+                    ),
+                    models.Index(
+                        fields=["assigned_to_id", "id"], name="changelog_assignee_idx"
+                    ),
+                    models.Index(
+                        fields=["entity", "college_id", "id"], name="changelog_news_idx"
+                    ),
+                ],
+            },
+        ),
+        migrations.RunPython(backfill_change_log, migrations.RunPython.noop),
+    ]
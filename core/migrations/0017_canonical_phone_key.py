@@ -0,0 +1,48 @@
+# Generated by Django 5.2.6 on 2026-10-18 12:00
+
+import re
+
+from django.db import migrations
+
+PHONE_KEY_RE = re.compile(r"(?:0|91|0091)?(\d{10})")
+
+
+def rekey_phones(apps, schema_editor):
+    """Recompute phone_key with the +91/trunk-0 prefix stripped.
+
+    Keys are cleared first so the unique constraint holds while rows are
+    rewritten; as in 0008, when two accounts now share a number the oldest
+    keeps the key and the other keeps a NULL one (User.save() leaves it so).
+    """
+    User = apps.get_model("core", "User")
+    User.objects.exclude(phone_key=None).update(phone_key=None)
+    seen, batch = set(), []
+    for user in (
+        User.objects.exclude(phone=None)
+        .order_by("id")
+        .only("id", "phone")
+        .iterator(chunk_size=2000)
+    ):
+        digits = re.sub(r"\D", "", user.phone)
+        national = PHONE_KEY_RE.fullmatch(digits)
+        phone_key = (national.group(1) if national else digits) or None
+        if phone_key is None or phone_key in seen:
+            continue
+        seen.add(phone_key)
+        user.phone_key = phone_key
+        batch.append(user)
+        if len(batch) == 2000:
+            User.objects.bulk_update(batch, ["phone_key"])
+            batch = []
+    User.objects.bulk_update(batch, ["phone_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0016_change_log"),
+    ]
+
+    operations = [
+        migrations.RunPython(rekey_phones, migrations.RunPython.noop),
+    ]
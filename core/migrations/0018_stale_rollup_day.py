@@ -0,0 +1,28 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:26
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0017_canonical_phone_key"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="StaleRollupDay",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("day", models.DateField()),
+            ],
+        ),
+    ]
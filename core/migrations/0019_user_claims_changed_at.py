@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-18 01:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0018_stale_rollup_day"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="user",
+            name="claims_changed_at",
+            field=models.DateTimeField(blank=True, editable=False, null=True),
+        ),
+    ]
@@ -1,6 +1,12 @@
+import re
+
 from django.db import models
+from django.utils import timezone
 from django.contrib.auth.models import AbstractUser
 
+PHONE_KEY_RE = re.compile(r'(?:0|91|0091)?(\d{10})')
+
+
 class User(AbstractUser):
     ROLE_CHOICES = (
         ('admin', 'Admin'),
@@ -16,6 +22,81 @@ class User(AbstractUser):
     is_active = models.BooleanField(default=True)
     is_suspended = models.BooleanField(default=False)
 
+    EMAIL_DELIVERY_CHOICES = (
+        ('immediate', 'Immediate'),
+        ('digest', 'Daily digest'),
+    )
+    # Principals and squad members can trade per-event emails for one daily summary
+    email_delivery = models.CharField(max_length=10, choices=EMAIL_DELIVERY_CHOICES, default='immediate')
+
+    # Canonical login identifiers, kept in sync by save(). Unique so a login
+    # resolves to one indexed lookup no matter how the user typed it. Accounts
+    # that predate the keys may share an identifier with an older account
+    # (see migrations 0008/0017); theirs stays NULL while the other holds it.
+    # QuerySet.update() and bulk_update() bypass save(): never write email or
+    # phone that way without setting the matching key too.
+    email_key = models.CharField(max_length=254, unique=True, null=True, blank=True, editable=False)
+    phone_key = models.CharField(max_length=15, unique=True, null=True, blank=True, editable=False)
+
+    # When role, college, branch or superuser status last changed. Access tokens embed these as
+    # claims, so ClaimsJWTAuthentication reloads the user for tokens issued
+    # before it. Set by save(); QuerySet.update() must set it too.
+    claims_changed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    CLAIM_FIELDS = ('role', 'college_id', 'branch_id', 'is_superuser')
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Deferred fields are not in __dict__; a claim we never loaded cannot be compared
+        instance._loaded_claims = tuple(instance.__dict__.get(field) for field in cls.CLAIM_FIELDS)
+        return instance
+
+    def claims_changed(self):
+        loaded = getattr(self, '_loaded_claims', None)
+        return loaded is not None and loaded != tuple(self.__dict__.get(field) for field in self.CLAIM_FIELDS)
+
+    @classmethod
+    def normalize_email_key(cls, email):
+        email = (email or '').strip()
+        return email.casefold() or None
+
+    @classmethod
+    def normalize_phone_key(cls, phone):
+        # National numbers are keyed by their 10 digits, with or without a
+        # trunk 0 or +91/0091 prefix; anything else keeps all its digits.
+        digits = re.sub(r'\D', '', phone or '')
+        national = PHONE_KEY_RE.fullmatch(digits)
+        return (national.group(1) if national else digits) or None
+
+    def _free_key(self, field, key):
+        # Only a changed key can collide; checking costs a query, so skip the rest
+        if key is None or key == getattr(self, field):
+            return key
+        holders = User.objects.filter(**{field: key})
+        if self.pk is not None:
+            holders = holders.exclude(pk=self.pk)
+        return None if holders.exists() else key
+
+    def save(self, *args, **kwargs):
+        self.email_key = self._free_key('email_key', self.normalize_email_key(self.email))
+        self.phone_key = self._free_key('phone_key', self.normalize_phone_key(self.phone))
+        claims_changed = self.claims_changed()
+        if claims_changed:
+            self.claims_changed_at = timezone.now()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None:
+            update_fields = set(update_fields)
+            if 'email' in update_fields:
+                update_fields.add('email_key')
+            if 'phone' in update_fields:
+                update_fields.add('phone_key')
+            if claims_changed:
+                update_fields.add('claims_changed_at')
+            kwargs['update_fields'] = update_fields
+        super().save(*args, **kwargs)
+        self._loaded_claims = tuple(self.__dict__.get(field) for field in self.CLAIM_FIELDS)
+
     def __str__(self):
         return f"{self.username} ({self.role})"
 
@@ -37,6 +118,12 @@ class College(models.Model):
     def __str__(self):
         return f"{self.name} ({self.college_type})"
 
+    class Meta:
+        indexes = [
+            # Natural key used by `manage.py import_institutions`
+            models.Index(fields=['name', 'college_type'], name='college_natural_key_idx'),
+        ]
+
 
 class Branch(models.Model):
     college = models.ForeignKey(College, on_delete=models.CASCADE, related_name='branches')
@@ -49,6 +136,10 @@ class Branch(models.Model):
 
     class Meta:
         verbose_name_plural = "Branches"
+        indexes = [
+            # Natural key used by `manage.py import_institutions`
+            models.Index(fields=['college', 'code'], name='branch_natural_key_idx'),
+        ]
 
 
 class Complaint(models.Model):
@@ -72,10 +163,43 @@ class Complaint(models.Model):
 
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
+    # First time the complaint reached 'solved' / 'closed', for the daily rollup
+    resolved_at = models.DateTimeField(null=True, blank=True, editable=False)
+    closed_at = models.DateTimeField(null=True, blank=True, editable=False)
+
+    def save(self, *args, **kwargs):
+        stamped = set()
+        if self.status == 'solved' and self.resolved_at is None:
+            self.resolved_at = timezone.now()
+            stamped.add('resolved_at')
+        if self.status == 'closed' and self.closed_at is None:
+            self.closed_at = timezone.now()
+            stamped.add('closed_at')
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and stamped:
+            kwargs['update_fields'] = set(update_fields) | stamped
+        super().save(*args, **kwargs)
 
     def __str__(self):
         return f"{self.title} - {self.student.username}"
 
+    class Meta:
+        # One index per role-scoped access path in ComplaintListCreateAPI, each
+        # covering the filter plus the (-created_at, -id) keyset sort so a page
+        # is an index range scan with no separate sort step.
+        indexes = [
+            models.Index(fields=['-created_at', '-id'], name='complaint_created_idx'),
+            models.Index(fields=['status', '-created_at', '-id'], name='complaint_status_created_idx'),
+            models.Index(fields=['college', '-created_at', '-id'], name='complaint_college_created_idx'),
+            models.Index(fields=['college', 'status', '-created_at', '-id'], name='complaint_college_status_idx'),
+            models.Index(fields=['assigned_to', '-created_at', '-id'], name='complaint_assignee_created_idx'),
+            models.Index(fields=['student', '-created_at', '-id'], name='complaint_student_created_idx'),
+            # Range scans for the daily rollup job
+            models.Index(fields=['updated_at'], name='complaint_updated_idx'),
+            models.Index(fields=['resolved_at'], name='complaint_resolved_idx'),
+            models.Index(fields=['closed_at'], name='complaint_closed_idx'),
+        ]
+
 
 class Feedback(models.Model):
     user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='feedbacks')
@@ -86,6 +210,16 @@ class Feedback(models.Model):
     def __str__(self):
         return f"Feedback by {self.user.username}"
 
+    class Meta:
+        indexes = [
+            # FeedbackViewSet: all feedback (admin) / by author (student, and the
+            # per-author probes of the user__college join) newest first
+            models.Index(fields=['-created_at'], name='feedback_created_idx'),
+            models.Index(fields=['user', '-created_at'], name='feedback_user_created_idx'),
+            # Complaint threads oldest first, and the per-complaint count/latest subqueries
+            models.Index(fields=['complaint', 'created_at', 'id'], name='feedback_thread_idx'),
+        ]
+
 
 class News(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='news_posts')
@@ -99,3 +233,174 @@ class News(models.Model):
 
     class Meta:
         verbose_name_plural = "News"
+        indexes = [
+            # Feed pages: one (posted_at, id) range per college, and per NULL college for global posts
+            models.Index(fields=['college', '-posted_at', '-id'], name='news_college_feed_idx'),
+            # Admin feed across every college
+            models.Index(fields=['-posted_at', '-id'], name='news_posted_idx'),
+        ]
+
+
+class EmailOutbox(models.Model):
+    """Email waiting to be delivered by the `process_email_outbox` worker.
+
+    Rows are written in the same transaction as the change that triggers the
+    email, so request handlers only pay for one INSERT.
+    """
+    KIND_CHOICES = (
+        ('complaint_submitted', 'Complaint Submitted'),
+        ('complaint_status_update', 'Complaint Status Update'),
+        ('complaint_assigned', 'Complaint Assigned'),
+        ('welcome', 'Welcome'),
+    )
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('sent', 'Sent'),
+        ('skipped', 'Skipped'),
+        ('dead', 'Dead'),
+    )
+    kind = models.CharField(max_length=30, choices=KIND_CHOICES)
+    payload = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='pending')
+    attempts = models.PositiveSmallIntegerField(default=0)
+    next_attempt_at = models.DateTimeField(default=timezone.now)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.kind} #{self.id} ({self.status})"
+
+    class Meta:
+        verbose_name_plural = "Email outbox"
+        indexes = [
+            models.Index(fields=['status', 'next_attempt_at'], name='outbox_due_idx'),
+        ]
+
+
+class ComplaintStat(models.Model):
+    """Complaint counts per (college, branch, status, assignee) for the dashboards.
+
+    Kept current by the signal handlers in core/signals.py, which apply +1/-1
+    deltas in the transaction that saves or deletes the complaint. A key may
+    have more than one row (concurrent first inserts, squad members deleted),
+    so readers always Sum(count). `manage.py rebuild_complaint_stats`
+    recomputes the table from scratch.
+    """
+    college = models.ForeignKey(College, on_delete=models.CASCADE, related_name='+', null=True, blank=True)
+    branch = models.ForeignKey(Branch, on_delete=models.CASCADE, related_name='+', null=True, blank=True)
+    status = models.CharField(max_length=20, choices=Complaint.STATUS_CHOICES)
+    # SET_NULL like Complaint.assigned_to, so the counts follow the complaints
+    assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, related_name='+', null=True, blank=True)
+    count = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.college_id}/{self.branch_id}/{self.status}/{self.assigned_to_id}: {self.count}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['college', 'branch', 'status', 'assigned_to'], name='complaint_stat_key_idx'),
+        ]
+
+
+class ComplaintDailyStat(models.Model):
+    """Complaints created, resolved and closed per day, college and branch.
+
+    Written only by `manage.py rollup_complaints`, which recomputes whole days
+    so re-running it is always safe.
+    """
+    day = models.DateField()
+    college = models.ForeignKey(College, on_delete=models.CASCADE, related_name='+', null=True, blank=True)
+    branch = models.ForeignKey(Branch, on_delete=models.CASCADE, related_name='+', null=True, blank=True)
+    created = models.PositiveIntegerField(default=0)
+    resolved = models.PositiveIntegerField(default=0)
+    closed = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.day} {self.college_id}/{self.branch_id}: +{self.created} ✓{self.resolved} ✗{self.closed}"
+
+    class Meta:
+        indexes = [
+            models.Index(fields=['day'], name='daily_stat_day_idx'),
+            models.Index(fields=['college', 'day'], name='daily_stat_college_day_idx'),
+        ]
+
+
+class StaleRollupDay(models.Model):
+    """A day to recompute because a complaint was deleted or an event timestamp moved.
+
+    The rollup finds changed days from the updated_at of complaints that
+    still exist, which misses both; signals record them here instead.
+    """
+    day = models.DateField()
+
+    def __str__(self):
+        return str(self.day)
+
+
+class JobCheckpoint(models.Model):
+    """High-water mark of an incremental background job."""
+    name = models.CharField(max_length=50, unique=True)
+    last_run_at = models.DateTimeField()
+
+    def __str__(self):
+        return f"{self.name} @ {self.last_run_at}"
+
+
+class TableVersion(models.Model):
+    """Change counter per cached table, used to build ETags for the catalog endpoints.
+
+    Bumped by the signal handlers in core/signals.py; code that writes with
+    bulk_create()/update()/raw SQL must call `bump()` itself.
+    """
+    name = models.CharField(max_length=50, unique=True)
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.name} v{self.version}"
+
+    @classmethod
+    def bump(cls, name):
+        if not cls.objects.filter(name=name).update(version=models.F('version') + 1):
+            cls.objects.get_or_create(name=name, defaults={'version': 1})
+
+    @classmethod
+    def current(cls, *names):
+        """Versions of `names` in order, with one query; 0 for tables never bumped."""
+        versions = dict(cls.objects.filter(name__in=names).values_list('name', 'version'))
+        return [versions.get(name, 0) for name in names]
+
+
+class ChangeLog(models.Model):
+    """Append-only log of complaint, feedback and news changes for /api/sync/.
+
+    The auto-increment id is the change sequence clients sync from. Rows are
+    written by the signal handlers in core/signals.py and carry the audience
+    of the changed object (college, student, assignee), so one index range
+    per role finds a user's changes. Audience columns are plain integers,
+    not foreign keys, so entries outlive the rows they describe.
+    """
+    ENTITY_CHOICES = (
+        ('complaint', 'Complaint'),
+        ('feedback', 'Feedback'),
+        ('news', 'News'),
+    )
+
+    entity = models.CharField(max_length=10, choices=ENTITY_CHOICES)
+    object_id = models.BigIntegerField()
+    college_id = models.BigIntegerField(null=True, blank=True)
+    student_id = models.BigIntegerField(null=True, blank=True)
+    assigned_to_id = models.BigIntegerField(null=True, blank=True)
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"#{self.id} {self.entity} {self.object_id}"
+
+    class Meta:
+        indexes = [
+            # One (audience, id) range per role; news rows are found by college
+            models.Index(fields=['college_id', 'id'], name='changelog_college_idx'),
+            models.Index(fields=['student_id', 'id'], name='changelog_student_idx'),
+            models.Index(fields=['assigned_to_id', 'id'], name='changelog_assignee_idx'),
+            models.Index(fields=['entity', 'college_id', 'id'], name='changelog_news_idx'),
+        ]
@@ -0,0 +1,150 @@
+import base64
+import binascii
+
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """Cursor pagination over a (timestamp, id) key.
+
+    Every page is a single index range scan: the cursor holds the key of the
+    last row served and the next page is fetched with `WHERE key < cursor`,
+    so deep pages cost the same as the first one. `id` breaks ties between
+    rows created in the same instant, keeping the order total and stable.
+
+    `ordering` is (timestamp_field, 'id'), each optionally prefixed with '-'
+    for descending order; both fields must sort in the same direction.
+    """
+    ordering = ('-created_at', '-id')
+    page_size = 20
+    max_page_size = 100
+    page_size_query_param = 'page_size'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(size, self.max_page_size))
+
+    # --- Cursor encoding ---
+    @property
+    def _fields(self):
+        return tuple(field.lstrip('-') for field in self.ordering)
+
+    @property
+    def _descending(self):
+        return self.ordering[0].startswith('-')
+
+    def encode_cursor(self, position):
+        timestamp, pk = position
+        raw = f"{timestamp.isoformat()}|{pk}".encode()
+        return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            raw = base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)).decode()
+            timestamp, pk = raw.rsplit('|', 1)
+            position = (parse_datetime(timestamp), int(pk))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if position[0] is None:
+            raise NotFound(self.invalid_cursor_message)
+        return position
+
+    def position_of(self, row):
+        time_field, id_field = self._fields
+        if isinstance(row, dict):
+            return row[time_field], row[id_field]
+        return getattr(row, time_field), getattr(row, id_field)
+
+    # --- Querying ---
+    def after(self, position):
+        """Q matching the rows that come after `position` in `ordering`."""
+        (time_field, id_field), (timestamp, pk) = self._fields, position
+        op = 'lt' if self._descending else 'gt'
+        edge = 'lte' if self._descending else 'gte'
+        # Written as `t <= c AND (t < c OR id < i)` so the leading column has a
+        # plain range condition the index can seek on.
+        return Q(**{f'{time_field}__{edge}': timestamp}) & (
+            Q(**{f'{time_field}__{op}': timestamp}) | Q(**{f'{id_field}__{op}': pk})
+        )
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        queryset = queryset.order_by(*self.ordering)
+        if position is not None:
+            queryset = queryset.filter(self.after(position))
+
+        rows = list(queryset[:self.page_size_value + 1])
+        return self._page(rows)
+
+    def paginate_union(self, querysets, request):
+        """Paginate the rows of several querysets as if they were one.
+
+        An OR across different index ranges cannot be served by a single
+        range scan, so each queryset is read with its own keyset query of at
+        most a page plus one rows and the results are merged in Python.
+        """
+        self.request = request
+        self.page_size_value = self.get_page_size(request)
+        position = self.decode_cursor(request)
+
+        rows = []
+        for queryset in querysets:
+            queryset = queryset.order_by(*self.ordering)
+            if position is not None:
+                queryset = queryset.filter(self.after(position))
+            rows += queryset[:self.page_size_value + 1]
+        rows.sort(key=self.position_of, reverse=self._descending)
+        return self._page(rows[:self.page_size_value + 1])
+
+    def _page(self, rows):
+        self.has_next = len(rows) > self.page_size_value
+        rows = rows[:self.page_size_value]
+        self.next_position = self.position_of(rows[-1]) if self.has_next else None
+        return rows
+
+    # --- Response ---
+    def get_next_link(self):
+        if self.next_position is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.next_position))
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+
+class NewsPagination(KeysetPagination):
+    ordering = ('-posted_at', '-id')
+
+
+class FeedbackThreadPagination(KeysetPagination):
+    ordering = ('created_at', 'id')
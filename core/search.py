@@ -0,0 +1,100 @@
+"""Full-text search over complaint titles and descriptions.
+
+SQLite uses the `core_complaint_fts` FTS5 table and Postgres an expression
+GIN index on the same tsvector as COMPLAINT_TSVECTOR below; both are created
+and kept current by migration 0011. Other backends fall back to `icontains`.
+"""
+import re
+
+from django.db import connection
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+from django.utils.html import escape
+
+FTS_TABLE = 'core_complaint_fts'
+# Must match the indexed expression in migration 0011 exactly, or Postgres
+# will not use the index.
+COMPLAINT_TSVECTOR = (
+    "to_tsvector('english', coalesce(core_complaint.title, '') || ' ' || coalesce(core_complaint.description, ''))"
+)
+
+# Highlight markers from the database, swapped for <mark> after escaping
+_START, _STOP = '\ue000', '\ue001'
+
+
+def _fts5_query(text):
+    """Turn free text into an FTS5 query in which every (stemmed) word must match.
+
+    Words are quoted so user input can never be parsed as FTS5 syntax.
+    """
+    words = re.findall(r'\w+', text)
+    return ' AND '.join(f'"{word}"' for word in words)
+
+
+def _highlight(value):
+    if value is None:
+        return None
+    return escape(value).replace(_START, '<mark>').replace(_STOP, '</mark>')
+
+
+def matching(queryset, text):
+    """Filter `queryset` to complaints matching `text`, unranked (used by the admin)."""
+    if connection.vendor == 'sqlite':
+        query = _fts5_query(text)
+        if not query:
+            return queryset.none()
+        return queryset.filter(id__in=RawSQL(f'SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s', [query]))
+    if connection.vendor == 'postgresql':
+        return queryset.filter(id__in=RawSQL(
+            f"SELECT id FROM core_complaint WHERE {COMPLAINT_TSVECTOR} @@ websearch_to_tsquery('english', %s)",
+            [text],
+        ))
+    return queryset.filter(Q(title__icontains=text) | Q(description__icontains=text))
+
+
+def search(queryset, text, limit=20):
+    """Rank the complaints of `queryset` matching `text`, best first.
+
+    Returns (complaint, rank, highlight) tuples, where highlight holds the
+    HTML-escaped title and a description snippet with matches in <mark>.
+    Ranking and the limit are applied inside the index query; `queryset`
+    only contributes its WHERE clause, as a subquery on the ids.
+    """
+    scope_sql, scope_params = queryset.order_by().values('id').query.sql_with_params()
+
+    if connection.vendor == 'sqlite':
+        query = _fts5_query(text)
+        if not query:
+            return []
+        sql = (
+            f"SELECT rowid, -bm25({FTS_TABLE}, 2.0, 1.0), "
+            f"highlight({FTS_TABLE}, 0, %s, %s), snippet({FTS_TABLE}, 1, %s, %s, '…', 24) "
+            f"FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s AND rowid IN ({scope_sql}) "
+            f"ORDER BY bm25({FTS_TABLE}, 2.0, 1.0) LIMIT %s"
+        )
+        params = [_START, _STOP, _START, _STOP, query, *scope_params, limit]
+    elif connection.vendor == 'postgresql':
+        options = f'StartSel={_START}, StopSel={_STOP}, MaxWords=35, MinWords=15'
+        sql = (
+            f"SELECT core_complaint.id, ts_rank({COMPLAINT_TSVECTOR}, q), "
+            f"ts_headline('english', core_complaint.title, q, %s), "
+            f"ts_headline('english', core_complaint.description, q, %s) "
+            f"FROM core_complaint, websearch_to_tsquery('english', %s) q "
+            f"WHERE {COMPLAINT_TSVECTOR} @@ q AND core_complaint.id IN ({scope_sql}) "
+            f"ORDER BY 2 DESC, core_complaint.id DESC LIMIT %s"
+        )
+        params = [options, options, text, *scope_params, limit]
+    else:
+        complaints = matching(queryset, text).order_by('-created_at', '-id')[:limit]
+        return [(c, 0.0, {'title': escape(c.title), 'description': escape(c.description)}) for c in complaints]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        hits = cursor.fetchall()
+
+    complaints = queryset.in_bulk([row[0] for row in hits])
+    return [
+        (complaints[pk], rank, {'title': _highlight(title), 'description': _highlight(description)})
+        for pk, rank, title, description in hits
+        if pk in complaints
+    ]
@@ -2,13 +2,21 @@ from rest_framework import serializers
 from .models import User, College, Branch, Complaint, Feedback, News
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
 from django.contrib.auth import get_user_model
+from django.core.exceptions import FieldDoesNotExist
+from django.db.models import Q
+from .tokens import CachedBlacklistRefreshToken, set_user_claims
 import re
 
 User = get_user_model()
 
+# Digits with optional +, spaces, dashes or parentheses, e.g. "+91 98765-43210"
+PHONE_RE = re.compile(r'^\+?[\d\s\-()]+$')
+
 
 # ============= SMART LOGIN: EMAIL/PHONE/USERNAME =============
 class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = CachedBlacklistRefreshToken
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.fields.pop('username', None)
@@ -26,28 +34,22 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
                 'identifier': 'This field is required'
             })
 
-        user = None
-
-        # Try EMAIL first (most students will use this)
-        if '@' in identifier:
-            try:
-                user = User.objects.get(email=identifier)
-            except User.DoesNotExist:
-                pass
-
-        # Try PHONE (digits only, students can use this too)
-        if not user and identifier.replace('+', '').isdigit():
-            try:
-                user = User.objects.get(phone=identifier)
-            except User.DoesNotExist:
-                pass
-
-        # Try USERNAME (fallback for admin/principal/squad)
-        if not user:
-            try:
-                user = User.objects.get(username=identifier)
-            except User.DoesNotExist:
-                pass
+        # Resolve EMAIL, PHONE or USERNAME with one query over the indexed
+        # login keys; when several match, email beats phone beats username.
+        email_key = User.normalize_email_key(identifier) if '@' in identifier else None
+        phone_key = User.normalize_phone_key(identifier) if PHONE_RE.match(identifier) else None
+        lookup = Q(username=identifier)
+        if email_key:
+            lookup |= Q(email_key=email_key)
+        if phone_key:
+            lookup |= Q(phone_key=phone_key)
+
+        matches = list(User.objects.filter(lookup)[:3])
+        user = (
+            next((u for u in matches if email_key and u.email_key == email_key), None)
+            or next((u for u in matches if phone_key and u.phone_key == phone_key), None)
+            or next((u for u in matches if u.username == identifier), None)
+        )
 
         if not user:
             raise serializers.ValidationError({
@@ -82,19 +84,82 @@ class MyTokenObtainPairSerializer(TokenObtainPairSerializer):
             'username': user.username,
             'email': user.email,
             'role': user.role,
-            'college': user.college.id if user.college else None,
+            'college': user.college_id,
         }
 
     @classmethod
     def get_token(cls, user):
         token = super().get_token(user)
-        token['username'] = user.username
-        token['email'] = user.email
-        token['role'] = user.role
-        token['college_id'] = user.college.id if user.college else None
+        set_user_claims(token, user)
         return token
 
 
+# ============= SPARSE FIELDSETS =============
+class SparseFieldsMixin:
+    """`?fields=` / `?expand=` support, driven by the `fields` and `expand`
+    sets views put in the serializer context.
+
+    With neither set every field is rendered as before. Otherwise only the
+    fields in `fields` are kept (all of them if it is None), and nested
+    objects are rendered as their id unless named in `expand`. Only the
+    top-level serializer is narrowed; expanded objects are rendered whole.
+    """
+
+    def _sparse_params(self):
+        root = self.parent.parent if isinstance(self.parent, serializers.ListSerializer) else self.parent
+        if root is not None:
+            return None, None
+        return self.context.get('fields'), self.context.get('expand')
+
+    def get_fields(self):
+        fields = super().get_fields()
+        only, expand = self._sparse_params()
+        if only is None and expand is None:
+            return fields
+        expand = expand or set()
+        sparse = {}
+        for name, field in fields.items():
+            if only is not None and name not in only and name not in expand:
+                continue
+            if isinstance(field, serializers.BaseSerializer) and name not in expand:
+                field = serializers.PrimaryKeyRelatedField(source=field.source, read_only=True)
+            sparse[name] = field
+        return sparse
+
+    def select_plan(self):
+        """(select_related paths, only() paths) covering the rendered fields.
+
+        Returns None when a field reads something that cannot be traced to
+        model columns, in which case the queryset is left as it is.
+        """
+        related, columns = [], ['pk']
+
+        def walk(serializer, model, prefix):
+            for field in serializer.fields.values():
+                if field.write_only:
+                    continue
+                if field.source == '*' or isinstance(field, serializers.SerializerMethodField):
+                    return False
+                path = prefix + '__'.join(field.source_attrs)
+                if isinstance(field, serializers.BaseSerializer):
+                    related.append(path)
+                    if not walk(field, field.Meta.model, path + '__'):
+                        return False
+                    continue
+                try:
+                    model._meta.get_field(field.source_attrs[0])
+                except FieldDoesNotExist:
+                    continue  # an annotation
+                for depth in range(1, len(field.source_attrs)):  # e.g. college.name joins college
+                    related.append(prefix + '__'.join(field.source_attrs[:depth]))
+                columns.append(path)
+            return True
+
+        if not walk(self, self.Meta.model, ''):
+            return None
+        return related, columns
+
+
 # ============= REST OF THE SERIALIZERS =============
 class CollegeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -110,14 +175,32 @@ class BranchSerializer(serializers.ModelSerializer):
         fields = '__all__'
 
 
-class UserSerializer(serializers.ModelSerializer):
+class UserSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     college_name = serializers.CharField(source='college.name', read_only=True)
     branch_name = serializers.CharField(source='branch.name', read_only=True)
 
     class Meta:
         model = User
         fields = ['id', 'username', 'email', 'role', 'phone', 'college', 'college_name',
-                  'branch', 'branch_name', 'roll_number', 'is_active', 'is_suspended']
+                  'branch', 'branch_name', 'roll_number', 'is_active', 'is_suspended', 'email_delivery']
+
+    def _taken(self, **lookup):
+        others = User.objects.filter(**lookup)
+        if self.instance is not None:
+            others = others.exclude(pk=self.instance.pk)
+        return others.exists()
+
+    def validate_email(self, value):
+        key = User.normalize_email_key(value)
+        if key and self._taken(email_key=key):
+            raise serializers.ValidationError("This email is already registered")
+        return value
+
+    def validate_phone(self, value):
+        key = User.normalize_phone_key(value)
+        if key and self._taken(phone_key=key):
+            raise serializers.ValidationError("This phone number is already registered")
+        return value
 
 
 class RegisterSerializer(serializers.ModelSerializer):
@@ -141,12 +224,12 @@ class RegisterSerializer(serializers.ModelSerializer):
         return value
 
     def validate_email(self, value):
-        if User.objects.filter(email=value).exists():
+        if User.objects.filter(email_key=User.normalize_email_key(value)).exists():
             raise serializers.ValidationError("This email is already registered")
         return value
 
     def validate_phone(self, value):
-        if User.objects.filter(phone=value).exists():
+        if User.objects.filter(phone_key=User.normalize_phone_key(value)).exists():
             raise serializers.ValidationError("This phone number is already registered")
         if not value.isdigit():
             raise serializers.ValidationError("Phone number must contain only digits")
@@ -188,7 +271,7 @@ class RegisterSerializer(serializers.ModelSerializer):
         return user
 
 
-class ComplaintSerializer(serializers.ModelSerializer):
+class ComplaintSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     student = UserSerializer(read_only=True)
     assigned_to_detail = UserSerializer(source='assigned_to', read_only=True)
     college_name = serializers.CharField(source='college.name', read_only=True)
@@ -216,7 +299,16 @@ class ComplaintSerializer(serializers.ModelSerializer):
         read_only_fields = ['student', 'college', 'branch', 'created_at', 'updated_at']
 
 
-class FeedbackSerializer(serializers.ModelSerializer):
+class ComplaintListSerializer(ComplaintSerializer):
+    # Annotated by ComplaintListCreateAPI.get_queryset()
+    feedback_count = serializers.IntegerField(read_only=True)
+    last_feedback_at = serializers.DateTimeField(read_only=True)
+
+    class Meta(ComplaintSerializer.Meta):
+        fields = ComplaintSerializer.Meta.fields + ['feedback_count', 'last_feedback_at']
+
+
+class FeedbackSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     user_name = serializers.CharField(source='user.username', read_only=True)
     complaint_title = serializers.CharField(source='complaint.title', read_only=True)
 
@@ -226,7 +318,7 @@ class FeedbackSerializer(serializers.ModelSerializer):
         read_only_fields = ['user', 'created_at']
 
 
-class NewsSerializer(serializers.ModelSerializer):
+class NewsSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     created_by = UserSerializer(read_only=True)
 
     class Meta:
@@ -0,0 +1,167 @@
+from django.db import transaction
+from django.db.models import F
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+
+from .authentication import invalidate_revoked_users
+from .events import publish_complaint_event
+from .sync import complaint_audience, feedback_audience, log_change
+from .models import Branch, College, Complaint, ComplaintStat, Feedback, News, StaleRollupDay, TableVersion, User
+from core.utils.news_feed import bump_news_version
+from core.utils.rollup import EVENT_FIELDS, event_days
+
+STAT_FIELDS = ('college_id', 'branch_id', 'status', 'assigned_to_id')
+
+
+def _stat_key(complaint):
+    return tuple(getattr(complaint, field) for field in STAT_FIELDS)
+
+
+def _apply_delta(key, delta):
+    lookup = dict(zip(STAT_FIELDS, key))
+    # Bump one row for the key; duplicate rows are summed by readers.
+    first_row = ComplaintStat.objects.filter(**lookup).values('id')[:1]
+    if ComplaintStat.objects.filter(id__in=first_row).update(count=F('count') + delta):
+        return
+    if delta > 0:
+        ComplaintStat.objects.create(count=delta, **lookup)
+
+
+# --- ComplaintStat maintenance ---
+@receiver(pre_save, sender=Complaint)
+def remember_stat_key(sender, instance, raw=False, update_fields=None, **kwargs):
+    instance._old_stat_key = instance._old_event_days = None
+    if raw or instance._state.adding:
+        return
+    watched = {'college', 'branch', 'status', 'assigned_to', *EVENT_FIELDS}
+    if update_fields is not None and not watched & set(update_fields):
+        return
+    old = Complaint.objects.filter(pk=instance.pk).values_list(*STAT_FIELDS, *EVENT_FIELDS).first()
+    if old is not None:
+        instance._old_stat_key = old[:len(STAT_FIELDS)]
+        instance._old_event_days = event_days(old[len(STAT_FIELDS):])
+
+
+@receiver(post_save, sender=Complaint)
+def update_stats_on_save(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    key = _stat_key(instance)
+    if created:
+        _apply_delta(key, 1)
+    elif instance._old_stat_key is not None and instance._old_stat_key != key:
+        _apply_delta(instance._old_stat_key, -1)
+        _apply_delta(key, 1)
+
+
+@receiver(post_delete, sender=Complaint)
+def update_stats_on_delete(sender, instance, **kwargs):
+    _apply_delta(_stat_key(instance), -1)
+
+
+# --- Daily rollup (manage.py rollup_complaints) ---
+def _mark_stale(days):
+    if days:
+        StaleRollupDay.objects.bulk_create([StaleRollupDay(day=day) for day in days])
+
+
+@receiver(post_save, sender=Complaint)
+def mark_moved_days_on_save(sender, instance, raw=False, **kwargs):
+    # Both ends of a move: a save with update_fields may leave updated_at alone
+    if not raw and instance._old_event_days is not None:
+        _mark_stale(instance._old_event_days ^ event_days(getattr(instance, field) for field in EVENT_FIELDS))
+
+
+@receiver(post_delete, sender=Complaint)
+def mark_days_left_on_delete(sender, instance, **kwargs):
+    _mark_stale(event_days(getattr(instance, field) for field in EVENT_FIELDS))
+
+
+# --- Catalog versions (ETags of the college/branch lists) ---
+@receiver([post_save, post_delete], sender=College)
+def bump_college_version(sender, **kwargs):
+    TableVersion.bump('college')
+
+
+@receiver([post_save, post_delete], sender=Branch)
+def bump_branch_version(sender, **kwargs):
+    TableVersion.bump('branch')
+
+
+@receiver(post_delete, sender=User)
+def bump_college_version_for_principal(sender, instance, **kwargs):
+    # Deleting a principal clears College.principal with a plain UPDATE
+    if instance.role == 'principal':
+        TableVersion.bump('college')
+
+
+# --- News feed cache ---
+@receiver([post_save, post_delete], sender=News)
+def invalidate_news_feeds(sender, **kwargs):
+    # After commit, or a reader could cache the old feed under the new version
+    transaction.on_commit(bump_news_version)
+
+
+# --- Claims-authenticated tokens ---
+@receiver(post_save, sender=User)
+def reload_claims_revocations(sender, instance, created, raw=False, **kwargs):
+    # Other processes pick the change up within CLAIMS_AUTH_REVOCATION_TTL
+    if not raw and instance.claims_changed():
+        transaction.on_commit(invalidate_revoked_users)
+
+
+# --- Live events (/api/events/) ---
+@receiver(post_save, sender=Complaint)
+def publish_complaint_changes(sender, instance, created, raw=False, **kwargs):
+    if raw:
+        return
+    if created:
+        publish_complaint_event('complaint.created', instance, status=instance.status)
+        return
+    # Old values come from remember_stat_key above
+    old = instance._old_stat_key
+    if old is None:
+        return
+    _, _, old_status, old_assigned_to_id = old
+    if old_status != instance.status:
+        publish_complaint_event('complaint.status_changed', instance,
+                                status=instance.status, old_status=old_status)
+    if old_assigned_to_id != instance.assigned_to_id:
+        publish_complaint_event('complaint.assigned', instance, also_notify=[old_assigned_to_id],
+                                assigned_to=instance.assigned_to_id)
+
+
+@receiver(post_save, sender=Feedback)
+def publish_new_feedback(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        publish_complaint_event('feedback.created', instance.complaint, feedback=instance.id)
+
+
+# --- Change log (/api/sync/) ---
+@receiver(post_save, sender=Complaint)
+def log_complaint_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    audiences = [complaint_audience(instance)]
+    old = instance._old_stat_key
+    if old is not None and old[3] != instance.assigned_to_id:
+        # The previous assignee syncs the complaint away as a deletion
+        audiences.append((instance.college_id, instance.student_id, old[3]))
+    log_change('complaint', instance.id, *audiences)
+
+
+@receiver(post_delete, sender=Complaint)
+def log_complaint_delete(sender, instance, **kwargs):
+    log_change('complaint', instance.id, complaint_audience(instance))
+
+
+@receiver([post_save, post_delete], sender=Feedback)
+def log_feedback_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        log_change('feedback', instance.id, feedback_audience(instance))
+
+
+@receiver([post_save, post_delete], sender=News)
+def log_news_change(sender, instance, raw=False, **kwargs):
+    if not raw:
+        log_change('news', instance.id, (instance.college_id, None, None))
@@ -0,0 +1,67 @@
+"""Change log behind the /api/sync/ delta endpoint.
+
+Every save or delete of a complaint, feedback entry or news post appends a
+ChangeLog row (see core/signals.py). A sync cursor is the id of the last row
+a client has seen, so "what changed since X" is one (audience, id) index
+range, and deletions come back as ids that no longer resolve.
+"""
+import base64
+import binascii
+
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+
+from .models import ChangeLog, Complaint
+
+INVALID_CURSOR = 'Invalid cursor'
+
+
+def encode_cursor(seq):
+    return base64.urlsafe_b64encode(str(seq).encode()).decode().rstrip('=')
+
+
+def decode_cursor(encoded):
+    if not encoded:
+        return 0
+    try:
+        return int(base64.urlsafe_b64decode(encoded + '=' * (-len(encoded) % 4)).decode())
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise NotFound(INVALID_CURSOR)
+
+
+# --- Writing ---
+def complaint_audience(complaint):
+    return complaint.college_id, complaint.student_id, complaint.assigned_to_id
+
+
+def feedback_audience(feedback):
+    try:
+        return complaint_audience(feedback.complaint)
+    except Complaint.DoesNotExist:  # already gone mid-cascade: admins only
+        return None, None, None
+
+
+def log_change(entity, object_id, *audiences):
+    """Record a change to `object_id`, once per distinct (college, student, assignee)."""
+    ChangeLog.objects.bulk_create([
+        ChangeLog(entity=entity, object_id=object_id,
+                  college_id=college_id, student_id=student_id, assigned_to_id=assigned_to_id)
+        for college_id, student_id, assigned_to_id in dict.fromkeys(audiences)
+    ])
+
+
+# --- Reading ---
+def audience_filter(user):
+    """Q matching the ChangeLog rows `user` may see, mirroring the list endpoints."""
+    if user.role == 'admin':
+        return Q()
+    # Spelled out per college so each term is one range of changelog_news_idx
+    news = Q(entity='news', college_id__isnull=True)
+    if user.college_id:
+        news |= Q(entity='news', college_id=user.college_id)
+
+    if user.role == 'principal':
+        return (Q(college_id=user.college_id) | news) if user.college_id else news
+    if user.role == 'squad':
+        return Q(assigned_to_id=user.id) | news
+    return Q(student_id=user.id) | news
@@ -1,3 +1,1194 @@
-from django.test import TestCase
+import asyncio
+import csv
+import tempfile
+import threading
+import time
+from datetime import date, datetime, timedelta
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Q
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import UntypedToken
+
+from .models import (User, College, Branch, ChangeLog, Complaint, ComplaintDailyStat, Feedback, News, EmailOutbox,
+                     ComplaintStat)
+from . import search, sync
+from .authentication import invalidate_revoked_users
+from .events import OVERFLOW, LocalBroker, get_broker
+from .flat import flat_plan
+from .serializers import ComplaintListSerializer, MyTokenObtainPairSerializer
+from .views import FlatListMixin
+from .tokens import blacklist_jti
+from core.utils.email_utils import build_complaint_submitted_email, build_complaint_status_update_email
+from core.utils.digest import send_digests
+from core.utils.institutions import import_institutions
+from core.utils.news_feed import cached_feed, feed_version
+from core.utils.onboarding import MIN_PARALLEL_HASHES
+from core.utils.outbox import deliver_pending
+from core.utils.rollup import run_rollup
+
+
+class BaseAPITestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.college = College.objects.create(name='Test College', college_type='engineering')
+        cls.branch = Branch.objects.create(college=cls.college, name='Computer Science', code='CSE')
+        cls.admin = User.objects.create(username='admin1', email='admin@example.com', role='admin')
+        cls.principal = User.objects.create(username='principal1', email='principal@example.com',
+                                            role='principal', college=cls.college)
+        cls.squad = User.objects.create(username='squad1', email='squad@example.com',
+                                        role='squad', college=cls.college)
+        cls.student = User.objects.create(username='student1', email='student@example.com', role='student',
+                                          college=cls.college, branch=cls.branch)
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def make_complaint(self, **kwargs):
+        defaults = dict(student=self.student, college=self.college, branch=self.branch,
+                        title='Ragging in hostel', description='Seniors forced us to...')
+        defaults.update(kwargs)
+        return Complaint.objects.create(**defaults)
+
+
+class EmailOutboxTests(BaseAPITestCase):
+    def test_complaint_create_only_enqueues(self):
+        response = self.client_for(self.student).post(
+            '/api/complaints/', {'title': 'Help', 'description': 'Details'}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(mail.outbox), 0)
+        entry = EmailOutbox.objects.get()
+        self.assertEqual(entry.kind, 'complaint_submitted')
+        self.assertEqual(entry.payload, {'complaint_id': response.data['id']})
+
+    def test_status_change_and_assignment_enqueue(self):
+        complaint = self.make_complaint()
+        response = self.client_for(self.principal).patch(
+            f'/api/complaints/{complaint.id}/', {'status': 'in_progress', 'assigned_to': self.squad.id},
+            format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            sorted(EmailOutbox.objects.values_list('kind', flat=True)),
+            ['complaint_assigned', 'complaint_status_update'],
+        )
+
+    def test_worker_delivers_and_marks_sent(self):
+        complaint = self.make_complaint()
+        EmailOutbox.objects.create(kind='complaint_submitted', payload={'complaint_id': complaint.id})
+        EmailOutbox.objects.create(kind='welcome', payload={'user_id': self.student.id})
+
+        stats = deliver_pending()
+
+        self.assertEqual(stats['sent'], 2)
+        self.assertEqual(len(mail.outbox), 2)
+        self.assertFalse(EmailOutbox.objects.exclude(status='sent').exists())
+
+    def test_failed_delivery_backs_off_then_dead_letters(self):
+        complaint = self.make_complaint()
+        entry = EmailOutbox.objects.create(kind='complaint_submitted', payload={'complaint_id': complaint.id})
+
+        class BrokenConnection:
+            def open(self):
+                pass
+
+            def close(self):
+                pass
+
+            def send_messages(self, messages):
+                raise ConnectionError('mail server down')
+
+        deliver_pending(connection=BrokenConnection())
+        entry.refresh_from_db()
+        self.assertEqual((entry.status, entry.attempts), ('pending', 1))
+        self.assertGreater(entry.next_attempt_at, timezone.now())
+
+        EmailOutbox.objects.filter(pk=entry.pk).update(attempts=4, next_attempt_at=timezone.now() - timedelta(seconds=1))
+        stats = deliver_pending(connection=BrokenConnection())
+        entry.refresh_from_db()
+        self.assertEqual(stats['dead'], 1)
+        self.assertEqual(entry.status, 'dead')
+        self.assertIn('mail server down', entry.last_error)
+
+    def test_deleted_complaint_is_skipped(self):
+        EmailOutbox.objects.create(kind='complaint_submitted', payload={'complaint_id': 999})
+        self.assertEqual(deliver_pending()['skipped'], 1)
+
+
+class EmailTemplateTests(BaseAPITestCase):
+    def test_user_fields_escaped_in_html_only(self):
+        complaint = self.make_complaint(title='<script>alert(1)</script> & co')
+        message = build_complaint_submitted_email(complaint)
+        html = message.alternatives[0][0]
+
+        self.assertIn('&lt;script&gt;alert(1)&lt;/script&gt; &amp; co', html)
+        self.assertNotIn('<script>', html)
+        self.assertIn('<script>alert(1)</script> & co', message.body)
+        self.assertNotIn('<p>', message.body)
+
+    def test_optional_fragment_rendered_in_both_parts(self):
+        complaint = self.make_complaint(status='solved')
+        message = build_complaint_status_update_email(complaint, 'in_progress')
+
+        self.assertIn('<p><strong>Action Required:</strong>', message.alternatives[0][0])
+        self.assertIn('Action Required: Please provide feedback', message.body)
+        self.assertEqual(message.subject, f'Complaint Status Updated - #{complaint.id}')
+
+
+class DigestTests(BaseAPITestCase):
+    def test_digest_groups_events_per_recipient(self):
+        User.objects.filter(pk__in=[self.principal.pk, self.squad.pk]).update(email_delivery='digest')
+        self.make_complaint(title='Assigned one', assigned_to=self.squad)
+        self.make_complaint(title='Unassigned one')
+
+        with self.assertNumQueries(2):
+            sent = send_digests(timezone.now() - timedelta(days=1))
+
+        self.assertEqual(sent, 2)
+        by_recipient = {m.to[0]: m for m in mail.outbox}
+        self.assertIn('Unassigned one', by_recipient['principal@example.com'].body)
+        self.assertIn('Assigned one', by_recipient['squad@example.com'].body)
+        self.assertNotIn('Unassigned one', by_recipient['squad@example.com'].body)
+
+    def test_digest_recipients_skip_immediate_assignment_email(self):
+        User.objects.filter(pk=self.squad.pk).update(email_delivery='digest')
+        complaint = self.make_complaint(assigned_to=self.squad)
+        EmailOutbox.objects.create(kind='complaint_assigned', payload={'complaint_id': complaint.id})
+
+        self.assertEqual(deliver_pending()['skipped'], 1)
+        self.assertEqual(len(mail.outbox), 0)
+
+
+class ComplaintPaginationTests(BaseAPITestCase):
+    def test_walks_every_row_once_in_stable_order(self):
+        same_instant = timezone.now()
+        ids = [self.make_complaint(title=f'C{i}').id for i in range(7)]
+        Complaint.objects.filter(id__in=ids[2:5]).update(created_at=same_instant)
+        expected = list(Complaint.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+        client = self.client_for(self.admin)
+        seen, url = [], '/api/complaints/?page_size=3'
+        while url:
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 3)
+            seen += [row['id'] for row in response.data['results']]
+            url = response.data['next']
+
+        self.assertEqual(seen, expected)
+
+    def test_filters(self):
+        other_branch = Branch.objects.create(college=self.college, name='Mechanical', code='ME')
+        old = self.make_complaint(status='closed')
+        Complaint.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=10))
+        self.make_complaint(branch=other_branch)
+        client = self.client_for(self.principal)
+
+        def ids(query):
+            return [row['id'] for row in client.get(f'/api/complaints/?{query}').data['results']]
+
+        self.assertEqual(ids('status=closed'), [old.id])
+        self.assertEqual(len(ids(f'branch={other_branch.id}')), 1)
+        before = (timezone.now() - timedelta(days=5)).date().isoformat()
+        self.assertEqual(ids(f'created_before={before}'), [old.id])
+        self.assertNotIn(old.id, ids(f'created_after={before}'))
+        self.assertEqual(client.get('/api/complaints/?created_after=yesterday').status_code, 400)
+        self.assertEqual(client.get('/api/complaints/?cursor=bogus').status_code, 404)
+
+
+class QueryCountTests(BaseAPITestCase):
+    """Each endpoint must cost the same number of queries for 1 row as for many."""
+
+    def setUp(self):
+        cache.clear()
+
+    def add_rows(self, count):
+        for i in range(count):
+            student = User.objects.create(username=f'extra{User.objects.count()}', role='student',
+                                          college=self.college, branch=self.branch)
+            complaint = self.make_complaint(student=student, assigned_to=self.squad)
+            Feedback.objects.create(user=student, complaint=complaint, message='Thanks')
+            with self.captureOnCommitCallbacks(execute=True):  # invalidates the cached news feeds
+                News.objects.create(created_by=self.admin, college=self.college, title='Notice', content='...')
+            Branch.objects.create(college=self.college, name=f'Branch {i}')
+
+    def assert_constant_queries(self, user, url, expected):
+        client = self.client_for(user)
+        for count in (1, 5):
+            self.add_rows(count)
+            with self.assertNumQueries(expected):
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+
+    def test_complaint_list(self):
+        for user in (self.admin, self.principal, self.squad):
+            self.assert_constant_queries(user, '/api/complaints/', 1)
+
+    def test_complaint_detail(self):
+        complaint = self.make_complaint(assigned_to=self.squad)
+        with self.assertNumQueries(1):
+            self.client_for(self.admin).get(f'/api/complaints/{complaint.id}/')
+
+    def test_feedback_list(self):
+        self.assert_constant_queries(self.principal, '/api/feedback/', 1)
+
+    def test_news_list(self):
+        # Global and college posts are read with one keyset query each
+        self.assert_constant_queries(self.student, '/api/news/', 2)
+
+    def test_user_lists(self):
+        self.assert_constant_queries(self.principal, '/api/students/', 1)
+        self.assert_constant_queries(self.principal, '/api/users/', 1)
+
+    def test_catalogs(self):
+        # One query for the rows plus one for the TableVersion behind the ETag
+        self.assert_constant_queries(self.student, '/api/branches/', 2)
+        self.assert_constant_queries(self.student, '/api/colleges/', 2)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class LoginIdentifierTests(BaseAPITestCase):
+    def setUp(self):
+        self.user = User.objects.create(username='riya_s', email='Riya.S@Example.com', phone='9876543210',
+                                        college=self.college)
+        self.user.set_password('secret-pass-1')
+        self.user.save()
+
+    def login(self, identifier):
+        return APIClient().post('/api/token/', {'identifier': identifier, 'password': 'secret-pass-1'},
+                                format='json')
+
+    def test_keys_are_normalised_on_save(self):
+        self.assertEqual((self.user.email_key, self.user.phone_key), ('riya.s@example.com', '9876543210'))
+
+    def test_account_left_without_keys_by_the_migrations_can_be_saved(self):
+        # As 0008/0017 leave the younger of two accounts sharing identifiers
+        twin = User.objects.create(username='riya_twin', college=self.college)
+        User.objects.filter(pk=twin.pk).update(email='riya.s@example.com', phone='+91 98765 43210')
+        twin.refresh_from_db()
+
+        twin.is_suspended = True
+        twin.save()
+        twin.refresh_from_db()
+        self.assertEqual((twin.email_key, twin.phone_key), (None, None))
+
+        self.user.email, self.user.phone = 'riya@example.com', '9123456780'
+        self.user.save()
+        twin.save()
+        self.assertEqual((twin.email_key, twin.phone_key), ('riya.s@example.com', '9876543210'))
+
+    def test_any_identifier_resolves_with_one_query(self):
+        for identifier in ('riya.s@EXAMPLE.com', '+98765 43210', '98765-43210', 'riya_s'):
+            with self.assertNumQueries(1):
+                response = self.login(identifier)
+            self.assertEqual(response.status_code, 200, identifier)
+            self.assertEqual(response.data['user_id'], self.user.id)
+
+    def test_country_prefix_is_part_of_the_phone_key(self):
+        for phone in ('+91 98765 43210', '09876543210', '0091-9876543210'):
+            self.assertEqual(User.normalize_phone_key(phone), '9876543210')
+        self.assertEqual(User.normalize_phone_key('+44 20 7946 0958'), '442079460958')
+        self.assertEqual(self.login('+91 98765 43210').data['user_id'], self.user.id)
+
+        response = APIClient().post('/api/register/', {
+            'username': 'newuser', 'email': 'new@example.com', 'password': 'longenough1', 'phone': '919876543210',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('phone', response.data)
+
+    def test_email_match_wins_over_username(self):
+        User.objects.create(username='other@example.com', email='someone@example.com')
+        squatter = User.objects.create(username='x', email='OTHER@example.com')
+        squatter.set_password('secret-pass-1')
+        squatter.save()
+        self.assertEqual(self.login('other@example.com').data['user_id'], squatter.id)
+
+    def test_registration_rejects_case_variant_email(self):
+        response = APIClient().post('/api/register/', {
+            'username': 'newuser', 'email': 'RIYA.s@example.com', 'password': 'longenough1',
+            'phone': '9123456789',
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('email', response.data)
+
+
+class PasswordPolicyTests(BaseAPITestCase):
+    @override_settings(PASSWORD_HASHER='pbkdf2_sha256', PASSWORD_HASH_ITERATIONS=1000)
+    def test_login_rehashes_to_current_policy(self):
+        self.student.set_password('secret-pass-1')
+        self.student.save()
+
+        with override_settings(PASSWORD_HASH_ITERATIONS=2000):
+            response = APIClient().post('/api/token/', {'identifier': 'student1', 'password': 'secret-pass-1'},
+                                        format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.student.refresh_from_db()
+        self.assertTrue(self.student.password.startswith('pbkdf2_sha256$2000$'))
+
+    @override_settings(PASSWORD_HASHERS=['core.hashers.TunedScryptPasswordHasher'],
+                       PASSWORD_SCRYPT_WORK_FACTOR=2 ** 16)
+    def test_scrypt_checks_hashes_above_the_current_work_factor(self):
+        self.student.set_password('secret-pass-1')  # needs 64 MiB, over OpenSSL's default limit
+        self.student.save()
+
+        with override_settings(PASSWORD_SCRYPT_WORK_FACTOR=2 ** 10):
+            response = APIClient().post('/api/token/', {'identifier': 'student1', 'password': 'secret-pass-1'},
+                                        format='json')
+
+        self.assertEqual(response.status_code, 200)
+        self.student.refresh_from_db()
+        self.assertTrue(self.student.password.startswith('scrypt$1024$'))
+
+
+class ClaimsAuthenticationTests(BaseAPITestCase):
+    def setUp(self):
+        invalidate_revoked_users()
+        self.addCleanup(invalidate_revoked_users)
+
+    def client_with_token(self, user):
+        client = APIClient()
+        token = MyTokenObtainPairSerializer.get_token(user).access_token
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+        return client
+
+    def test_reads_skip_user_lookup(self):
+        self.make_complaint()
+        client = self.client_with_token(self.principal)
+        client.get('/api/complaints/')  # warm the revocation set
+
+        with self.assertNumQueries(1):
+            response = client.get('/api/complaints/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_suspended_user_is_rejected(self):
+        client = self.client_with_token(self.student)
+        self.assertEqual(client.get('/api/complaints/').status_code, 200)
+
+        response = self.client_with_token(self.principal).patch(f'/api/students/{self.student.id}/suspend/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(client.get('/api/complaints/').status_code, 401)
+
+    def test_demoted_user_loses_token_scope(self):
+        self.make_complaint()
+        client = self.client_with_token(self.principal)
+        self.assertEqual(len(client.get('/api/complaints/').data['results']), 1)
+
+        principal = User.objects.get(pk=self.principal.pk)
+        principal.role = 'student'
+        with self.captureOnCommitCallbacks(execute=True):
+            principal.save(update_fields=['role'])
+
+        self.assertIsNotNone(User.objects.get(pk=principal.pk).claims_changed_at)
+        self.assertEqual(client.get('/api/complaints/').data['results'], [])
+
+    def test_unrelated_save_keeps_claims(self):
+        student = User.objects.get(pk=self.student.pk)
+        student.first_name = 'Asha'
+        student.save()
+        self.assertIsNone(User.objects.get(pk=student.pk).claims_changed_at)
+
+    def test_superuser_sees_all_feedback(self):
+        superuser = User.objects.create(username='root', role='student', is_superuser=True)
+        Feedback.objects.create(user=self.student, complaint=self.make_complaint(), message='Thanks')
+
+        response = self.client_with_token(superuser).get('/api/feedback/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 1)
+
+
+class RefreshBlacklistTests(BaseAPITestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def refresh(self, token):
+        return APIClient().post('/api/token/refresh/', {'refresh': str(token)}, format='json')
+
+    def test_rotated_token_cannot_be_reused(self):
+        token = MyTokenObtainPairSerializer.get_token(self.student)
+
+        first = self.refresh(token)
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(self.refresh(token).status_code, 401)
+        self.assertEqual(self.refresh(first.data['refresh']).status_code, 200)
+
+    def test_suspension_revokes_every_refresh_token(self):
+        tokens = [MyTokenObtainPairSerializer.get_token(self.student) for _ in range(2)]
+        response = self.client_for(self.principal).patch(f'/api/students/{self.student.id}/suspend/')
+        self.assertEqual(response.status_code, 200)
+
+        for token in tokens:
+            self.assertEqual(self.refresh(token).status_code, 401)
+
+    def test_refresh_reissues_claims_from_the_database(self):
+        token = MyTokenObtainPairSerializer.get_token(self.principal)
+        User.objects.filter(pk=self.principal.pk).update(role='student', college=None)
+
+        response = self.refresh(token)
+        self.assertEqual(response.status_code, 200)
+        for raw in (response.data['access'], response.data['refresh']):
+            claims = UntypedToken(raw)
+            self.assertEqual((claims['role'], claims['college_id']), ('student', None))
+
+    def test_expired_tokens_are_not_stored(self):
+        blacklist_jti('stale', time.time() - 1)
+        self.assertIsNone(cache.get('jwt:blacklist:stale'))
+
+
+class ComplaintStatsTests(BaseAPITestCase):
+    def stats(self, user):
+        return self.client_for(user).get('/api/stats/').data
+
+    def test_counts_follow_creates_updates_and_deletes(self):
+        complaint = self.make_complaint()
+        self.make_complaint(assigned_to=self.squad, status='in_progress')
+        self.assertEqual(self.stats(self.principal)['by_status'],
+                         {'pending': 1, 'in_progress': 1, 'solved': 0, 'closed': 0})
+
+        response = self.client_for(self.principal).patch(
+            f'/api/complaints/{complaint.id}/', {'status': 'solved', 'assigned_to': self.squad.id}, format='json')
+        self.assertEqual(response.status_code, 200)
+        stats = self.stats(self.squad)
+        self.assertEqual((stats['total'], stats['by_status']['solved']), (2, 1))
+
+        complaint.refresh_from_db()
+        complaint.delete()
+        stats = self.stats(self.admin)
+        self.assertEqual((stats['total'], stats['unassigned']), (1, 0))
+        self.assertEqual(stats['by_branch'][0]['branch_name'], 'Computer Science')
+        self.assertEqual(self.client_for(self.student).get('/api/stats/').status_code, 403)
+
+    def test_single_query_and_rebuild(self):
+        for status_value in ('pending', 'pending', 'closed'):
+            self.make_complaint(status=status_value)
+        ComplaintStat.objects.update(count=99)
+
+        call_command('rebuild_complaint_stats', workers=1, stdout=StringIO())
+
+        with self.assertNumQueries(1):
+            stats = self.stats(self.principal)
+        self.assertEqual(stats['by_status'], {'pending': 2, 'in_progress': 0, 'solved': 0, 'closed': 1})
+
+
+class ComplaintRollupTests(BaseAPITestCase):
+    def make_dated(self, day, **kwargs):
+        complaint = self.make_complaint(**kwargs)
+        created = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+        Complaint.objects.filter(pk=complaint.pk).update(created_at=created)
+        complaint.refresh_from_db()
+        return complaint
+
+    def test_rollup_is_incremental_and_feeds_timeseries(self):
+        monday = date(2026, 3, 2)
+        self.make_dated(monday)
+        self.make_dated(monday + timedelta(days=1))
+        solved = self.make_dated(monday + timedelta(days=8))
+        solved.status = 'solved'
+        solved.save()
+        self.assertIsNotNone(solved.resolved_at)
+
+        self.assertEqual(run_rollup()['days'], 4)  # 3 creation days + today's resolution
+        self.assertEqual(run_rollup()['days'], 0)
+        solved.status = 'closed'
+        solved.save()
+        self.assertEqual(run_rollup()['days'], 2)
+
+        client = self.client_for(self.principal)
+        response = client.get('/api/stats/timeseries/?start=2026-03-02&end=2026-03-15&granularity=week')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(r['period'], r['created']) for r in response.data['results']],
+            [('2026-03-02', 2), ('2026-03-09', 1)],
+        )
+        daily = client.get('/api/stats/timeseries/?start=2026-03-02&end=2026-03-04').data['results']
+        self.assertEqual([r['created'] for r in daily], [1, 1, 0])
+        self.assertEqual(client.get('/api/stats/timeseries/?granularity=year').status_code, 400)
+        self.assertEqual(self.client_for(self.student).get('/api/stats/timeseries/').status_code, 403)
+
+        today = client.get('/api/stats/timeseries/?granularity=month').data['results'][-1]
+        self.assertEqual((today['resolved'], today['closed']), (1, 1))
+
+    def test_days_complaints_leave_are_recomputed(self):
+        monday = date(2026, 3, 2)
+        kept, deleted = self.make_dated(monday), self.make_dated(monday + timedelta(days=1))
+        run_rollup()
+        self.assertEqual(ComplaintDailyStat.objects.count(), 2)
+
+        deleted.delete()
+        self.assertEqual(run_rollup()['days'], 1)
+        self.assertEqual(list(ComplaintDailyStat.objects.values_list('day', 'created')), [(monday, 1)])
+
+        kept.created_at += timedelta(days=7)
+        kept.save(update_fields=['created_at'])
+        run_rollup()
+        self.assertEqual(list(ComplaintDailyStat.objects.values_list('day', 'created')),
+                         [(monday + timedelta(days=7), 1)])
+
+    def test_full_rollup_drops_days_without_complaints(self):
+        self.make_dated(date(2026, 3, 2))
+        ComplaintDailyStat.objects.create(day=date(2020, 1, 1), college=self.college, created=5)
+        run_rollup(full=True)
+        self.assertEqual(list(ComplaintDailyStat.objects.values_list('day', flat=True)), [date(2026, 3, 2)])
+
+    def test_timeseries_range_is_capped(self):
+        client = self.client_for(self.principal)
+        url = '/api/stats/timeseries/?start=2020-01-01&end=2026-01-01'
+        self.assertEqual(client.get(url).status_code, 400)
+        self.assertEqual(client.get(url + '&granularity=month').status_code, 200)
+        self.assertEqual(client.get('/api/stats/timeseries/?start=2025-01-01&end=2025-12-31').status_code, 200)
+
+
+class ComplaintSearchTests(BaseAPITestCase):
+    def search(self, user, query):
+        response = self.client_for(user).get('/api/complaints/search/', {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return response.data['results']
+
+    def test_ranked_scoped_and_highlighted(self):
+        other_student = User.objects.create(username='student2', role='student', college=self.college)
+        best = self.make_complaint(title='Hostel ragging', description='Ragging near the <hostel> mess')
+        weaker = self.make_complaint(title='Canteen', description='Some ragging at the canteen')
+        self.make_complaint(student=other_student, title='Hostel ragging again')
+        self.make_complaint(title='Unrelated', description='Bus timings')
+
+        results = self.search(self.student, 'ragging hostel')
+        self.assertEqual([r['id'] for r in results], [best.id])
+        self.assertEqual(results[0]['highlight']['title'], '<mark>Hostel</mark> <mark>ragging</mark>')
+        self.assertIn('&lt;<mark>hostel</mark>&gt;', results[0]['highlight']['description'])
+
+        results = self.search(self.student, 'ragged')
+        self.assertEqual([r['id'] for r in results], [best.id, weaker.id])
+        self.assertEqual(len(self.search(self.admin, 'ragging')), 3)
+        self.assertEqual(self.client_for(self.student).get('/api/complaints/search/').status_code, 400)
+
+    def test_index_follows_updates_and_deletes(self):
+        complaint = self.make_complaint(title='Threats in library')
+        complaint.title = 'Threats in parking lot'
+        complaint.save()
+
+        self.assertEqual(self.search(self.admin, 'library'), [])
+        self.assertEqual(len(self.search(self.admin, 'parking')), 1)
+        self.assertEqual(search.matching(Complaint.objects.all(), 'parking').get(), complaint)
+        complaint.delete()
+        self.assertEqual(self.search(self.admin, 'parking'), [])
+
+
+class ImportInstitutionsTests(BaseAPITestCase):
+    CSV = (
+        'college,college_type,address,branch,branch_code\n'
+        'Test College,engineering,Mysore,Computer Science,CSE\n'
+        'Test College,engineering,,Mechanical,ME\n'
+        'Govt ITI,iti,Hebbal,Fitter,\n'
+        'Nowhere,university,,,\n'
+    )
+
+    def run_import(self, path):
+        out, err = StringIO(), StringIO()
+        call_command('import_institutions', str(path), batch_size=2, stdout=out, stderr=err)
+        return out.getvalue(), err.getvalue()
+
+    def test_csv_upserts_on_natural_keys(self):
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / 'colleges.csv'
+        path.write_text(self.CSV)
+
+        out, err = self.run_import(path)
+        self.assertIn('Colleges: 1 inserted, 1 updated, 0 unchanged', out)
+        self.assertIn('Branches: 2 inserted, 0 updated, 1 unchanged', out)
+        self.assertIn("Line 5: unknown college_type 'university'", err)
+        self.college.refresh_from_db()
+        self.assertEqual(self.college.address, 'Mysore')
+
+        out, _ = self.run_import(path)
+        self.assertIn('Colleges: 0 inserted, 0 updated, 2 unchanged', out)
+        self.assertIn('Branches: 0 inserted, 0 updated, 3 unchanged', out)
+        self.assertEqual(College.objects.count(), 2)
+        self.assertEqual(Branch.objects.count(), 3)
+
+    def test_jsonl_nested_branches(self):
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / 'colleges.jsonl'
+        path.write_text(
+            '{"college": "Test College", "college_type": "engineering", '
+            '"branches": [{"name": "Computer Science & Engg", "code": "CSE"}, {"name": "Civil", "code": "CV"}]}\n'
+        )
+
+        out, _ = self.run_import(path)
+        self.assertIn('Branches: 1 inserted, 1 updated, 0 unchanged', out)
+        self.assertEqual(Branch.objects.get(code='CSE').name, 'Computer Science & Engg')
+
+    def test_code_is_added_to_a_branch_that_had_none(self):
+        legacy = College.objects.create(name='Legacy', college_type='puc')
+        arts = Branch.objects.create(college=legacy, name='Arts')
+
+        stats = import_institutions([{'college': 'Legacy', 'college_type': 'puc', 'branch': 'Arts',
+                                      'branch_code': 'ART'}])
+        self.assertEqual((stats['branches_inserted'], stats['branches_updated']), (0, 1))
+        arts.refresh_from_db()
+        self.assertEqual(arts.code, 'ART')
+        self.assertEqual(Branch.objects.filter(college=legacy).count(), 1)
+
+    def test_jsonl_errors_point_at_file_lines(self):
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / 'colleges.jsonl'
+        path.write_text(
+            '{"college": "Govt ITI", "college_type": "iti", "branches": [{"name": "Fitter"}, {"name": "Welder"}]}\n'
+            '\n'
+            '["not", "an", "object"]\n'
+            '{"college": "Govt PUC", "college_type": "puc", "branches": ["Science"]}\n'
+            '{"college": "Nowhere", "college_type": "university"}\n'
+        )
+
+        out, err = self.run_import(path)
+        self.assertEqual(err.splitlines(), [
+            '❌ Line 3: expected a JSON object',
+            "❌ Line 4: branch 'Science' is not an object with name/code",
+            "❌ Line 5: unknown college_type 'university'",
+        ])
+        self.assertIn('Branches: 2 inserted', out)
+
+
+@override_settings(PASSWORD_HASHERS=['django.contrib.auth.hashers.MD5PasswordHasher'])
+class BulkOnboardingTests(BaseAPITestCase):
+    def roster(self, count, start=0):
+        return [{'username': f'roll_{i}', 'email': f'roll{i}@example.com', 'phone': f'90000{i:05d}',
+                 'password': f'initial-{i}', 'branch': 'CSE', 'roll_number': f'R{i}'}
+                for i in range(start, start + count)]
+
+    def test_endpoint_onboards_roster_and_queues_welcomes(self):
+        response = self.client_for(self.principal).post(
+            '/api/students/bulk/', {'students': self.roster(3)}, format='json')
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['created'], 3)
+        student = User.objects.get(username='roll_1')
+        self.assertEqual((student.college, student.branch, student.role), (self.college, self.branch, 'student'))
+        self.assertEqual((student.email_key, student.phone_key), ('roll1@example.com', '9000000001'))
+        self.assertTrue(student.check_password('initial-1'))
+        self.assertEqual(EmailOutbox.objects.filter(kind='welcome').count(), 3)
+
+    def test_invalid_roster_creates_nobody(self):
+        rows = self.roster(3)
+        rows[1]['email'] = 'STUDENT@example.com'  # already registered
+        rows[2]['username'] = rows[0]['username']  # duplicate inside the roster
+        rows.append({'username': 'x', 'email': 'bad', 'phone': '12', 'password': 'short', 'branch': 'ME'})
+
+        response = self.client_for(self.principal).post('/api/students/bulk/', {'students': rows}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        problems = {(e['row'], e['field']) for e in response.data['errors']}
+        self.assertEqual(problems, {(2, 'email'), (3, 'username'), (4, 'username'), (4, 'email'),
+                                    (4, 'phone'), (4, 'password'), (4, 'branch')})
+        self.assertFalse(User.objects.filter(username__startswith='roll_').exists())
+        self.assertEqual(self.client_for(self.squad).post('/api/students/bulk/', {}).status_code, 403)
+
+    def test_malformed_json_rows_are_row_errors(self):
+        rows = self.roster(3)
+        rows[0]['phone'] = 9000012345  # a JSON number is fine
+        rows[1].update(phone='9' * 16, roll_number='R' * 51)
+        rows.append('abc')
+
+        response = self.client_for(self.principal).post('/api/students/bulk/', {'students': rows}, format='json')
+
+        self.assertEqual(response.status_code, 400)
+        problems = {(e['row'], e['field']) for e in response.data['errors']}
+        self.assertEqual(problems, {(2, 'phone'), (2, 'roll_number'), (4, 'non_field_errors')})
+        response = self.client_for(self.principal).post('/api/students/bulk/', {'students': 'abc'}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client_for(self.principal).post('/api/students/bulk/', {'students': rows[:1]}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(User.objects.get(username='roll_0').phone, '9000012345')
+
+    def test_endpoint_caps_hashing_processes(self):
+        rows = self.roster(MIN_PARALLEL_HASHES + 6)
+        with override_settings(ONBOARDING_WEB_HASH_WORKERS=1), \
+                mock.patch('core.utils.onboarding.ProcessPoolExecutor', side_effect=AssertionError):
+            response = self.client_for(self.admin).post(
+                '/api/students/bulk/', {'college': self.college.id, 'students': rows}, format='json')
+        self.assertEqual(response.status_code, 201)
+
+        with override_settings(ONBOARDING_WEB_HASH_WORKERS=3), \
+                mock.patch('core.utils.onboarding.ProcessPoolExecutor') as pool:
+            pool.return_value.__enter__.return_value.map.side_effect = lambda fn, items, **kw: map(fn, items)
+            self.client_for(self.principal).post('/api/students/bulk/', {'students': self.roster(70, start=100)},
+                                                 format='json')
+        self.assertEqual(pool.call_args.kwargs['max_workers'], 3)
+
+    def test_command_hashes_in_a_process_pool(self):
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / 'roster.csv'
+        rows = self.roster(MIN_PARALLEL_HASHES + 6)
+        with path.open('w', newline='') as handle:
+            writer = csv.DictWriter(handle, fieldnames=list(rows[0]))
+            writer.writeheader()
+            writer.writerows(rows)
+
+        call_command('onboard_students', str(path), college=self.college.id, workers=2, stdout=StringIO())
+
+        self.assertEqual(User.objects.filter(username__startswith='roll_').count(), len(rows))
+        self.assertTrue(User.objects.get(username='roll_42').check_password('initial-42'))
+
+
+class ComplaintExportTests(BaseAPITestCase):
+    def export(self, user, query=''):
+        response = self.client_for(user).get(f'/api/complaints/export/{query}', HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return list(csv.DictReader(StringIO(b''.join(response.streaming_content).decode())))
+
+    def test_streams_scoped_rows_and_masks_anonymous_students(self):
+        other_college = College.objects.create(name='Other College', college_type='puc')
+        self.make_complaint(title='Named, "quoted"\nmultiline')
+        self.make_complaint(title='Hidden', is_anonymous=True)
+        self.make_complaint(title='Elsewhere', college=other_college)
+
+        rows = self.export(self.principal)
+        self.assertEqual([r['title'] for r in rows], ['Hidden', 'Named, "quoted"\nmultiline'])
+        self.assertEqual((rows[0]['student'], rows[0]['student_email']), ('Anonymous Student', ''))
+        self.assertEqual((rows[1]['student'], rows[1]['college']), ('student1', 'Test College'))
+
+        self.assertEqual(len(self.export(self.admin)), 3)
+        self.assertEqual([r['title'] for r in self.export(self.admin, '?status=closed')], [])
+        response = self.client_for(self.student).get('/api/complaints/export/', HTTP_ACCEPT='text/csv')
+        self.assertEqual(response.status_code, 403)
+
+    def test_formulas_are_escaped(self):
+        for title in ('=HYPERLINK("http://evil")', '+1', '-2+3', '@SUM(A1)', 'Plain - text'):
+            self.make_complaint(title=title, description=title)
+
+        rows = self.export(self.principal)
+        self.assertEqual(sorted(r['title'] for r in rows),
+                         ["'+1", "'-2+3", '\'=HYPERLINK("http://evil")', "'@SUM(A1)", 'Plain - text'])
+        self.assertEqual({r['title'] for r in rows}, {r['description'] for r in rows})
+        self.assertEqual(rows[0]['student'], 'student1')
+
+
+class CatalogConditionalGetTests(BaseAPITestCase):
+    def test_revalidation_returns_304_until_the_table_changes(self):
+        client = APIClient()
+        first = client.get('/api/branches/')
+        etag = first['ETag']
+        self.assertTrue(etag.startswith('"branches-'))
+        self.assertIn('public', first['Cache-Control'])
+        self.assertIn('Accept', first['Vary'])
+
+        with self.assertNumQueries(1):
+            response = client.get('/api/branches/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.content, b'')
+        self.assertIn('Accept', response['Vary'])
+
+        self.college.name = 'Renamed College'
+        self.college.save()
+        response = client.get('/api/branches/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_bulk_import_bumps_the_version(self):
+        etag = APIClient().get('/api/colleges/')['ETag']
+        import_institutions([{'college': 'New College', 'college_type': 'puc'}])
+        self.assertEqual(APIClient().get('/api/colleges/', HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+
+class NewsFeedCacheTests(BaseAPITestCase):
+    def setUp(self):
+        cache.clear()
+        self.other_college = College.objects.create(name='Other College', college_type='puc')
+        News.objects.create(created_by=self.admin, title='Global notice', content='...')
+        News.objects.create(created_by=self.admin, college=self.college, title='Our notice', content='...')
+        News.objects.create(created_by=self.admin, college=self.other_college, title='Their notice', content='...')
+
+    def titles(self, user):
+        return [post['title'] for post in self.client_for(user).get('/api/news/').data['results']]
+
+    def test_feeds_are_scoped_cached_and_invalidated(self):
+        self.assertEqual(self.titles(self.student), ['Our notice', 'Global notice'])
+        self.assertEqual(len(self.titles(self.admin)), 3)
+        with self.assertNumQueries(0):
+            self.assertEqual(self.titles(self.student), ['Our notice', 'Global notice'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client_for(User(id=self.admin.id, role='admin', is_staff=True)).post(
+                '/api/news/', {'title': 'Fresh notice', 'content': '...'}, format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.titles(self.student)[0], 'Fresh notice')
+
+    def test_concurrent_miss_waits_for_the_first_builder(self):
+        key = f'news:feed:{feed_version()}:global:20'
+        cache.add(f'{key}:lock', 1)  # another request is already building
+        threading.Timer(0.1, cache.set, (key, ['built elsewhere'])).start()
+
+        def build():
+            raise AssertionError('should have waited for the other request')
+
+        self.assertEqual(cached_feed('global:20', build), ['built elsewhere'])
+
+    def test_pages_merge_global_and_college_posts_in_order(self):
+        same_instant = timezone.now()
+        for i in range(3):
+            News.objects.create(created_by=self.admin, title=f'Global {i}', content='...')
+            News.objects.create(created_by=self.admin, college=self.college, title=f'Ours {i}', content='...')
+            News.objects.create(created_by=self.admin, college=self.other_college, title=f'Theirs {i}', content='...')
+        News.objects.update(posted_at=same_instant)  # ties are broken by id
+        expected = list(News.objects.filter(Q(college__isnull=True) | Q(college=self.college))
+                        .order_by('-posted_at', '-id').values_list('title', flat=True))
+
+        client = self.client_for(self.student)
+        seen, url = [], '/api/news/?page_size=3'
+        while url:
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [post['title'] for post in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(seen), 8)
+
+
+class ComplaintFeedbackTests(BaseAPITestCase):
+    def setUp(self):
+        self.complaint = self.make_complaint(assigned_to=self.squad)
+        self.feedbacks = [
+            Feedback.objects.create(user=self.student, complaint=self.complaint, message=f'Update {i}')
+            for i in range(5)
+        ]
+        # The last three share a timestamp, so the id must break the tie
+        Feedback.objects.filter(pk__in=[f.pk for f in self.feedbacks[2:]]).update(created_at=timezone.now())
+        Feedback.objects.create(user=self.student, complaint=self.make_complaint(), message='Elsewhere')
+
+    def test_thread_pages_oldest_first(self):
+        client = self.client_for(self.principal)
+        seen, url = [], f'/api/complaints/{self.complaint.id}/feedback/?page_size=2'
+        while url:
+            with self.assertNumQueries(2):
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [item['id'] for item in response.data['results']]
+            url = response.data['next']
+        self.assertEqual(seen, [f.id for f in self.feedbacks])
+
+    def test_thread_follows_complaint_visibility(self):
+        other = User.objects.create(username='student2', role='student', college=self.college)
+        other_principal = User.objects.create(
+            username='principal2', role='principal',
+            college=College.objects.create(name='Other College', college_type='puc'))
+        url = f'/api/complaints/{self.complaint.id}/feedback/'
+        for user in (self.admin, self.principal, self.squad, self.student):
+            self.assertEqual(self.client_for(user).get(url).status_code, 200)
+        for user in (other, other_principal):
+            self.assertEqual(self.client_for(user).get(url).status_code, 404)
+
+    def test_complaint_list_carries_feedback_summary(self):
+        quiet = self.make_complaint()
+        results = self.client_for(self.admin).get('/api/complaints/').data['results']
+        summary = {item['id']: (item['feedback_count'], item['last_feedback_at']) for item in results}
+
+        latest = Feedback.objects.filter(complaint=self.complaint).latest('created_at', 'id')
+        self.assertEqual(summary[self.complaint.id][0], 5)
+        self.assertEqual(summary[self.complaint.id][1], latest.created_at.isoformat().replace('+00:00', 'Z'))
+        self.assertEqual(summary[quiet.id], (0, None))
+
+
+class RecordingBroker:
+    def __init__(self):
+        self.published = []
+
+    def publish(self, event, channels):
+        self.published.append((event, sorted(channels)))
+
+
+@override_settings(EVENTS_BROKER='core.tests.RecordingBroker')
+class ComplaintEventTests(BaseAPITestCase):
+    def setUp(self):
+        self.published = get_broker().published
+        self.published.clear()
+
+    def test_writes_publish_scoped_events_after_commit(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client_for(self.student).post(
+                '/api/complaints/', {'title': 'Help', 'description': 'Details'}, format='json')
+        complaint_id = response.data['id']
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.client_for(self.principal).patch(
+                f'/api/complaints/{complaint_id}/', {'status': 'in_progress', 'assigned_to': self.squad.id},
+                format='json')
+        self.assertEqual(len(self.published), 1)  # nothing new until the commit
+        for callback in callbacks:
+            callback()
+        with self.captureOnCommitCallbacks(execute=True):
+            Feedback.objects.create(user=self.student, complaint_id=complaint_id, message='Thanks')
+
+        audience = sorted(['all', f'college:{self.college.id}', f'user:{self.student.id}'])
+        with_squad = sorted(audience + [f'user:{self.squad.id}'])
+        self.assertEqual(self.published, [
+            ({'type': 'complaint.created', 'complaint': complaint_id, 'status': 'pending'}, audience),
+            ({'type': 'complaint.status_changed', 'complaint': complaint_id, 'status': 'in_progress',
+              'old_status': 'pending'}, with_squad),
+            ({'type': 'complaint.assigned', 'complaint': complaint_id, 'assigned_to': self.squad.id}, with_squad),
+            ({'type': 'feedback.created', 'complaint': complaint_id,
+              'feedback': Feedback.objects.get().id}, with_squad),
+        ])
+
+class EventStreamClient:
+    """Drives antiragging.asgi.application like a server holding one connection."""
+
+    def __init__(self, query_string=b'', headers=()):
+        from antiragging.asgi import application
+
+        self.messages = asyncio.Queue()
+        self.disconnected = asyncio.Event()
+        scope = {'type': 'http', 'method': 'GET', 'path': '/api/events/', 'query_string': query_string,
+                 'headers': [(b'host', b'testserver'), *headers]}
+        self.task = asyncio.ensure_future(application(scope, self.receive, self.messages.put))
+
+    async def receive(self):
+        await self.disconnected.wait()
+        return {'type': 'http.disconnect'}
+
+    async def next(self):
+        return await asyncio.wait_for(self.messages.get(), timeout=1)
+
+    async def disconnect(self):
+        self.disconnected.set()
+        await asyncio.wait_for(self.task, timeout=1)
+
+
+class ComplaintEventStreamTests(BaseAPITestCase):
+    def setUp(self):
+        self.token = str(MyTokenObtainPairSerializer.get_token(self.student).access_token)
+
+    async def test_stream_rejects_missing_and_bad_tokens(self):
+        for query_string in (b'', b'token=bogus'):
+            client = EventStreamClient(query_string)
+            self.assertEqual((await client.next())['status'], 401)
+            await client.task
+
+    async def test_stream_delivers_only_the_users_channel(self):
+        client = EventStreamClient(headers=[(b'authorization', f'Bearer {self.token}'.encode())])
+        start = await client.next()
+        self.assertEqual((start['status'], dict(start['headers'])[b'content-type']), (200, b'text/event-stream'))
+        self.assertEqual((await client.next())['body'], b'retry: 5000\n\n')
+
+        broker = get_broker()
+        broker.publish({'type': 'complaint.created', 'complaint': 1}, ['user:0'])
+        broker.publish({'type': 'complaint.created', 'complaint': 2}, [f'user:{self.student.id}'])
+        self.assertEqual((await client.next())['body'],
+                         b'event: complaint.created\ndata: {"type": "complaint.created", "complaint": 2}\n\n')
+
+        await client.disconnect()
+        self.assertFalse(broker._channels)
+
+    async def test_slow_subscriber_gets_a_reset(self):
+        broker = LocalBroker(queue_size=2)
+        subscription = broker.subscribe(['all'])
+        for i in range(3):
+            broker.publish({'type': 'complaint.created', 'complaint': i}, ['all'])
+        await asyncio.sleep(0)
+        self.assertIs(await subscription.get(), OVERFLOW)
+        broker.unsubscribe(subscription)
+        self.assertFalse(broker._channels)
+
+
+@override_settings(SYNC_SETTLE_SECONDS=0)
+class SyncTests(BaseAPITestCase):
+    def sync(self, user, cursor=None):
+        url = '/api/sync/' + (f'?cursor={cursor}' if cursor else '')
+        response = self.client_for(user).get(url)
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_replays_then_returns_only_changes(self):
+        complaint = self.make_complaint()
+        feedback = Feedback.objects.create(user=self.student, complaint=complaint, message='Any update?')
+        News.objects.create(created_by=self.admin, title='Global notice', content='...')
+        other_college = College.objects.create(name='Other College', college_type='puc')
+        News.objects.create(created_by=self.admin, college=other_college, title='Their notice', content='...')
+
+        first = self.sync(self.student)
+        self.assertEqual([c['id'] for c in first['complaints']], [complaint.id])
+        self.assertEqual([f['id'] for f in first['feedback']], [feedback.id])
+        self.assertEqual([n['title'] for n in first['news']], ['Global notice'])
+        self.assertFalse(first['has_more'])
+
+        with self.assertNumQueries(1):
+            idle = self.sync(self.student, first['cursor'])
+        self.assertEqual(idle['cursor'], first['cursor'])
+        self.assertEqual((idle['complaints'], idle['feedback'], idle['news']), ([], [], []))
+
+        complaint.status = 'in_progress'
+        complaint.save()
+        feedback_id = feedback.id
+        feedback.delete()
+        delta = self.sync(self.student, first['cursor'])
+        self.assertEqual([c['status'] for c in delta['complaints']], ['in_progress'])
+        self.assertEqual(delta['deleted'], {'complaints': [], 'feedback': [feedback_id], 'news': []})
+
+    def test_reassignment_is_a_deletion_for_the_previous_assignee(self):
+        other_squad = User.objects.create(username='squad2', role='squad', college=self.college)
+        complaint = self.make_complaint(assigned_to=self.squad)
+        cursor = self.sync(self.squad)['cursor']
+
+        complaint.assigned_to = other_squad
+        complaint.save()
+        self.assertEqual(self.sync(self.squad, cursor)['deleted']['complaints'], [complaint.id])
+        self.assertEqual([c['id'] for c in self.sync(other_squad)['complaints']], [complaint.id])
+        self.assertEqual([c['id'] for c in self.sync(self.principal, cursor)['complaints']], [complaint.id])
+
+    @override_settings(SYNC_PAGE_SIZE=2)
+    def test_pages_follow_the_cursor(self):
+        ids = [self.make_complaint().id for _ in range(5)]
+        seen, cursor, has_more = [], None, True
+        while has_more:
+            page = self.sync(self.principal, cursor)
+            seen += [c['id'] for c in page['complaints']]
+            cursor, has_more = page['cursor'], page['has_more']
+        self.assertEqual(seen, ids)
+        self.assertEqual(self.client_for(self.principal).get('/api/sync/?cursor=bogus').status_code, 404)
+
+    @override_settings(SYNC_SETTLE_SECONDS=60)
+    def test_recent_changes_wait_to_settle(self):
+        self.make_complaint()
+        self.assertEqual(self.sync(self.student)['complaints'], [])
+
+    @override_settings(SYNC_SETTLE_SECONDS=60)
+    def test_cursor_stops_before_the_first_unsettled_change(self):
+        first, second = self.make_complaint(), self.make_complaint()
+        old = timezone.now() - timedelta(minutes=5)
+        ChangeLog.objects.filter(object_id=second.id).update(changed_at=old)
+
+        page = self.sync(self.student)
+        self.assertEqual((page['complaints'], page['cursor'], page['has_more']), ([], sync.encode_cursor(0), False))
+
+        ChangeLog.objects.filter(object_id=first.id).update(changed_at=old)
+        page = self.sync(self.student, page['cursor'])
+        self.assertEqual([c['id'] for c in page['complaints']], [first.id, second.id])
+
+
+class SparseFieldsTests(BaseAPITestCase):
+    def setUp(self):
+        cache.clear()
+        self.complaint = self.make_complaint(assigned_to=self.squad)
+        Feedback.objects.create(user=self.student, complaint=self.complaint, message='Any update?')
+        News.objects.create(created_by=self.admin, title='Notice', content='...')
+
+    def get(self, user, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client_for(user).get(url)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data, queries[-1]['sql']
+
+    def test_default_response_is_unchanged(self):
+        data, _ = self.get(self.admin, '/api/complaints/')
+        self.assertEqual(data['results'][0]['student']['username'], 'student1')
+        self.assertIn('description', data['results'][0])
+
+    def test_fields_trim_columns_and_joins(self):
+        data, sql = self.get(self.admin, '/api/complaints/?fields=id,title,status,student')
+        self.assertEqual(data['results'], [
+            {'id': self.complaint.id, 'title': 'Ragging in hostel', 'status': 'pending', 'student': self.student.id},
+        ])
+        self.assertNotIn('JOIN', sql)
+        self.assertNotIn('"description"', sql)
+        self.assertNotIn('core_feedback', sql)
+
+    def test_expand_joins_only_the_requested_object(self):
+        data, sql = self.get(self.admin, '/api/complaints/?fields=id,student&expand=student')
+        self.assertEqual(data['results'][0]['student']['college_name'], 'Test College')
+        self.assertEqual(sql.count('JOIN'), 3)  # the student, its college and branch
+
+        data, _ = self.get(self.admin, '/api/complaints/?expand=assigned_to_detail')
+        item = data['results'][0]
+        self.assertEqual((item['student'], item['assigned_to_detail']['username']), (self.student.id, 'squad1'))
+        self.assertIn('feedback_count', item)
+
+    def test_other_endpoints(self):
+        data, sql = self.get(self.admin, '/api/feedback/?fields=id,message')
+        self.assertEqual(data, [{'id': Feedback.objects.get().id, 'message': 'Any update?'}])
+        self.assertNotIn('JOIN', sql)
+
+        data, sql = self.get(self.principal, '/api/students/?fields=id,username')
+        self.assertEqual(data, [{'id': self.student.id, 'username': 'student1'}])
+        self.assertNotIn('JOIN', sql)
+
+        data, _ = self.get(self.student, '/api/news/?fields=title,created_by')
+        self.assertEqual(data['results'], [{'title': 'Notice', 'created_by': self.admin.id}])
+        data, _ = self.get(self.student, '/api/news/?fields=title&expand=created_by')
+        self.assertEqual(data['results'][0]['created_by']['username'], 'admin1')
+
+    def test_unknown_fields_are_rejected(self):
+        client = self.client_for(self.admin)
+        self.assertEqual(client.get('/api/complaints/?fields=id,password').status_code, 400)
+        self.assertEqual(client.get('/api/complaints/?expand=title').status_code, 400)
+
+
+class FlatListTests(BaseAPITestCase):
+    def setUp(self):
+        self.make_complaint(assigned_to=self.squad)
+        self.make_complaint(branch=None, is_anonymous=True, status='investigating')
+        complaint = self.make_complaint()
+        Feedback.objects.create(user=self.squad, complaint=complaint, message='Looking into it')
+        User.objects.create(username='no_branch', role='student', college=self.college, phone='9000000001')
+
+    def assert_identical(self, user, url):
+        client = self.client_for(user)
+        with CaptureQueriesContext(connection) as queries:
+            fast = client.get(url)
+        sql = [query['sql'] for query in queries]  # the next request resets connection.queries
+        with mock.patch.object(FlatListMixin, 'flat_list', False):
+            slow = client.get(url)
+        self.assertEqual(fast.status_code, 200, fast.data)
+        self.assertEqual(fast.content, slow.content)
+        return sql
+
+    def test_complaints_match_the_serializer(self):
+        for url in ('/api/complaints/', '/api/complaints/?page_size=2',
+                    '/api/complaints/?fields=id,branch_name,is_anonymous,student',
+                    '/api/complaints/?expand=assigned_to_detail', '/api/complaints/?fields=title&expand=student'):
+            with self.subTest(url=url):
+                self.assert_identical(self.admin, url)
+        self.assert_identical(self.principal, '/api/complaints/?status=pending')
+
+        # DRF leaves out a dotted field whose relation is null
+        item = self.client_for(self.admin).get('/api/complaints/?fields=id,branch,branch_name').data['results'][1]
+        self.assertEqual(item, {'id': item['id'], 'branch': None})
+
+    def test_users_match_the_serializer(self):
+        for user, url in ((self.admin, '/api/users/'), (self.principal, '/api/students/'),
+                          (self.admin, '/api/users/?fields=username,branch_name,phone')):
+            with self.subTest(url=url):
+                self.assert_identical(user, url)
+
+    def test_rows_are_read_as_values(self):
+        with mock.patch.object(ComplaintListSerializer, 'to_representation', side_effect=AssertionError):
+            response = self.client_for(self.admin).get('/api/complaints/?fields=id,college_name,student')
+        self.assertEqual(response.status_code, 200)
+        sql = self.assert_identical(self.admin, '/api/complaints/?fields=id,college_name')[-1]
+        self.assertIn('"core_college"."name"', sql)
+        self.assertNotIn('"description"', sql)
+
+    def test_plans_are_compiled_once_per_fieldset(self):
+        client = self.client_for(self.admin)
+        with mock.patch('core.views.flat_plan', wraps=flat_plan) as compile_plan, \
+                mock.patch.dict(FlatListMixin._flat_plans, clear=True):
+            for url in ('/api/users/?fields=id', '/api/users/?fields=id', '/api/users/?fields=id,phone'):
+                self.assertEqual(client.get(url).status_code, 200)
+        self.assertEqual(compile_plan.call_count, 2)
+
+    def test_plan_survives_a_concurrent_clear(self):
+        class ClearedAtOnce(dict):
+            # Another thread empties the cache right after every store
+            def __setitem__(self, key, value):
+                pass
+
+        with mock.patch.object(FlatListMixin, '_flat_plans', ClearedAtOnce()):
+            self.assert_identical(self.admin, '/api/users/?fields=id,username')
@@ -0,0 +1,108 @@
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, TokenError
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .models import User
+
+
+# --- Cache-backed refresh token blacklist ---
+# Each blacklisted jti is a cache key that expires with the token itself, so
+# the store never holds more than the refresh tokens still inside their
+# lifetime and needs no pruning job. Revoking every token of a user is a
+# single "cutoff" key: any refresh token issued at or before it is rejected.
+
+def _cache():
+    return caches[getattr(settings, 'JWT_BLACKLIST_CACHE', 'default')]
+
+
+def _jti_key(jti):
+    return f'jwt:blacklist:{jti}'
+
+
+def _cutoff_key(user_id):
+    return f'jwt:cutoff:{user_id}'
+
+
+def blacklist_jti(jti, exp):
+    """Blacklist one token until its `exp` timestamp."""
+    ttl = int(exp - time.time())
+    if ttl > 0:
+        _cache().set(_jti_key(jti), 1, timeout=ttl)
+
+
+def revoke_user_tokens(user_id):
+    """Reject every refresh token issued to `user_id` up to now."""
+    lifetime = api_settings.REFRESH_TOKEN_LIFETIME.total_seconds()
+    _cache().set(_cutoff_key(user_id), int(time.time()), timeout=int(lifetime) + 1)
+
+
+def is_revoked(payload):
+    jti = payload[api_settings.JTI_CLAIM]
+    user_id = payload.get(api_settings.USER_ID_CLAIM)
+    found = _cache().get_many([_jti_key(jti), _cutoff_key(user_id)])
+
+    if _jti_key(jti) in found:
+        return True
+    cutoff = found.get(_cutoff_key(user_id))
+    return cutoff is not None and payload.get('iat', 0) <= cutoff
+
+
+class CachedBlacklistRefreshToken(RefreshToken):
+    """Refresh token checked against the cache blacklist on every use."""
+
+    def verify(self, *args, **kwargs):
+        self.check_blacklist()
+        super().verify(*args, **kwargs)
+
+    def check_blacklist(self):
+        if is_revoked(self.payload):
+            raise TokenError('Token is blacklisted')
+
+    def blacklist(self):
+        blacklist_jti(self.payload[api_settings.JTI_CLAIM], self.payload['exp'])
+
+
+def set_user_claims(token, user):
+    """Embed the claims ClaimsJWTAuthentication builds its request user from."""
+    token['username'] = user.username
+    token['email'] = user.email
+    token['role'] = user.role
+    token['college_id'] = user.college_id
+    token['branch_id'] = user.branch_id
+    token['is_superuser'] = user.is_superuser
+
+
+class CachedBlacklistTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh that re-reads the user's claims instead of copying the old token's.
+
+    simplejwt copies every claim of the refresh token into the new pair, so a
+    demoted or transferred user would keep their old scope for as long as
+    they kept rotating.
+    """
+    token_class = CachedBlacklistRefreshToken
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs['refresh'])
+
+        user_id = refresh.payload.get(api_settings.USER_ID_CLAIM)
+        user = User.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+        if user is None or not api_settings.USER_AUTHENTICATION_RULE(user):
+            raise AuthenticationFailed(self.error_messages['no_active_account'], 'no_active_account')
+        set_user_claims(refresh, user)
+
+        data = {'access': str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                refresh.blacklist()
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            data['refresh'] = str(refresh)
+
+        return data
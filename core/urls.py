@@ -19,10 +19,16 @@ urlpatterns = [
 
     # Complaints
     path('complaints/', ComplaintListCreateAPI.as_view(), name='complaint_list_create'),
+    path('complaints/export/', ComplaintExportAPI.as_view(), name='complaint_export'),
+    path('complaints/search/', ComplaintSearchAPI.as_view(), name='complaint_search'),
     path('complaints/<int:pk>/', ComplaintDetailAPI.as_view(), name='complaint_detail'),
+    path('complaints/<int:pk>/feedback/', ComplaintFeedbackAPI.as_view(), name='complaint_feedback'),
+    path('stats/', ComplaintStatsAPI.as_view(), name='complaint_stats'),
+    path('stats/timeseries/', ComplaintTimeseriesAPI.as_view(), name='complaint_timeseries'),
 
     # Students Management
     path('students/', StudentListAPI.as_view(), name='student_list'),
+    path('students/bulk/', StudentBulkOnboardAPI.as_view(), name='student_bulk_onboard'),
     path('students/<int:pk>/', StudentDetailAPI.as_view(), name='student_detail'),
     path('students/<int:pk>/suspend/', SuspendStudentAPI.as_view(), name='student_suspend'),
     path('students/<int:pk>/unsuspend/', UnsuspendStudentAPI.as_view(), name='student_unsuspend'),
@@ -32,6 +38,9 @@ urlpatterns = [
 
     # News
     path('news/', NewsListCreateAPI.as_view(), name='news_list_create'),
+
+    # Mobile delta sync
+    path('sync/', SyncAPI.as_view(), name='sync'),
 ]
 
 urlpatterns += router.urls
@@ -0,0 +1,47 @@
+from collections import defaultdict
+
+from django.core.mail import get_connection
+
+from core.models import Complaint, User
+from core.utils.email_utils import build_digest_email
+
+
+def build_digests(since):
+    """Build one digest email per opted-in principal/squad member.
+
+    Runs one query for the recipients and one query per college that has
+    recipients; each college's complaints are then split per recipient in memory.
+    """
+    recipients = defaultdict(list)
+    for user in (User.objects.filter(role__in=('principal', 'squad'), email_delivery='digest',
+                                     is_active=True, college__isnull=False)
+                 .exclude(email='').exclude(email__isnull=True)):
+        recipients[user.college_id].append(user)
+
+    messages = []
+    for college_id, users in recipients.items():
+        complaints = list(
+            Complaint.objects.filter(college_id=college_id, updated_at__gte=since)
+            .select_related('branch', 'assigned_to')
+            .order_by('-updated_at', '-id')
+        )
+        if not complaints:
+            continue
+        for user in users:
+            if user.role == 'principal':
+                events = complaints
+            else:
+                events = [c for c in complaints if c.assigned_to_id == user.id]
+            message = build_digest_email(user, events, since)
+            if message is not None:
+                messages.append(message)
+    return messages
+
+
+def send_digests(since, connection=None):
+    """Send every digest over a single mail connection; returns the number sent."""
+    messages = build_digests(since)
+    if not messages:
+        return 0
+    connection = connection or get_connection(fail_silently=False)
+    return connection.send_messages(messages) or 0
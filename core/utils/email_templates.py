@@ -0,0 +1,301 @@
+"""Email template registry.
+
+Every email is compiled once when this module is imported (see CoreConfig.ready):
+the HTML body is validated and its plain-text rendition is produced with a
+single `strip_tags` pass over the template, instead of over every rendered
+message. Rendering is then two `str.format_map` calls.
+
+User-supplied values are HTML-escaped in the HTML part and left as-is in the
+plain-text part. Pre-built markup (e.g. optional paragraphs) is passed as a
+`Fragment`, which carries its own HTML and plain-text forms.
+"""
+from string import Formatter
+
+from django.utils.html import conditional_escape, strip_tags
+
+
+class Fragment:
+    """Trusted markup inserted verbatim into the HTML part and stripped for the text part."""
+    __slots__ = ('html', 'text')
+
+    def __init__(self, html, text=None):
+        self.html = html
+        self.text = strip_tags(html) if text is None else text
+
+    @classmethod
+    def join(cls, fragments):
+        fragments = list(fragments)
+        return cls(''.join(f.html for f in fragments), ''.join(f.text for f in fragments))
+
+
+EMPTY = Fragment('')
+
+
+class EmailTemplate:
+    def __init__(self, subject, html, text=None):
+        self.subject = subject
+        self.html = html
+        self.text = strip_tags(html) if text is None else text
+        # Parsing up front turns a stray brace into an import-time error
+        # rather than a failed send.
+        self.fields = frozenset(
+            name for template in (subject, html) for _, name, _, _ in Formatter().parse(template) if name
+        )
+
+    def render_fragment(self, **context):
+        """Render the body only, for embedding in another template."""
+        _, text, html = self.render(**context)
+        return Fragment(html, text)
+
+    def render(self, **context):
+        """Return (subject, plain_text, html) for the given context."""
+        html_context = {}
+        text_context = {}
+        for key, value in context.items():
+            if isinstance(value, Fragment):
+                html_context[key] = value.html
+                text_context[key] = value.text
+            else:
+                html_context[key] = conditional_escape(value)
+                text_context[key] = value
+        return (
+            self.subject.format_map(text_context),
+            self.text.format_map(text_context),
+            self.html.format_map(html_context),
+        )
+
+
+COMPLAINT_SUBMITTED_HTML = """
+    <html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 10px;">
+            <h2 style="color: #2563eb; text-align: center;">🛡️ Guardian Portal</h2>
+            <h3 style="color: #16a34a;">Complaint Submitted Successfully</h3>
+            <p>Dear {username},</p>
+            <p>Your complaint has been successfully submitted and is being reviewed.</p>
+            <div style="background: #f3f4f6; padding: 15px; border-radius: 8px; margin: 20px 0;">
+                <p><strong>Complaint ID:</strong> #{complaint_id}</p>
+                <p><strong>Title:</strong> {title}</p>
+                <p><strong>Status:</strong> <span style="color: #f59e0b;">Pending</span></p>
+                <p><strong>Submitted:</strong> {submitted_at}</p>
+            </div>
+            <p><strong>What happens next?</strong></p>
+            <ul>
+                <li>Your complaint will be reviewed within 24 hours</li>
+                <li>It will be assigned to a squad member for investigation</li>
+                <li>You'll receive email updates on status changes</li>
+                <li>Track your complaint anytime in the dashboard</li>
+            </ul>
+            <p style="margin-top: 30px;">
+                <a href="{frontend_url}/student/complaint/{complaint_id}" style="background: #2563eb; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block;">
+                    View Complaint Details
+                </a>
+            </p>
+            <hr style="margin: 30px 0; border: none; border-top: 1px solid #ddd;">
+            <p style="font-size: 12px; color: #666; text-align: center;">
+                This is an automated email from Guardian Anti-Ragging Portal.<br>
+                Please do not reply to this email.
+            </p>
+        </div>
+    </body>
+    </html>
+"""
+
+
+COMPLAINT_STATUS_UPDATE_HTML = """
+    <html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 10px;">
+            <h2 style="color: #2563eb; text-align: center;">🛡️ Guardian Portal</h2>
+            <h3 style="color: {status_color};">Complaint Status Updated</h3>
+            <p>Dear {username},</p>
+            <p>{status_message}</p>
+            <div style="background: #f3f4f6; padding: 15px; border-radius: 8px; margin: 20px 0;">
+                <p><strong>Complaint ID:</strong> #{complaint_id}</p>
+                <p><strong>Title:</strong> {title}</p>
+                <p><strong>Previous Status:</strong> <span style="color: {old_status_color};">{old_status_display}</span></p>
+                <p><strong>New Status:</strong> <span style="color: {status_color};">{status_display}</span></p>
+            </div>
+            {feedback_prompt}
+            <p style="margin-top: 30px;">
+                <a href="{frontend_url}/student/complaint/{complaint_id}" style="background: #2563eb; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block;">
+                    View Complaint Details
+                </a>
+            </p>
+            <hr style="margin: 30px 0; border: none; border-top: 1px solid #ddd;">
+            <p style="font-size: 12px; color: #666; text-align: center;">
+                This is an automated email from Guardian Anti-Ragging Portal.<br>
+                Please do not reply to this email.
+            </p>
+        </div>
+    </body>
+    </html>
+"""
+
+
+COMPLAINT_ASSIGNED_HTML = """
+    <html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 10px;">
+            <h2 style="color: #2563eb; text-align: center;">🛡️ Guardian Portal</h2>
+            <h3 style="color: #f59e0b;">New Complaint Assigned to You</h3>
+            <p>Dear {username},</p>
+            <p>A new complaint has been assigned to you for investigation.</p>
+            <div style="background: #f3f4f6; padding: 15px; border-radius: 8px; margin: 20px 0;">
+                <p><strong>Complaint ID:</strong> #{complaint_id}</p>
+                <p><strong>Title:</strong> {title}</p>
+                <p><strong>Description:</strong> {description_preview}...</p>
+                <p><strong>Submitted By:</strong> {student_name}</p>
+                <p><strong>Anonymous:</strong> {anonymous_status}</p>
+                <p><strong>Status:</strong> <span style="color: #3b82f6;">In Progress</span></p>
+                <p><strong>Assigned:</strong> {assigned_at}</p>
+            </div>
+            <p><strong>Action Required:</strong></p>
+            <ul>
+                <li>Review the complaint details carefully</li>
+                <li>Investigate the matter thoroughly</li>
+                <li>Update the status as you progress</li>
+                <li>Maintain confidentiality if complaint is anonymous</li>
+            </ul>
+            <p style="margin-top: 30px;">
+                <a href="{frontend_url}/squad/complaint/{complaint_id}" style="background: #2563eb; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block;">
+                    View & Handle Complaint
+                </a>
+            </p>
+            <hr style="margin: 30px 0; border: none; border-top: 1px solid #ddd;">
+            <p style="font-size: 12px; color: #666; text-align: center;">
+                This is an automated email from Guardian Anti-Ragging Portal.<br>
+                Please do not reply to this email.
+            </p>
+        </div>
+    </body>
+    </html>
+"""
+
+
+WELCOME_HTML = """
+    <html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 10px; background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);">
+            <div style="background: white; padding: 30px; border-radius: 8px;">
+                <h2 style="color: #2563eb; text-align: center; margin-bottom: 10px;">🛡️ Guardian Portal</h2>
+                <h3 style="color: #16a34a; text-align: center; margin-top: 0;">Welcome Aboard!</h3>
+                <p style="font-size: 16px;">Dear <strong>{username}</strong>,</p>
+                <p>🎉 Welcome to <strong>Guardian Portal</strong> - Your trusted platform for reporting and preventing ragging incidents!</p>
+                <div style="background: #f3f4f6; padding: 20px; border-radius: 8px; margin: 25px 0; border-left: 4px solid #2563eb;">
+                    <h4 style="margin-top: 0; color: #2563eb;">📋 Your Account Details:</h4>
+                    <p style="margin: 8px 0;"><strong>👤 Username:</strong> {username}</p>
+                    <p style="margin: 8px 0;"><strong>📧 Email:</strong> {email}</p>
+                    <p style="margin: 8px 0;"><strong>🎭 Role:</strong> <span style="background: {role_bg}; color: {role_text}; padding: 4px 12px; border-radius: 12px; font-weight: bold;">{role_display}</span></p>
+                    <p style="margin: 8px 0;"><strong>🏫 College:</strong> {college_name}</p>
+                </div>
+                <div style="background: #ecfdf5; padding: 20px; border-radius: 8px; margin: 25px 0; border-left: 4px solid #16a34a;">
+                    <h4 style="margin-top: 0; color: #16a34a;">✨ What You Can Do:</h4>
+                    <ul style="margin: 10px 0; padding-left: 20px;">
+                        {role_item}
+                        <li style="margin: 8px 0;">📊 Track complaint status in <strong>real-time</strong></li>
+                        <li style="margin: 8px 0;">📧 Receive <strong>email notifications</strong> on all updates</li>
+                        <li style="margin: 8px 0;">💬 Provide feedback once complaints are resolved</li>
+                        <li style="margin: 8px 0;">🔒 Your privacy and safety are <strong>guaranteed</strong></li>
+                    </ul>
+                </div>
+                <div style="text-align: center; margin: 30px 0;">
+                    <a href="{frontend_url}/login" style="background: linear-gradient(135deg, #667eea 0%, #764ba2 100%); color: white; padding: 14px 32px; text-decoration: none; border-radius: 8px; display: inline-block; font-weight: bold; font-size: 16px; box-shadow: 0 4px 6px rgba(0,0,0,0.1);">
+                        🚀 Login to Dashboard
+                    </a>
+                </div>
+                <div style="background: #fef3c7; padding: 15px; border-radius: 8px; margin: 25px 0; border-left: 4px solid #f59e0b;">
+                    <p style="margin: 0; color: #92400e;">
+                        <strong>🔐 Security Tip:</strong> Keep your login credentials secure and never share them with anyone.
+                    </p>
+                </div>
+                <hr style="margin: 30px 0; border: none; border-top: 1px solid #ddd;">
+                <div style="text-align: center;">
+                    <p style="font-size: 14px; color: #666; margin: 5px 0;">
+                        Need help? Contact your college administrator
+                    </p>
+                    <p style="font-size: 12px; color: #999; margin: 15px 0;">
+                        This is an automated email from Guardian Anti-Ragging Portal.<br>
+                        Please do not reply to this email.
+                    </p>
+                    <p style="font-size: 12px; color: #2563eb; margin: 5px 0;">
+                        <strong>Your safety is our priority! 🛡️</strong>
+                    </p>
+                </div>
+            </div>
+        </div>
+    </body>
+    </html>
+"""
+
+
+DIGEST_HTML = """
+    <html>
+    <body style="font-family: Arial, sans-serif; line-height: 1.6; color: #333;">
+        <div style="max-width: 600px; margin: 0 auto; padding: 20px; border: 1px solid #ddd; border-radius: 10px;">
+            <h2 style="color: #2563eb; text-align: center;">🛡️ Guardian Portal</h2>
+            <h3 style="color: #2563eb;">Your Complaint Digest</h3>
+            <p>Dear {username},</p>
+            <p>Here is what happened to {scope} since {since}.</p>
+            <div style="background: #f3f4f6; padding: 15px; border-radius: 8px; margin: 20px 0;">
+                <p><strong>New complaints:</strong> {new_count}</p>
+                <p><strong>Updated complaints:</strong> {updated_count}</p>
+            </div>
+            <table style="width: 100%; border-collapse: collapse; font-size: 14px;">
+                <tr style="text-align: left; border-bottom: 1px solid #ddd;">
+                    <th>#</th><th>Title</th><th>Branch</th><th>Status</th><th>Assigned To</th>
+                </tr>
+{rows}
+            </table>
+            <p style="margin-top: 30px;">
+                <a href="{frontend_url}/login" style="background: #2563eb; color: white; padding: 12px 24px; text-decoration: none; border-radius: 6px; display: inline-block;">
+                    Open Dashboard
+                </a>
+            </p>
+            <hr style="margin: 30px 0; border: none; border-top: 1px solid #ddd;">
+            <p style="font-size: 12px; color: #666; text-align: center;">
+                You are receiving a daily digest instead of one email per event. To get immediate emails again, ask your administrator to switch your email delivery setting back.<br>
+                This is an automated email from Guardian Anti-Ragging Portal.
+            </p>
+        </div>
+    </body>
+    </html>
+"""
+
+
+DIGEST_ROW_HTML = """                <tr style="border-bottom: 1px solid #eee;">
+                    <td>{complaint_id}</td><td>{label} {title}</td><td>{branch}</td><td>{status_display}</td><td>{assigned_to}</td>
+                </tr>
+"""
+
+
+TEMPLATES = {
+    'complaint_submitted': EmailTemplate(
+        'Complaint Submitted Successfully - #{complaint_id}', COMPLAINT_SUBMITTED_HTML),
+    'complaint_status_update': EmailTemplate(
+        'Complaint Status Updated - #{complaint_id}', COMPLAINT_STATUS_UPDATE_HTML),
+    'complaint_assigned': EmailTemplate(
+        'New Complaint Assigned - #{complaint_id}', COMPLAINT_ASSIGNED_HTML),
+    'welcome': EmailTemplate(
+        '🛡️ Welcome to Guardian Portal - {role_display}!', WELCOME_HTML),
+    'digest': EmailTemplate(
+        'Complaint Digest - {new_count} new, {updated_count} updated', DIGEST_HTML),
+    'digest_row': EmailTemplate(
+        '', DIGEST_ROW_HTML,
+        text='  #{complaint_id} {label} {title} | {branch} | {status_display} | {assigned_to}\n'),
+}
+
+FEEDBACK_PROMPT = Fragment(
+    '<p><strong>Action Required:</strong> Please provide feedback on the resolution of your complaint.</p>')
+
+ROLE_ITEMS = {
+    'student': Fragment('<li style="margin: 8px 0;">📝 Submit complaints <strong>anonymously</strong> or with your identity</li>'),
+    'principal': Fragment('<li style="margin: 8px 0;">👁️ View and manage all complaints from your college</li>'),
+    'squad': Fragment('<li style="margin: 8px 0;">🔍 Investigate and resolve assigned complaints</li>'),
+    'admin': Fragment('<li style="margin: 8px 0;">⚙️ Manage system-wide settings and users</li>'),
+}
+
+
+def render(name, **context):
+    """Render a registered email; returns (subject, plain_text, html)."""
+    return TEMPLATES[name].render(**context)
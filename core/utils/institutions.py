@@ -0,0 +1,174 @@
+from itertools import islice
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.models import Branch, College, TableVersion
+
+COLLEGE_TYPES = {value for value, _ in College.COLLEGE_TYPE_CHOICES}
+
+
+class InvalidRow(ValueError):
+    pass
+
+
+def parse_row(row):
+    """Normalise one import row into (college_key, address, branch).
+
+    `row` is a dict with `college`, `college_type` and optionally `address`,
+    `branch` and `branch_code` (CSV columns or JSONL keys). `branch` is None
+    for rows that only describe a college.
+    """
+    name = (row.get('college') or '').strip()
+    college_type = (row.get('college_type') or '').strip().lower()
+    if not name:
+        raise InvalidRow('missing college name')
+    if college_type not in COLLEGE_TYPES:
+        raise InvalidRow(f'unknown college_type {college_type!r}')
+
+    address = (row.get('address') or '').strip() or None
+    branch_name = (row.get('branch') or '').strip()
+    branch_code = (row.get('branch_code') or '').strip() or None
+    branch = (branch_name, branch_code) if branch_name else None
+    return (name, college_type), address, branch
+
+
+def _branch_key(college_id, name, code):
+    # Branches are identified by code within their college, by name when they have none
+    return (college_id, 'code', code) if code else (college_id, 'name', name)
+
+
+def _update_rows(model, fields, values):
+    """Set columns on many rows from (*values, pk) tuples in a single executemany.
+
+    bulk_update() builds a CASE expression per row, which dominates the
+    runtime of an import that touches thousands of rows.
+    """
+    if not values:
+        return
+    qn = connection.ops.quote_name
+    assignments = ', '.join(f"{qn(field)} = %s" for field in fields)
+    sql = f"UPDATE {qn(model._meta.db_table)} SET {assignments} WHERE {qn('id')} = %s"
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, values)
+
+
+def _insert_branches(rows):
+    """INSERT (college_id, name, code) rows with one executemany.
+
+    Same reason as _update_rows: bulk_create() compiles every object
+    field by field, and branch ids are never needed afterwards.
+    """
+    if not rows:
+        return
+    qn = connection.ops.quote_name
+    created_at = connection.ops.adapt_datetimefield_value(timezone.now())
+    columns = ', '.join(qn(column) for column in ('college_id', 'name', 'code', 'created_at'))
+    sql = f"INSERT INTO {qn(Branch._meta.db_table)} ({columns}) VALUES (%s, %s, %s, %s)"
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, [(*row, created_at) for row in rows])
+
+
+def _upsert_batch(rows, stats):
+    colleges = {}   # (name, type) -> address, None meaning "leave as is"
+    branches = {}   # (college key, name, code), last row wins
+    for college_key, address, branch in rows:
+        if address is not None or college_key not in colleges:
+            colleges[college_key] = address
+        if branch is not None:
+            name, code = branch
+            branches[_branch_key(college_key, name, code)] = (college_key, name, code)
+
+    with transaction.atomic():
+        # --- Colleges ---
+        existing = {}  # (name, type) -> [id, address]
+        for pk, name, college_type, address in (
+            College.objects.filter(name__in={name for name, _ in colleges})
+            .order_by('-id').values_list('id', 'name', 'college_type', 'address')
+        ):
+            existing[name, college_type] = [pk, address]  # lowest id wins
+
+        to_create, to_update = [], []
+        for key, address in colleges.items():
+            current = existing.get(key)
+            if current is None:
+                to_create.append(College(name=key[0], college_type=key[1], address=address))
+            elif address is not None and current[1] != address:
+                to_update.append((address, current[0]))
+            else:
+                stats['colleges_unchanged'] += 1
+        College.objects.bulk_create(to_create)
+        _update_rows(College, ('address',), to_update)
+        stats['colleges_inserted'] += len(to_create)
+        stats['colleges_updated'] += len(to_update)
+        if to_create or to_update:
+            # Bulk writes send no signals, so bump the catalog ETag here
+            TableVersion.bump('college')
+        for college in to_create:
+            existing[college.name, college.college_type] = [college.id, college.address]
+
+        # --- Branches ---
+        college_ids = {existing[key][0] for key, _, _ in branches.values()}
+        current = {}  # branch key -> (id, name, code)
+        uncoded = {}  # (college id, name) -> (id, name, code) of branches without a code
+        for pk, college_id, name, code in (
+            Branch.objects.filter(college_id__in=college_ids)
+            .order_by('-id').values_list('id', 'college_id', 'name', 'code')
+        ):
+            current[_branch_key(college_id, name, code)] = (pk, name, code)
+            current[_branch_key(college_id, name, None)] = (pk, name, code)
+            if not code:
+                uncoded[college_id, name] = (pk, name, code)
+
+        to_create, to_update = [], []
+        for college_key, name, code in branches.values():
+            college_id = existing[college_key][0]
+            branch = current.get(_branch_key(college_id, name, code))
+            if branch is None and code:
+                # A branch created before codes were known gets the code now
+                branch = uncoded.pop((college_id, name), None)
+            if branch is None:
+                to_create.append((college_id, name, code))
+            elif branch[1] != name or (code and branch[2] != code):
+                to_update.append((name, code or branch[2], branch[0]))
+            else:
+                stats['branches_unchanged'] += 1
+        _insert_branches(to_create)
+        _update_rows(Branch, ('name', 'code'), to_update)
+        stats['branches_inserted'] += len(to_create)
+        stats['branches_updated'] += len(to_update)
+        if to_create or to_update:
+            TableVersion.bump('branch')
+
+
+def import_institutions(rows, batch_size=2000, on_error=None):
+    """Upsert colleges and branches from an iterable of row dicts.
+
+    File readers yield (line, row) pairs instead, so errors point at the
+    source line, and pass an InvalidRow in place of a row they could not
+    build. Rows are processed in batches of `batch_size`, each in its own
+    transaction with a constant number of queries, so re-running an import
+    only updates what changed. Invalid rows are skipped and passed to
+    `on_error(line, message)`. Returns inserted/updated/unchanged counts.
+    """
+    stats = dict.fromkeys([
+        'colleges_inserted', 'colleges_updated', 'colleges_unchanged',
+        'branches_inserted', 'branches_updated', 'branches_unchanged', 'invalid',
+    ], 0)
+
+    def parsed():
+        for position, item in enumerate(rows, start=1):
+            line, row = item if isinstance(item, tuple) else (position, item)
+            try:
+                if isinstance(row, InvalidRow):
+                    raise row
+                yield parse_row(row)
+            except InvalidRow as e:
+                stats['invalid'] += 1
+                if on_error is not None:
+                    on_error(line, str(e))
+
+    iterator = parsed()
+    while batch := list(islice(iterator, batch_size)):
+        _upsert_batch(batch, stats)
+    return stats
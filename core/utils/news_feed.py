@@ -0,0 +1,57 @@
+import time
+import uuid
+
+from django.conf import settings
+from django.core.cache import cache
+
+VERSION_KEY = 'news:version'
+FEED_TIMEOUT = getattr(settings, 'NEWS_FEED_CACHE_TIMEOUT', 600)
+# How long a request waits for another one that is already rebuilding the feed
+LOCK_TIMEOUT = 10
+WAIT_STEP = 0.05
+WAIT_MAX = 2.0
+
+
+def feed_version():
+    version = cache.get(VERSION_KEY)
+    if version is None:
+        # Evicted or never set: any fresh token works, older feed keys just go unused
+        cache.add(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(VERSION_KEY)
+    return version
+
+
+def bump_news_version():
+    """Invalidate every cached feed at once by moving them all to a new key."""
+    cache.set(VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def cached_feed(scope, build):
+    """Return the feed for `scope` ('all', 'global' or 'college:<id>') from the cache.
+
+    On a miss only one request runs `build()`; the others wait up to WAIT_MAX
+    seconds for its result instead of all querying the database at once,
+    then fall back to building it themselves.
+    """
+    key = f'news:feed:{feed_version()}:{scope}'
+    feed = cache.get(key)
+    if feed is not None:
+        return feed
+
+    lock_key = f'{key}:lock'
+    if cache.add(lock_key, 1, timeout=LOCK_TIMEOUT):
+        try:
+            feed = build()
+            cache.set(key, feed, timeout=FEED_TIMEOUT)
+        finally:
+            cache.delete(lock_key)
+        return feed
+
+    waited = 0.0
+    while waited < WAIT_MAX:
+        time.sleep(WAIT_STEP)
+        waited += WAIT_STEP
+        feed = cache.get(key)
+        if feed is not None:
+            return feed
+    return build()
@@ -0,0 +1,150 @@
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import django
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.core.validators import validate_email
+from django.db import transaction
+from django.db.models import Q
+
+from core.models import Branch, EmailOutbox, User
+
+USERNAME_RE = re.compile(r'^[a-zA-Z0-9_]{3,150}$')
+# Column sizes, so an oversized value is a row error rather than a DataError on insert
+PHONE_MAX_LENGTH = User._meta.get_field('phone').max_length
+EMAIL_MAX_LENGTH = User._meta.get_field('email').max_length
+ROLL_NUMBER_MAX_LENGTH = User._meta.get_field('roll_number').max_length
+INSERT_BATCH_SIZE = 1000
+# Below this many passwords a process pool costs more to start than it saves
+MIN_PARALLEL_HASHES = 64
+
+
+def _text(row, field):
+    # JSON rosters may carry numbers (e.g. a phone) where CSV has strings
+    value = row.get(field)
+    return '' if value is None else str(value).strip()
+
+
+def validate_roster(rows, college):
+    """Check roster rows in memory against the same rules as RegisterSerializer.
+
+    `rows` are dicts with `username`, `email`, `phone`, `password` and
+    optionally `branch` (code, name or id within `college`) and
+    `roll_number`. Returns (students, errors): unsaved User objects for the
+    valid rows and (line, field, message) tuples for the rest, with field
+    'non_field_errors' for a row that is not a dict. Uniqueness is
+    checked against the database with one query for the whole roster, and
+    between rows of the roster itself.
+    """
+    branches = {}
+    for branch in Branch.objects.filter(college=college).order_by('-id'):
+        for key in (str(branch.id), branch.name.casefold(), (branch.code or '').casefold()):
+            if key:
+                branches[key] = branch
+
+    parsed, errors = [], []
+    for line, row in enumerate(rows, start=1):
+        if not isinstance(row, dict):
+            errors.append((line, 'non_field_errors', 'Expected an object with the student fields'))
+            continue
+        username = _text(row, 'username')
+        email = _text(row, 'email')
+        phone = _text(row, 'phone')
+        password = '' if row.get('password') is None else str(row['password'])
+        branch_ref = _text(row, 'branch')
+        roll_number = _text(row, 'roll_number')
+
+        row_errors = []
+        if not USERNAME_RE.match(username):
+            row_errors.append(('username', 'At least 3 letters, numbers or underscores'))
+        try:
+            validate_email(email)
+        except ValidationError:
+            row_errors.append(('email', 'Enter a valid email address'))
+        else:
+            if len(email) > EMAIL_MAX_LENGTH:
+                row_errors.append(('email', f'Email must be at most {EMAIL_MAX_LENGTH} characters'))
+        if not (phone.isascii() and phone.isdigit() and 10 <= len(phone) <= PHONE_MAX_LENGTH):
+            row_errors.append(('phone', f'Phone number must be 10 to {PHONE_MAX_LENGTH} digits'))
+        if len(roll_number) > ROLL_NUMBER_MAX_LENGTH:
+            row_errors.append(('roll_number', f'Roll number must be at most {ROLL_NUMBER_MAX_LENGTH} characters'))
+        if len(password) < 8:
+            row_errors.append(('password', 'Password must be at least 8 characters long'))
+        branch = branches.get(branch_ref.casefold()) if branch_ref else None
+        if branch_ref and branch is None:
+            row_errors.append(('branch', f'No branch {branch_ref!r} in {college.name}'))
+
+        if row_errors:
+            errors += [(line, field, message) for field, message in row_errors]
+            continue
+        parsed.append((line, User(
+            username=username,
+            email=email,
+            phone=phone,
+            # bulk_create() skips User.save(), so the login keys are set here
+            email_key=User.normalize_email_key(email),
+            phone_key=User.normalize_phone_key(phone),
+            role='student',
+            college=college,
+            branch=branch,
+            roll_number=roll_number or None,
+            password=password,
+        )))
+
+    taken = {'username': set(), 'email': set(), 'phone': set()}
+    for username, email_key, phone_key in User.objects.filter(
+        Q(username__in=[u.username for _, u in parsed])
+        | Q(email_key__in=[u.email_key for _, u in parsed])
+        | Q(phone_key__in=[u.phone_key for _, u in parsed])
+    ).values_list('username', 'email_key', 'phone_key'):
+        taken['username'].add(username)
+        taken['email'].add(email_key)
+        taken['phone'].add(phone_key)
+
+    students = []
+    for line, user in parsed:
+        keys = {'username': user.username, 'email': user.email_key, 'phone': user.phone_key}
+        clashes = [field for field, key in keys.items() if key in taken[field]]
+        if clashes:
+            errors += [(line, field, f'This {field} is already registered') for field in clashes]
+            continue
+        for field, key in keys.items():
+            taken[field].add(key)
+        students.append(user)
+    return students, errors
+
+
+def hash_passwords(passwords, workers=None):
+    """make_password() for every password, spread over a process pool.
+
+    Password hashing is CPU-bound and holds the GIL, so threads would not
+    help; each worker process hashes a contiguous chunk.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(passwords) < MIN_PARALLEL_HASHES:
+        return [make_password(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers, initializer=django.setup) as pool:
+        return list(pool.map(make_password, passwords, chunksize=chunksize))
+
+
+def onboard_students(students, workers=None):
+    """Hash, insert and queue welcome emails for validated students.
+
+    Everything is inserted in one transaction, so a roster is either fully
+    onboarded or not at all.
+    """
+    hashes = hash_passwords([student.password for student in students], workers=workers)
+    for student, hashed in zip(students, hashes):
+        student.password = hashed
+
+    with transaction.atomic():
+        created = User.objects.bulk_create(students, batch_size=INSERT_BATCH_SIZE)
+        # 📧 QUEUE WELCOME EMAILS
+        EmailOutbox.objects.bulk_create(
+            [EmailOutbox(kind='welcome', payload={'user_id': user.id}) for user in created],
+            batch_size=INSERT_BATCH_SIZE,
+        )
+    return created
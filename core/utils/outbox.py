@@ -0,0 +1,146 @@
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import get_connection
+from django.db import transaction
+from django.utils import timezone
+
+from core.models import Complaint, EmailOutbox, User
+from core.utils.email_utils import (
+    build_complaint_submitted_email,
+    build_complaint_status_update_email,
+    build_complaint_assigned_email,
+    build_welcome_email,
+)
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = getattr(settings, 'EMAIL_OUTBOX_BATCH_SIZE', 100)
+MAX_ATTEMPTS = getattr(settings, 'EMAIL_OUTBOX_MAX_ATTEMPTS', 5)
+RETRY_BASE_SECONDS = getattr(settings, 'EMAIL_OUTBOX_RETRY_BASE_SECONDS', 60)
+RETRY_MAX_SECONDS = getattr(settings, 'EMAIL_OUTBOX_RETRY_MAX_SECONDS', 6 * 60 * 60)
+
+
+# --- Enqueue (request path) ---
+def enqueue_email(kind, **payload):
+    """Queue an email for background delivery.
+
+    Call this inside the same `transaction.atomic()` block as the change that
+    triggers the email, so the two commit or roll back together.
+    """
+    return EmailOutbox.objects.create(kind=kind, payload=payload)
+
+
+# --- Build (worker) ---
+def _load_related(entries):
+    """Fetch every complaint/user referenced by a batch with one query per model."""
+    complaint_ids = {e.payload['complaint_id'] for e in entries if 'complaint_id' in e.payload}
+    user_ids = {e.payload['user_id'] for e in entries if 'user_id' in e.payload}
+    return {
+        'complaint': Complaint.objects.select_related('student', 'assigned_to', 'college').in_bulk(complaint_ids),
+        'user': User.objects.select_related('college').in_bulk(user_ids),
+    }
+
+
+def _build_complaint_submitted(payload, related):
+    return build_complaint_submitted_email(related['complaint'][payload['complaint_id']])
+
+
+def _build_complaint_status_update(payload, related):
+    return build_complaint_status_update_email(related['complaint'][payload['complaint_id']], payload['old_status'])
+
+
+def _build_complaint_assigned(payload, related):
+    return build_complaint_assigned_email(related['complaint'][payload['complaint_id']])
+
+
+def _build_welcome(payload, related):
+    return build_welcome_email(related['user'][payload['user_id']])
+
+
+BUILDERS = {
+    'complaint_submitted': _build_complaint_submitted,
+    'complaint_status_update': _build_complaint_status_update,
+    'complaint_assigned': _build_complaint_assigned,
+    'welcome': _build_welcome,
+}
+
+
+def build_message(entry, related=None):
+    """Return the EmailMessage for an outbox entry, or None if there is nothing to send."""
+    if related is None:
+        related = _load_related([entry])
+    try:
+        return BUILDERS[entry.kind](entry.payload, related)
+    except KeyError:
+        # The complaint/user was deleted before the worker got to it
+        return None
+
+
+def retry_delay(attempts):
+    """Exponential backoff: base, 2*base, 4*base, ... capped at RETRY_MAX_SECONDS."""
+    return timedelta(seconds=min(RETRY_BASE_SECONDS * 2 ** (attempts - 1), RETRY_MAX_SECONDS))
+
+
+# --- Deliver (worker) ---
+def _deliver_batch(connection, batch_size):
+    with transaction.atomic():
+        # skip_locked lets several workers drain the outbox concurrently on
+        # backends that support it; it is ignored on SQLite.
+        entries = list(
+            EmailOutbox.objects.select_for_update(skip_locked=True)
+            .filter(status='pending', next_attempt_at__lte=timezone.now())
+            .order_by('next_attempt_at', 'id')[:batch_size]
+        )
+        related = _load_related(entries)
+        stats = {'sent': 0, 'skipped': 0, 'retried': 0, 'dead': 0}
+
+        for entry in entries:
+            entry.attempts += 1
+            try:
+                message = build_message(entry, related)
+                if message is None:
+                    entry.status = 'skipped'
+                else:
+                    message.connection = connection
+                    connection.send_messages([message])
+                    entry.status = 'sent'
+                    entry.sent_at = timezone.now()
+                entry.last_error = ''
+            except Exception as e:
+                entry.last_error = f"{type(e).__name__}: {e}"
+                if entry.attempts >= MAX_ATTEMPTS:
+                    entry.status = 'dead'
+                    logger.error(f"❌ Outbox email #{entry.id} dead-lettered after {entry.attempts} attempts: {e}")
+                else:
+                    entry.next_attempt_at = timezone.now() + retry_delay(entry.attempts)
+                    logger.warning(f"Outbox email #{entry.id} failed (attempt {entry.attempts}), will retry: {e}")
+            stats['retried' if entry.status == 'pending' else entry.status] += 1
+
+        EmailOutbox.objects.bulk_update(
+            entries, ['status', 'attempts', 'next_attempt_at', 'last_error', 'sent_at']
+        )
+    return len(entries), stats
+
+
+def deliver_pending(batch_size=None, connection=None):
+    """Drain every due outbox entry in batches over a single mail connection.
+
+    Returns a dict of counts: sent, skipped, retried, dead.
+    """
+    batch_size = batch_size or BATCH_SIZE
+    connection = connection or get_connection(fail_silently=False)
+    totals = {'sent': 0, 'skipped': 0, 'retried': 0, 'dead': 0}
+
+    connection.open()
+    try:
+        while True:
+            claimed, stats = _deliver_batch(connection, batch_size)
+            for key, value in stats.items():
+                totals[key] += value
+            if claimed < batch_size:
+                break
+    finally:
+        connection.close()
+    return totals
@@ -0,0 +1,96 @@
+from collections import defaultdict
+from datetime import datetime, time, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Q
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.models import Complaint, ComplaintDailyStat, JobCheckpoint, StaleRollupDay
+
+CHECKPOINT = 'complaint_daily_rollup'
+EVENTS = (('created', 'created_at'), ('resolved', 'resolved_at'), ('closed', 'closed_at'))
+EVENT_FIELDS = tuple(field for _, field in EVENTS)
+DAYS_PER_BATCH = 31
+
+
+def event_days(timestamps):
+    """The days (as TruncDate sees them) of the non-null `timestamps`."""
+    return {timezone.localdate(value) for value in timestamps if value is not None}
+
+
+def _day_bounds(day):
+    start = timezone.make_aware(datetime.combine(day, time.min))
+    return start, start + timedelta(days=1)
+
+
+def touched_days(since=None):
+    """Days whose counts may have changed because a complaint was saved after `since`."""
+    queryset = Complaint.objects.all()
+    if since is not None:
+        queryset = queryset.filter(updated_at__gte=since)
+    days = set()
+    for _, field in EVENTS:
+        days.update(
+            queryset.filter(**{f'{field}__isnull': False})
+            .annotate(day=TruncDate(field)).values_list('day', flat=True).distinct().order_by()
+        )
+    return sorted(days)
+
+
+def rollup_days(days):
+    """Recompute the ComplaintDailyStat rows of `days` from the complaints."""
+    counts = defaultdict(lambda: dict.fromkeys(name for name, _ in EVENTS))
+    ranges = [_day_bounds(day) for day in days]
+    for name, field in EVENTS:
+        in_days = Q()
+        for start, end in ranges:
+            in_days |= Q(**{f'{field}__gte': start, f'{field}__lt': end})
+        groups = (
+            Complaint.objects.filter(in_days)
+            .values('college_id', 'branch_id', day=TruncDate(field))
+            .annotate(n=Count('id'))
+            .order_by()
+        )
+        for group in groups:
+            counts[group['day'], group['college_id'], group['branch_id']][name] = group['n']
+
+    rows = [
+        ComplaintDailyStat(day=day, college_id=college_id, branch_id=branch_id,
+                           **{name: n or 0 for name, n in values.items()})
+        for (day, college_id, branch_id), values in counts.items()
+    ]
+    with transaction.atomic():
+        ComplaintDailyStat.objects.filter(day__in=days).delete()
+        ComplaintDailyStat.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def run_rollup(full=False):
+    """Roll up every day touched since the last run (or all days with `full`).
+
+    Besides the days of complaints saved since the last run, this covers the
+    days complaints left (StaleRollupDay), and `full` drops rows for days no
+    complaint has anymore. The checkpoint and the stale days are read before
+    the complaints, so changes made while the job runs are picked up again
+    next time; recomputing a day twice is harmless.
+    """
+    started_at = timezone.now()
+    checkpoint = JobCheckpoint.objects.filter(name=CHECKPOINT).first()
+    since = None if full or checkpoint is None else checkpoint.last_run_at
+    stale = dict(StaleRollupDay.objects.values_list('id', 'day'))
+
+    days = touched_days(since)
+    if full:
+        gone = sorted(set(ComplaintDailyStat.objects.values_list('day', flat=True).distinct()) - set(days))
+        for i in range(0, len(gone), DAYS_PER_BATCH):
+            ComplaintDailyStat.objects.filter(day__in=gone[i:i + DAYS_PER_BATCH]).delete()
+    else:
+        days = sorted(set(days) | set(stale.values()))
+    rows = 0
+    for i in range(0, len(days), DAYS_PER_BATCH):
+        rows += rollup_days(days[i:i + DAYS_PER_BATCH])
+
+    StaleRollupDay.objects.filter(id__in=stale).delete()
+    JobCheckpoint.objects.update_or_create(name=CHECKPOINT, defaults={'last_run_at': started_at})
+    return {'days': len(days), 'rows': rows}
@@ -1,25 +1,153 @@
+import csv
+import io
+from datetime import datetime, time, timedelta
+from itertools import takewhile
+
 from rest_framework import generics, permissions, status, viewsets
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.negotiation import BaseContentNegotiation
 from rest_framework.response import Response
 from rest_framework_simplejwt.views import TokenObtainPairView
 from rest_framework.permissions import IsAdminUser, IsAuthenticated, AllowAny
 from .serializers import *
-from .models import User, College, Branch, Complaint, Feedback, News
+from rest_framework.serializers import BaseSerializer
+from .models import (User, College, Branch, ChangeLog, Complaint, ComplaintDailyStat, ComplaintStat, Feedback, News,
+                     TableVersion)
 from django.contrib.auth import get_user_model
+from django.db import IntegrityError, transaction
+from django.conf import settings
+from django.http import StreamingHttpResponse
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_headers
+from django.db.models import Count, F, Max, OuterRef, Q, Subquery, Sum
+from django.db.models.functions import Coalesce
+from django.db.models.functions import TruncMonth, TruncWeek
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from .authentication import ClaimsJWTAuthentication, invalidate_revoked_users
+from .flat import flat_plan
+from .pagination import FeedbackThreadPagination, KeysetPagination, NewsPagination
+from . import sync
+from .search import search
+from .tokens import revoke_user_tokens
 from .permissions import IsStudent, IsPrincipal, IsSquad, IsPrincipalOrSquad
 
-# 📧 EMAIL IMPORTS
-from core.utils.email_utils import (
-    send_complaint_submitted_email,
-    send_complaint_status_update_email,
-    send_complaint_assigned_email,
-    send_welcome_email
-)
+# 📧 EMAILS are queued in the outbox and delivered by `manage.py process_email_outbox`
+from core.utils.outbox import enqueue_email
+from core.utils.news_feed import cached_feed
+from core.utils.onboarding import onboard_students, validate_roster
 
 import logging
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+# Relations read by the serializers; selecting them up front keeps every
+# list/detail endpoint at a constant number of queries.
+USER_RELATED = ('college', 'branch')
+COMPLAINT_RELATED = (
+    'college', 'branch',
+    'student__college', 'student__branch',
+    'assigned_to__college', 'assigned_to__branch',
+)
+
+
+class SparseFieldsViewMixin:
+    """`?fields=a,b` and `?expand=x,y` on GET requests (see SparseFieldsMixin).
+
+    Besides narrowing the serializer, querysets passed through `sparsify()`
+    only select the columns the response renders and only join the relations
+    it reads, so unrequested nested objects cost nothing.
+    """
+
+    def sparse_params(self):
+        if not hasattr(self, '_sparse_params'):
+            self._sparse_params = (None, None)
+            params = self.request.query_params
+            if self.request.method == 'GET' and ('fields' in params or 'expand' in params):
+                available = self.get_serializer_class()().fields
+                nested = {name for name, field in available.items() if isinstance(field, BaseSerializer)}
+                parsed = []
+                for name, allowed in (('fields', set(available)), ('expand', nested)):
+                    if name not in params:
+                        parsed.append(None)
+                        continue
+                    requested = {value.strip() for value in params[name].split(',') if value.strip()}
+                    if requested - allowed:
+                        raise ValidationError({name: f"Unknown field(s): {', '.join(sorted(requested - allowed))}"})
+                    parsed.append(requested)
+                self._sparse_params = tuple(parsed)
+        return self._sparse_params
+
+    def wants_field(self, name):
+        fields, expand = self.sparse_params()
+        return fields is None or name in fields
+
+    def get_serializer_context(self):
+        context = super().get_serializer_context()
+        context['fields'], context['expand'] = self.sparse_params()
+        return context
+
+    def sparsify(self, queryset):
+        if self.sparse_params() == (None, None):
+            return queryset
+        plan = self.get_serializer().select_plan()
+        if plan is None:
+            return queryset
+        related, columns = plan
+        # Keyset pagination reads its ordering columns from every row
+        ordering = [field.lstrip('-') for field in getattr(self.paginator, 'ordering', ())]
+        queryset = queryset.select_related(None).only(*columns, *ordering)
+        # select_related() with no arguments would follow every foreign key
+        return queryset.select_related(*related) if related else queryset
+
+    def filter_queryset(self, queryset):
+        return self.sparsify(super().filter_queryset(queryset))
+
+
+class FlatListMixin:
+    """Render list pages from `.values()` rows instead of model instances.
+
+    The serializer (after `?fields=`/`?expand=` narrowing) is compiled into a
+    FlatPlan whose output is identical to `serializer.data`; serializers with
+    fields it cannot reproduce fall back to the regular path.
+    """
+    flat_list = True
+    # Compiled plans by (serializer class, fields, expand), shared by all requests
+    _flat_plans = {}
+    FLAT_PLAN_CACHE_SIZE = 256
+
+    def get_flat_plan(self):
+        fields, expand = self.sparse_params()
+        serializer_class = self.get_serializer_class()
+        key = (serializer_class, *(None if names is None else frozenset(names) for names in (fields, expand)))
+        try:
+            return self._flat_plans[key]
+        except KeyError:
+            pass
+        # Compiled without the request, which the cached plan would otherwise keep alive
+        plan = flat_plan(serializer_class(context={'fields': fields, 'expand': expand}))
+        if len(self._flat_plans) >= self.FLAT_PLAN_CACHE_SIZE:
+            self._flat_plans.clear()
+        # Another thread may clear the cache at any point; only ever return the local
+        self._flat_plans[key] = plan
+        return plan
+
+    def list(self, request, *args, **kwargs):
+        plan = self.get_flat_plan() if self.flat_list else None
+        if plan is None:
+            return super().list(request, *args, **kwargs)
+
+        # Keyset pagination reads its ordering columns from every row
+        ordering = [field.lstrip('-') for field in getattr(self.paginator, 'ordering', ())]
+        rows = self.filter_queryset(self.get_queryset()).values(*dict.fromkeys([*plan.paths, *ordering]))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response(plan.render(page))
+        return Response(plan.render(rows))
+
 
 # REST OF YOUR CODE STAYS THE SAME...
 class MyTokenObtainPairView(TokenObtainPairView):
@@ -32,15 +160,12 @@ class RegisterAPI(generics.CreateAPIView):
     serializer_class = RegisterSerializer
 
     def perform_create(self, serializer):
-        """Create user and send welcome email"""
-        user = serializer.save()
+        """Create user and queue welcome email"""
+        with transaction.atomic():
+            user = serializer.save()
 
-        # 📧 SEND WELCOME EMAIL
-        try:
-            send_welcome_email(user)
-            logger.info(f"✅ Welcome email sent to {user.email}")
-        except Exception as e:
-            logger.error(f"❌ Failed to send welcome email: {e}")
+            # 📧 QUEUE WELCOME EMAIL
+            enqueue_email('welcome', user_id=user.id)
 
     def create(self, request, *args, **kwargs):
         """Override to add better error logging"""
@@ -57,57 +182,149 @@ class RegisterAPI(generics.CreateAPIView):
 
 
 # College & Branch APIs
+# The catalogs are public and identical for every caller, so they carry a
+# strong ETag built from TableVersion: a revalidation costs one small query
+# and returns 304 without touching the tables or the serializers. The body
+# depends on the negotiated renderer, so shared caches must key on Accept.
+CATALOG_CACHE_CONTROL = cache_control(public=True, max_age=settings.CATALOG_CACHE_MAX_AGE)
+CATALOG_VARY = vary_on_headers('Accept')
+
+
+def _college_etag(request, *args, **kwargs):
+    # The format keeps the JSON and browsable API representations apart
+    return 'colleges-{}-{}'.format(request.accepted_renderer.format, *TableVersion.current('college'))
+
+
+def _branch_etag(request, *args, **kwargs):
+    # Branch rows embed college_name, so renaming a college changes them too
+    return 'branches-{}-{}-{}'.format(request.accepted_renderer.format, *TableVersion.current('branch', 'college'))
+
+
 class CollegeListAPI(generics.ListCreateAPIView):
     queryset = College.objects.all()
     serializer_class = CollegeSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    @method_decorator(CATALOG_VARY)
+    @method_decorator(CATALOG_CACHE_CONTROL)
+    @method_decorator(condition(etag_func=_college_etag))
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
 
 class BranchListAPI(generics.ListCreateAPIView):
     serializer_class = BranchSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
 
+    @method_decorator(CATALOG_VARY)
+    @method_decorator(CATALOG_CACHE_CONTROL)
+    @method_decorator(condition(etag_func=_branch_etag))
+    def get(self, request, *args, **kwargs):
+        return super().get(request, *args, **kwargs)
+
     def get_queryset(self):
         college_id = self.request.query_params.get('college')
         if college_id:
-            return Branch.objects.filter(college_id=college_id)
-        return Branch.objects.all()
+            return Branch.objects.filter(college_id=college_id).select_related('college')
+        return Branch.objects.select_related('college')
 
 
 # Complaint APIs
-class ComplaintListCreateAPI(generics.ListCreateAPIView):
+def _parse_date_bound(name, value, end=False):
+    """Parse a `created_after`/`created_before` value (ISO date or datetime).
+
+    A bare date covers the whole day, so `created_before=2025-01-31` includes
+    complaints filed on the 31st.
+    """
+    parsed = parse_datetime(value)
+    if parsed is None:
+        day = parse_date(value)
+        if day is None:
+            raise ValidationError({name: 'Enter a valid ISO 8601 date or datetime.'})
+        parsed = datetime.combine(day + timedelta(days=1) if end else day, time.min)
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed
+
+
+def complaint_scope(user, prefix=''):
+    """Q for the complaints `user` may see; `prefix` is the path to the complaint, e.g. 'complaint__'."""
+    if user.role == 'admin':
+        return Q()
+    if user.role == 'principal':
+        return Q(**{f'{prefix}college_id': user.college_id})
+    if user.role == 'squad':
+        return Q(**{f'{prefix}assigned_to_id': user.id})
+    return Q(**{f'{prefix}student_id': user.id})  # student
+
+
+class ComplaintQueryMixin:
+    """Role-scoped complaints narrowed by the `status`, `branch`,
+    `created_after` and `created_before` query params."""
+
+    def get_queryset(self):
+        queryset = Complaint.objects.select_related(*COMPLAINT_RELATED).filter(complaint_scope(self.request.user))
+
+        params = self.request.query_params
+        if params.get('status'):
+            queryset = queryset.filter(status=params['status'])
+        if params.get('branch'):
+            if not params['branch'].isdigit():
+                raise ValidationError({'branch': 'Expected a branch id.'})
+            queryset = queryset.filter(branch_id=params['branch'])
+        if params.get('created_after'):
+            queryset = queryset.filter(created_at__gte=_parse_date_bound('created_after', params['created_after']))
+        if params.get('created_before'):
+            bound = _parse_date_bound('created_before', params['created_before'], end=True)
+            queryset = queryset.filter(created_at__lt=bound)
+        return queryset
+
+
+class ComplaintListCreateAPI(FlatListMixin, SparseFieldsViewMixin, ComplaintQueryMixin, generics.ListCreateAPIView):
+    """List complaints newest first, one keyset page at a time.
+
+    Query params: `status`, `branch`, `created_after`, `created_before`,
+    `page_size` and the opaque `cursor` from the previous page's `next` link.
+    Each item carries `feedback_count` and `last_feedback_at`, computed by
+    correlated subqueries on feedback_thread_idx within the page query.
+    Supports `?fields=` and `?expand=student,assigned_to_detail`.
+    """
     serializer_class = ComplaintSerializer
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [permissions.IsAuthenticated]
+    pagination_class = KeysetPagination
 
-    def get_queryset(self):
-        user = self.request.user
-        role = user.role
+    def get_serializer_class(self):
+        if self.request.method == 'GET':
+            return ComplaintListSerializer
+        return ComplaintSerializer
 
-        if role == 'admin':
-            return Complaint.objects.all()
-        elif role == 'principal':
-            return Complaint.objects.filter(college=user.college)
-        elif role == 'squad':
-            return Complaint.objects.filter(assigned_to=user)
-        else:  # student
-            return Complaint.objects.filter(student=user)
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.request.method != 'GET':
+            return queryset
+        feedbacks = Feedback.objects.filter(complaint=OuterRef('pk')).order_by().values('complaint')
+        if self.wants_field('feedback_count'):
+            queryset = queryset.annotate(
+                feedback_count=Coalesce(Subquery(feedbacks.annotate(n=Count('id')).values('n')), 0))
+        if self.wants_field('last_feedback_at'):
+            queryset = queryset.annotate(
+                last_feedback_at=Subquery(feedbacks.annotate(last=Max('created_at')).values('last')))
+        return queryset
 
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data)
         if serializer.is_valid():
-            # Save complaint
-            complaint = serializer.save(
-                student=request.user,
-                college=request.user.college,
-                branch=request.user.branch
-            )
+            with transaction.atomic():
+                # Save complaint
+                complaint = serializer.save(
+                    student=request.user,
+                    college=request.user.college,
+                    branch=request.user.branch
+                )
 
-            # 📧 SEND EMAIL - Complaint Submitted
-            try:
-                send_complaint_submitted_email(complaint)
-                logger.info(f"Complaint submitted email sent for #{complaint.id}")
-            except Exception as e:
-                logger.error(f"Failed to send complaint email: {e}")
+                # 📧 QUEUE EMAIL - Complaint Submitted
+                enqueue_email('complaint_submitted', complaint_id=complaint.id)
 
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         else:
@@ -115,8 +332,118 @@ class ComplaintListCreateAPI(generics.ListCreateAPIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class FirstRendererNegotiation(BaseContentNegotiation):
+    """Always answer with the view's first renderer, whatever the Accept header says."""
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+# Spreadsheets evaluate a cell starting with one of these as a formula
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+class ComplaintExportAPI(ComplaintQueryMixin, generics.GenericAPIView):
+    """Stream the caller's complaints as CSV, newest first.
+
+    Takes the same filters as the complaint list. Rows are read through
+    `iterator()` (a server-side cursor on Postgres) and written out chunk by
+    chunk, so memory stays flat however many rows match. Student details of
+    anonymous complaints are masked. Errors are still JSON.
+    """
+    permission_classes = [IsAuthenticated]
+    content_negotiation_class = FirstRendererNegotiation
+    chunk_size = 2000
+    COLUMNS = (
+        ('id', 'id'), ('created_at', 'created_at'), ('updated_at', 'updated_at'), ('status', 'status'),
+        ('college', 'college__name'), ('branch', 'branch__name'), ('title', 'title'),
+        ('description', 'description'), ('anonymous', 'is_anonymous'),
+        ('student', 'student__username'), ('student_email', 'student__email'),
+        ('roll_number', 'student__roll_number'), ('assigned_to', 'assigned_to__username'),
+    )
+    MASKED = {'student': 'Anonymous Student', 'student_email': '', 'roll_number': ''}
+
+    def rows(self, queryset):
+        header = [name for name, _ in self.COLUMNS]
+        masked = [(header.index(name), value) for name, value in self.MASKED.items()]
+        anonymous = header.index('anonymous')
+        yield header
+        for row in queryset.values_list(*(field for _, field in self.COLUMNS)).iterator(chunk_size=self.chunk_size):
+            row = [_csv_cell(value) for value in row]
+            if row[anonymous]:
+                for index, value in masked:
+                    row[index] = value
+            yield row
+
+    def stream(self, queryset):
+        writer = csv.writer(_Echo())
+        chunk = []
+        for row in self.rows(queryset):
+            chunk.append(writer.writerow(row))
+            if len(chunk) == 500:
+                yield ''.join(chunk)
+                chunk = []
+        if chunk:
+            yield ''.join(chunk)
+
+    def get(self, request, *args, **kwargs):
+        if request.user.role not in ['admin', 'principal']:
+            return Response({"detail": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
+
+        queryset = self.get_queryset().order_by('-created_at', '-id')
+        response = StreamingHttpResponse(self.stream(queryset), content_type='text/csv; charset=utf-8')
+        filename = f"complaints-{timezone.localdate().isoformat()}.csv"
+        response['Content-Disposition'] = f'attachment; filename="{filename}"'
+        return response
+
+
+class ComplaintSearchAPI(ComplaintQueryMixin, generics.GenericAPIView):
+    """Full-text search over the caller's complaints, best match first.
+
+    Query params: `q`, `limit` (default 20, max 100) and the same filters as
+    the complaint list. Each result carries its `rank` and a `highlight` with
+    the escaped title and a description snippet, matches wrapped in <mark>.
+    """
+    serializer_class = ComplaintSerializer
+    authentication_classes = [ClaimsJWTAuthentication]
+    permission_classes = [permissions.IsAuthenticated]
+    max_limit = 100
+
+    def get(self, request, *args, **kwargs):
+        text = request.query_params.get('q', '').strip()
+        if not text:
+            raise ValidationError({'q': 'This parameter is required.'})
+        try:
+            limit = max(1, min(int(request.query_params.get('limit', 20)), self.max_limit))
+        except ValueError:
+            raise ValidationError({'limit': 'Expected a number.'})
+
+        hits = search(self.get_queryset(), text, limit=limit)
+        results = []
+        for complaint, rank, highlight in hits:
+            data = self.get_serializer(complaint).data
+            data['rank'] = rank
+            data['highlight'] = highlight
+            results.append(data)
+        return Response({'results': results})
+
+
 class ComplaintDetailAPI(generics.RetrieveUpdateAPIView):
-    queryset = Complaint.objects.all()
+    queryset = Complaint.objects.select_related(*COMPLAINT_RELATED)
     serializer_class = ComplaintSerializer
     permission_classes = [permissions.IsAuthenticated]
 
@@ -130,49 +457,337 @@ class ComplaintDetailAPI(generics.RetrieveUpdateAPIView):
 
         # Store old values before update
         old_status = complaint.status
-        old_assigned = complaint.assigned_to
-
-        # Perform update
-        response = self.partial_update(request, *args, **kwargs)
-
-        # Refresh complaint from DB
-        complaint.refresh_from_db()
-
-        # 📧 SEND EMAIL - Status Changed
-        if old_status != complaint.status:
-            try:
-                send_complaint_status_update_email(complaint, old_status)
-                logger.info(f"Status update email sent for #{complaint.id}")
-            except Exception as e:
-                logger.error(f"Failed to send status email: {e}")
-
-        # 📧 SEND EMAIL - Complaint Assigned
-        if old_assigned != complaint.assigned_to and complaint.assigned_to:
-            try:
-                send_complaint_assigned_email(complaint)
-                logger.info(f"Assignment email sent for #{complaint.id}")
-            except Exception as e:
-                logger.error(f"Failed to send assignment email: {e}")
+        old_assigned_id = complaint.assigned_to_id
+
+        with transaction.atomic():
+            # Perform update
+            response = self.partial_update(request, *args, **kwargs)
+
+            # Refresh complaint from DB
+            complaint.refresh_from_db()
+
+            # 📧 QUEUE EMAIL - Status Changed
+            if old_status != complaint.status:
+                enqueue_email('complaint_status_update', complaint_id=complaint.id, old_status=old_status)
+
+            # 📧 QUEUE EMAIL - Complaint Assigned
+            if old_assigned_id != complaint.assigned_to_id and complaint.assigned_to_id:
+                enqueue_email('complaint_assigned', complaint_id=complaint.id)
 
         return response
 
 
+class ComplaintFeedbackAPI(SparseFieldsViewMixin, generics.ListAPIView):
+    """Feedback on one complaint, oldest first, one keyset page at a time.
+
+    The complaint must be visible to the caller under the same role rules
+    as the complaint list, otherwise the thread is a 404.
+    """
+    serializer_class = FeedbackSerializer
+    authentication_classes = [ClaimsJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    pagination_class = FeedbackThreadPagination
+
+    def get_queryset(self):
+        complaints = Complaint.objects.filter(complaint_scope(self.request.user), pk=self.kwargs['pk'])
+        if not complaints.exists():
+            raise NotFound('Complaint not found')
+        return Feedback.objects.filter(complaint_id=self.kwargs['pk']).select_related('user', 'complaint')
+
+
+# Delta sync for the mobile app
+class SyncAPI(generics.GenericAPIView):
+    """Complaints, feedback and news changed since `cursor`, oldest change first.
+
+    Reads the ChangeLog (see core/sync.py): a sync with nothing new is a
+    single index probe. Changed objects the caller can no longer see,
+    including deleted ones, are listed under `deleted`. Follow `cursor`
+    while `has_more` is true; without a cursor the whole log is replayed.
+
+    The cursor only moves past changes older than SYNC_SETTLE_SECONDS: a
+    page stops before the first younger one, even if later ids are already
+    settled, so a transaction that took a sequence number but has not
+    committed yet is not skipped over. A writing transaction that commits
+    more than SYNC_SETTLE_SECONDS after logging its change can still be
+    missed, so keep the setting above the longest one.
+    """
+    authentication_classes = [ClaimsJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+        cursor = sync.decode_cursor(request.query_params.get('cursor'))
+        limit = settings.SYNC_PAGE_SIZE
+        settled = timezone.now() - timedelta(seconds=settings.SYNC_SETTLE_SECONDS)
+
+        rows = list(
+            ChangeLog.objects.filter(sync.audience_filter(user), id__gt=cursor)
+            .order_by('id').values_list('id', 'entity', 'object_id', 'changed_at')[:limit + 1]
+        )
+        changes = list(takewhile(lambda row: row[3] <= settled, rows))
+        # A page cut short by an unsettled change has nothing more to offer yet
+        has_more = len(changes) > limit
+        changes = changes[:limit]
+        changed = {'complaint': set(), 'feedback': set(), 'news': set()}
+        for _, entity, object_id, _ in changes:
+            changed[entity].add(object_id)
+
+        complaints = feedback = news = []
+        if changed['complaint']:
+            complaints = Complaint.objects.select_related(*COMPLAINT_RELATED).filter(
+                complaint_scope(user), id__in=changed['complaint']).order_by('id')
+        if changed['feedback']:
+            feedback = Feedback.objects.select_related('user', 'complaint').filter(
+                complaint_scope(user, 'complaint__'), id__in=changed['feedback']).order_by('id')
+        if changed['news']:
+            news = News.objects.select_related('created_by__college', 'created_by__branch').filter(
+                id__in=changed['news']).order_by('id')
+            if user.role != 'admin':
+                news = news.filter(Q(college__isnull=True) | Q(college_id=user.college_id))
+
+        data = {
+            'complaints': ComplaintSerializer(complaints, many=True).data,
+            'feedback': FeedbackSerializer(feedback, many=True).data,
+            'news': NewsSerializer(news, many=True).data,
+        }
+        deleted = {}
+        for key, entity in (('complaints', 'complaint'), ('feedback', 'feedback'), ('news', 'news')):
+            present = {item['id'] for item in data[key]}
+            deleted[key] = sorted(changed[entity] - present)
+
+        return Response({
+            'cursor': sync.encode_cursor(changes[-1][0] if changes else cursor),
+            'has_more': has_more,
+            **data,
+            'deleted': deleted,
+        })
+
+
+# Dashboard stats
+class ComplaintStatsAPI(generics.GenericAPIView):
+    """Complaint counts for the dashboards, read from the ComplaintStat summary table.
+
+    Admins see every college (or one with `?college=<id>`), principals their
+    college and squad members the complaints assigned to them.
+    """
+    authentication_classes = [ClaimsJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        user = self.request.user
+        queryset = ComplaintStat.objects.all()
+        if user.role == 'admin':
+            college = self.request.query_params.get('college')
+            if college:
+                if not college.isdigit():
+                    raise ValidationError({'college': 'Expected a college id.'})
+                queryset = queryset.filter(college_id=college)
+            return queryset
+        elif user.role == 'principal':
+            return queryset.filter(college_id=user.college_id)
+        elif user.role == 'squad':
+            return queryset.filter(assigned_to_id=user.id)
+        return queryset.none()
+
+    def get(self, request, *args, **kwargs):
+        if request.user.role not in ['admin', 'principal', 'squad']:
+            return Response({"detail": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
+
+        rows = (
+            self.get_queryset()
+            .values('branch_id', 'branch__name', 'status')
+            .annotate(total=Sum('count'), unassigned=Sum('count', filter=Q(assigned_to__isnull=True)))
+            .order_by('branch__name', 'branch_id')
+        )
+
+        statuses = [value for value, _ in Complaint.STATUS_CHOICES]
+        summary = {'total': 0, 'unassigned': 0, 'by_status': dict.fromkeys(statuses, 0), 'by_branch': []}
+        branches = {}
+        for row in rows:
+            if not row['total']:
+                continue
+            if row['branch_id'] not in branches:
+                branches[row['branch_id']] = {
+                    'branch': row['branch_id'],
+                    'branch_name': row['branch__name'],
+                    'total': 0,
+                    'by_status': dict.fromkeys(statuses, 0),
+                }
+                summary['by_branch'].append(branches[row['branch_id']])
+            branch = branches[row['branch_id']]
+            branch['total'] += row['total']
+            branch['by_status'][row['status']] += row['total']
+            summary['total'] += row['total']
+            summary['unassigned'] += row['unassigned'] or 0
+            summary['by_status'][row['status']] += row['total']
+
+        return Response(summary)
+
+
+class ComplaintTimeseriesAPI(generics.GenericAPIView):
+    """Complaints created/resolved/closed per period, from the daily rollup.
+
+    Query params: `start`, `end` (ISO dates, inclusive; default the last
+    365 days), `granularity` (day, week or month), `branch`, and `college`
+    for admins. Weeks start on Monday. Every period in the range is listed,
+    with zeros where nothing happened, so the range is capped at a year of
+    days, five years of weeks or twenty years of months. Data is as fresh as
+    the last `manage.py rollup_complaints` run.
+    """
+    authentication_classes = [ClaimsJWTAuthentication]
+    permission_classes = [IsAuthenticated]
+    GRANULARITIES = {'day': None, 'week': TruncWeek, 'month': TruncMonth}
+    # Longest range per granularity, so a response stays a few hundred periods
+    MAX_SPAN_DAYS = {'day': 366, 'week': 7 * 260, 'month': 366 * 20}
+
+    def _date_param(self, name, default):
+        value = self.request.query_params.get(name)
+        if not value:
+            return default
+        parsed = parse_date(value)
+        if parsed is None:
+            raise ValidationError({name: 'Enter a valid ISO 8601 date.'})
+        return parsed
+
+    def _id_param(self, name):
+        value = self.request.query_params.get(name)
+        if value and not value.isdigit():
+            raise ValidationError({name: f'Expected a {name} id.'})
+        return value
+
+    @staticmethod
+    def _period_start(day, granularity):
+        if granularity == 'week':
+            return day - timedelta(days=day.weekday())
+        if granularity == 'month':
+            return day.replace(day=1)
+        return day
+
+    @staticmethod
+    def _next_period(day, granularity):
+        if granularity == 'week':
+            return day + timedelta(days=7)
+        if granularity == 'month':
+            return (day + timedelta(days=32)).replace(day=1)
+        return day + timedelta(days=1)
+
+    def get(self, request, *args, **kwargs):
+        user = request.user
+        if user.role not in ['admin', 'principal']:
+            return Response({"detail": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
+
+        granularity = request.query_params.get('granularity', 'day')
+        if granularity not in self.GRANULARITIES:
+            raise ValidationError({'granularity': 'Expected day, week or month.'})
+        end = self._date_param('end', timezone.localdate())
+        start = self._date_param('start', end - timedelta(days=364))
+        if start > end:
+            raise ValidationError({'start': 'Must not be after end.'})
+        if (end - start).days >= self.MAX_SPAN_DAYS[granularity]:
+            raise ValidationError({'start': f'At most {self.MAX_SPAN_DAYS[granularity]} days '
+                                            f'apart at {granularity} granularity.'})
+
+        queryset = ComplaintDailyStat.objects.filter(day__gte=start, day__lte=end)
+        if user.role == 'principal':
+            queryset = queryset.filter(college_id=user.college_id)
+        elif self._id_param('college'):
+            queryset = queryset.filter(college_id=request.query_params['college'])
+        if self._id_param('branch'):
+            queryset = queryset.filter(branch_id=request.query_params['branch'])
+
+        trunc = self.GRANULARITIES[granularity]
+        period = trunc('day') if trunc else F('day')
+        rows = (
+            queryset.values(period=period)
+            .annotate(created=Sum('created'), resolved=Sum('resolved'), closed=Sum('closed'))
+            .order_by('period')
+        )
+        totals = {row['period']: row for row in rows}
+
+        results = []
+        current = self._period_start(start, granularity)
+        while current <= end:
+            row = totals.get(current, {})
+            results.append({
+                'period': current.isoformat(),
+                'created': row.get('created', 0),
+                'resolved': row.get('resolved', 0),
+                'closed': row.get('closed', 0),
+            })
+            current = self._next_period(current, granularity)
+
+        return Response({'granularity': granularity, 'start': start, 'end': end, 'results': results})
+
+
 # User Management (for Principal & Admin)
-class StudentListAPI(generics.ListAPIView):
+class StudentListAPI(FlatListMixin, SparseFieldsViewMixin, generics.ListAPIView):
     serializer_class = UserSerializer
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_queryset(self):
         user = self.request.user
         if user.role == 'admin':
-            return User.objects.filter(role='student')
+            return User.objects.filter(role='student').select_related(*USER_RELATED)
         elif user.role == 'principal':
-            return User.objects.filter(college=user.college, role='student')
+            return User.objects.filter(college_id=user.college_id, role='student').select_related(*USER_RELATED)
         return User.objects.none()
 
 
+class StudentBulkOnboardAPI(generics.GenericAPIView):
+    """Onboard a roster of students in one request.
+
+    Accepts a CSV upload in `file` or a JSON list in `students`, with the
+    columns of `manage.py onboard_students`. Principals onboard into their own
+    college, admins pass a `college` id in the request body. The roster is
+    all-or-nothing: any invalid row returns 400 with every problem found and
+    creates nobody.
+
+    Large rosters fork up to ONBOARDING_WEB_HASH_WORKERS hashing processes
+    from the web worker for the length of the request. Size it against the
+    cores left over by the gunicorn/uvicorn workers, or set it to 1 and use
+    `manage.py onboard_students` for big imports.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request, *args, **kwargs):
+        user = request.user
+        if user.role == 'principal':
+            college = user.college
+        elif user.role == 'admin':
+            college_id = str(request.data.get('college', ''))
+            college = College.objects.filter(pk=college_id).first() if college_id.isdigit() else None
+        else:
+            return Response({"detail": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
+        if college is None:
+            raise ValidationError({'college': 'Unknown college.'})
+
+        if 'file' in request.FILES:
+            rows = csv.DictReader(io.TextIOWrapper(request.FILES['file'], encoding='utf-8-sig'))
+        elif isinstance(request.data.get('students'), list):
+            rows = request.data['students']
+        else:
+            raise ValidationError({'students': 'Upload a roster CSV as `file` or send a `students` list.'})
+
+        students, errors = validate_roster(rows, college)
+        if errors:
+            return Response(
+                {'errors': [{'row': line, 'field': field, 'message': message} for line, field, message in errors]},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            created = onboard_students(students, workers=settings.ONBOARDING_WEB_HASH_WORKERS)
+        except IntegrityError:
+            return Response({"detail": "An account in the roster was registered meanwhile, please retry"},
+                            status=status.HTTP_409_CONFLICT)
+
+        logger.info(f"🎓 {user.username} onboarded {len(created)} students to {college.name}")
+        return Response({'created': len(created), 'ids': [student.id for student in created]},
+                        status=status.HTTP_201_CREATED)
+
+
 class StudentDetailAPI(generics.RetrieveUpdateAPIView):
-    queryset = User.objects.all()
+    queryset = User.objects.select_related(*USER_RELATED)
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
 
@@ -190,30 +805,81 @@ class FeedbackListCreateAPI(generics.ListCreateAPIView):
 
     def get_queryset(self):
         complaint_id = self.request.query_params.get('complaint')
-        return Feedback.objects.filter(complaint_id=complaint_id)
+        return Feedback.objects.filter(complaint_id=complaint_id).select_related('user', 'complaint')
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)
 
 
 # News (Admin creates, everyone views)
-class NewsListCreateAPI(generics.ListCreateAPIView):
-    queryset = News.objects.all().order_by('-posted_at')
+class NewsListCreateAPI(SparseFieldsViewMixin, generics.ListCreateAPIView):
+    """News feed: global posts plus the caller's college (admins see everything).
+
+    Pages are keyset-paginated on (posted_at, id). Global and college posts
+    are read with one range scan each on news_college_feed_idx and merged,
+    rather than with an OR that would scan both ranges in full. The first
+    page of each feed is cached per college and fieldset; any News change
+    moves every feed to a new cache key (see core/utils/news_feed.py).
+    Supports `?fields=` and `?expand=created_by`.
+    """
     serializer_class = NewsSerializer
+    authentication_classes = [ClaimsJWTAuthentication]
+    pagination_class = NewsPagination
 
     def get_permissions(self):
         if self.request.method == 'POST':
             return [IsAuthenticated(), IsAdminUser()]
         return [IsAuthenticated()]
 
+    def get_scope(self):
+        user = self.request.user
+        if user.role == 'admin':
+            return 'all'
+        if user.college_id:
+            return f'college:{user.college_id}'
+        return 'global'
+
+    def get_queryset(self):
+        return News.objects.select_related('created_by__college', 'created_by__branch')
+
+    def get_feed_querysets(self):
+        queryset = self.sparsify(self.get_queryset())
+        scope = self.get_scope()
+        if scope == 'all':
+            return [queryset]
+        feeds = [queryset.filter(college__isnull=True)]
+        if scope != 'global':
+            feeds.append(queryset.filter(college_id=self.request.user.college_id))
+        return feeds
+
+    def list(self, request, *args, **kwargs):
+        paginator = self.paginator
+
+        def build():
+            page = paginator.paginate_union(self.get_feed_querysets(), request)
+            return list(self.get_serializer(page, many=True).data), paginator.next_position
+
+        if request.query_params.get(paginator.cursor_query_param):
+            data, next_position = build()
+        else:
+            # Only first pages are cached: that is where nearly all reads land
+            scope = f'{self.get_scope()}:{paginator.get_page_size(request)}'
+            fields, expand = self.sparse_params()
+            if (fields, expand) != (None, None):
+                scope += f":{','.join(sorted(fields or ['*']))}:{','.join(sorted(expand or []))}"
+            data, next_position = cached_feed(scope, build)
+        paginator.request, paginator.next_position = request, next_position
+        return paginator.get_paginated_response(data)
+
     def perform_create(self, serializer):
         serializer.save(created_by=self.request.user)
 
 
 # User ViewSet for Admin
-class UserViewSet(viewsets.ModelViewSet):
+class UserViewSet(FlatListMixin, SparseFieldsViewMixin, viewsets.ModelViewSet):
     queryset = User.objects.all()
     serializer_class = UserSerializer
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]
 
     def get_permissions(self):
@@ -224,19 +890,20 @@ class UserViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
 
+        queryset = User.objects.select_related(*USER_RELATED)
         if user.role == 'admin':
-            return User.objects.all()
+            return queryset
         elif user.role == 'principal':
-            return User.objects.filter(college=user.college)
+            return queryset.filter(college_id=user.college_id)
         elif user.role == 'squad':
-            return User.objects.filter(college=user.college)
+            return queryset.filter(college_id=user.college_id)
         else:
-            return User.objects.filter(id=user.id)
+            return queryset.filter(id=user.id)
 
 
 # Suspend Student
 class SuspendStudentAPI(generics.UpdateAPIView):
-    queryset = User.objects.all()
+    queryset = User.objects.select_related(*USER_RELATED)
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated, IsPrincipal]
 
@@ -257,6 +924,8 @@ class SuspendStudentAPI(generics.UpdateAPIView):
 
         student.is_suspended = True
         student.save()
+        invalidate_revoked_users()
+        revoke_user_tokens(student.id)
 
         serializer = self.get_serializer(student)
         return Response(serializer.data)
@@ -264,7 +933,7 @@ class SuspendStudentAPI(generics.UpdateAPIView):
 
 # Unsuspend Student
 class UnsuspendStudentAPI(generics.UpdateAPIView):
-    queryset = User.objects.all()
+    queryset = User.objects.select_related(*USER_RELATED)
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated, IsPrincipal]
 
@@ -285,14 +954,16 @@ class UnsuspendStudentAPI(generics.UpdateAPIView):
 
         student.is_suspended = False
         student.save()
+        invalidate_revoked_users()
 
         serializer = self.get_serializer(student)
         return Response(serializer.data)
 
 
-class FeedbackViewSet(viewsets.ModelViewSet):
+class FeedbackViewSet(SparseFieldsViewMixin, viewsets.ModelViewSet):
     queryset = Feedback.objects.all()
     serializer_class = FeedbackSerializer
+    authentication_classes = [ClaimsJWTAuthentication]
     permission_classes = [IsAuthenticated]  # ✅ FIX #1
 
     def get_queryset(self):
@@ -304,25 +975,27 @@ class FeedbackViewSet(viewsets.ModelViewSet):
 
         logger.info(f"Feedback request by: {user.username} (Role: {user.role})")
 
+        queryset = Feedback.objects.select_related('user', 'complaint').order_by('-created_at')
+
         # Admin sees all feedback
         if user.role == 'admin' or user.is_superuser:
-            return Feedback.objects.all().order_by('-created_at')
+            return queryset
 
         # Principal sees feedback from their college
         elif user.role == 'principal':
-            if not user.college:
+            if not user.college_id:
                 return Feedback.objects.none()
-            return Feedback.objects.filter(user__college=user.college).order_by('-created_at')
+            return queryset.filter(user__college_id=user.college_id)
 
         # Squad sees feedback from their college
         elif user.role == 'squad':
-            if not user.college:
+            if not user.college_id:
                 return Feedback.objects.none()
-            return Feedback.objects.filter(user__college=user.college).order_by('-created_at')
+            return queryset.filter(user__college_id=user.college_id)
 
         # Student sees only their own feedback
         else:
-            return Feedback.objects.filter(user=user).order_by('-created_at')
+            return queryset.filter(user_id=user.id)
 
     def perform_create(self, serializer):
         serializer.save(user=self.request.user)